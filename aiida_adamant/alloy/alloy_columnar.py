@@ -0,0 +1,207 @@
+"""
+This module implements a columnar representation of an AlloyStructure
+
+Instead of one nested dict per site, a structure is stored as the lattice,
+an (N, 3) array of fractional coordinates, a table of the unique alloy
+compositions and an index array into this table. The arrays are written
+into a single compressed numpy archive.
+"""
+from __future__ import annotations
+
+import io
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from monty.json import MontyDecoder, MontyEncoder
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.alloy.alloy_symmetry import get_species_key
+
+INDEX_PROPERTIES = ('site_index', 'neq_site_index')
+
+
+class AlloyStructureColumns:
+    """
+    Columnar representation of an AlloyStructure
+
+    """
+    def __init__(self,
+                 lattice: np.ndarray,
+                 frac_coords: np.ndarray,
+                 compositions: List[AlloyComposition],
+                 species_index: np.ndarray,
+                 site_index: Optional[np.ndarray] = None,
+                 neq_site_index: Optional[np.ndarray] = None,
+                 charge: Optional[float] = None,
+                 site_properties: Optional[Dict[str, List]] = None,
+                 properties: Optional[dict] = None):
+        """
+
+        :param lattice: (3, 3) lattice matrix
+        :param frac_coords: (N, 3) fractional coordinates
+        :param compositions: unique compositions of the structure
+        :param species_index: (N,) index of the composition of every site
+        :param site_index: (N,) site_index of every site, if known
+        :param neq_site_index: (N,) neq_site_index of every site, if known
+        :param charge: charge of the structure
+        :param site_properties: further site properties
+        :param properties: properties of the structure
+        """
+        self.lattice = np.asarray(lattice, dtype=float).reshape(3, 3)
+        self.frac_coords = np.asarray(frac_coords, dtype=float).reshape(-1, 3)
+        self.compositions = list(compositions)
+        self.species_index = np.asarray(species_index, dtype=np.int32)
+        self.site_index = site_index
+        self.neq_site_index = neq_site_index
+        self.charge = charge
+        self.site_properties = site_properties or {}
+        self.properties = properties or {}
+
+        if len(self.species_index) != len(self.frac_coords):
+            raise ValueError("Coordinates and species index doesn't have "
+                             "the same size")
+
+    def __len__(self):
+        return len(self.species_index)
+
+    @classmethod
+    def from_structure(cls, structure: AlloyStructure) -> AlloyStructureColumns:
+        """
+
+        :param structure: alloy structure
+        :return: columnar representation of the structure
+        """
+        compositions: List[AlloyComposition] = []
+        by_id: Dict[int, int] = {}
+        by_key: Dict[tuple, int] = {}
+
+        species_index = np.empty(len(structure), dtype=np.int32)
+        for i, site in enumerate(structure):
+            species = site.species
+            index = by_id.get(id(species))
+            if index is None:
+                key = get_species_key(species)
+                index = by_key.get(key)
+                if index is None:
+                    index = by_key[key] = len(compositions)
+                    compositions.append(species)
+                by_id[id(species)] = index
+            species_index[i] = index
+
+        site_properties = dict(structure.site_properties)
+
+        indices = {}
+        for name in INDEX_PROPERTIES:
+            values = site_properties.pop(name, None)
+            if values is not None and None not in values:
+                indices[name] = np.asarray(values, dtype=np.int32)
+
+        return cls(structure.lattice.matrix,
+                   structure.frac_coords,
+                   compositions,
+                   species_index,
+                   charge=structure.charge,
+                   site_properties=site_properties,
+                   properties=structure.properties,
+                   **indices)
+
+    def to_structure(self) -> AlloyStructure:
+        """
+
+        :return: alloy structure with shared composition objects
+        """
+        compositions = self.compositions
+        species = [compositions[i] for i in self.species_index.tolist()]
+
+        site_properties = dict(self.site_properties)
+        if self.site_index is not None and self.neq_site_index is not None:
+            site_properties['site_index'] = self.site_index.tolist()
+            site_properties['neq_site_index'] = self.neq_site_index.tolist()
+
+        return AlloyStructure(self.lattice,
+                              species,
+                              self.frac_coords,
+                              charge=self.charge,
+                              site_properties=site_properties or None,
+                              properties=dict(self.properties))
+
+    def _get_metadata(self) -> Dict[str, Any]:
+        return {
+            "compositions": [c.as_dict() for c in self.compositions],
+            "charge": self.charge,
+            "site_properties": self.site_properties,
+            "properties": self.properties,
+        }
+
+    def to_bytes(self) -> bytes:
+        """
+
+        :return: compressed binary representation
+        """
+        arrays = {
+            "lattice": self.lattice,
+            "frac_coords": self.frac_coords,
+            "species_index": self.species_index,
+            "metadata": np.array(json.dumps(self._get_metadata(),
+                                            cls=MontyEncoder)),
+        }
+        if self.site_index is not None and self.neq_site_index is not None:
+            arrays["site_index"] = np.asarray(self.site_index, dtype=np.int32)
+            arrays["neq_site_index"] = np.asarray(self.neq_site_index,
+                                                  dtype=np.int32)
+
+        handle = io.BytesIO()
+        np.savez_compressed(handle, **arrays)
+        return handle.getvalue()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> AlloyStructureColumns:
+        """
+
+        :param blob: binary representation created by to_bytes
+        :return: columnar representation of the structure
+        """
+        with np.load(io.BytesIO(blob), allow_pickle=False) as arrays:
+            metadata = json.loads(str(arrays["metadata"]))
+            site_index = arrays["site_index"] \
+                if "site_index" in arrays.files else None
+            neq_site_index = arrays["neq_site_index"] \
+                if "neq_site_index" in arrays.files else None
+
+            compositions = [
+                AlloyComposition.from_dict(d) for d in metadata["compositions"]
+            ]
+
+            decoder = MontyDecoder()
+
+            return cls(arrays["lattice"],
+                       arrays["frac_coords"],
+                       compositions,
+                       arrays["species_index"],
+                       site_index=site_index,
+                       neq_site_index=neq_site_index,
+                       charge=metadata["charge"],
+                       site_properties=decoder.process_decoded(
+                           metadata["site_properties"]),
+                       properties=decoder.process_decoded(
+                           metadata["properties"]))
+
+
+def dumps_structure(structure: AlloyStructure) -> bytes:
+    """
+
+    :param structure: alloy structure
+    :return: compressed columnar representation of the structure
+    """
+    return AlloyStructureColumns.from_structure(structure).to_bytes()
+
+
+def loads_structure(blob: bytes) -> AlloyStructure:
+    """
+
+    :param blob: representation created by dumps_structure
+    :return: alloy structure
+    """
+    return AlloyStructureColumns.from_bytes(blob).to_structure()
@@ -5,15 +5,17 @@ for the calculation with a Green's function based method
 
 from __future__ import annotations
 
-from collections import OrderedDict
-from dataclasses import dataclass
-from typing import Sequence, List, Dict, Any, Union
+from dataclasses import FrozenInstanceError
+from typing import Sequence, List, Dict, Any, Union, MutableMapping, \
+    TYPE_CHECKING
+from weakref import WeakValueDictionary
 
-from monty.json import MSONable
 from pymatgen.core import Composition
 from pymatgen.core.periodic_table import get_el_sp, Species, Element
 
-from aiida_adamant.utils.typing import MagneticParamsLike, ScreeningParamsLike
+if TYPE_CHECKING:
+    from aiida_adamant.utils.typing import MagneticParamsLike, \
+        ScreeningParamsLike
 
 __author__ = "Franco Moitzi"
 __version__ = "0.3"
@@ -22,25 +24,131 @@ __email__ = "franco.moitzi@mcl.at"
 __date__ = "Feb 13, 2021"
 
 
-@dataclass
-class MagneticParams(MSONable):
+class _FrozenParams:
+    """
+    Immutable, slotted parameter object
+
+    Instances are compared and hashed by value. The ``intern`` factory
+    returns one shared instance per distinct set of values, as long as the
+    instance is referenced.
+    """
+    __slots__ = ('__weakref__',)
+
+    _instances: MutableMapping[tuple, _FrozenParams]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._instances = WeakValueDictionary()
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self):
+        return hash((self.__class__, self._values()))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}"
+                           for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+    def __reduce__(self):
+        return self.__class__, self._values()
+
+    @classmethod
+    def intern(cls, *args, **kwargs):
+        """
+        Shared instance with the given values
+
+        :return: an instance equal to cls(*args, **kwargs)
+        """
+        params = cls(*args, **kwargs)
+        return cls._instances.setdefault(params._values(), params)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+
+        :return: serializable dict
+        """
+        params_dict = {
+            "@module": self.__class__.__module__,
+            "@class": self.__class__.__name__,
+        }
+        params_dict.update(
+            (name, getattr(self, name)) for name in self.__slots__)
+        return params_dict
+
+    @classmethod
+    def from_dict(cls, d):
+        """
+
+        :param d: dictionary representation of the params
+        :return: instance of the params
+        """
+        return cls(**{key: value for key, value in d.items()
+                      if not key.startswith("@")})
+
+
+class MagneticParams(_FrozenParams):
     """
     Class representing the magnetic model of an alloy component
 
     """
-    is_paramagnetic: bool = True
-    magnetic_model: str = "N"
-    init_mag_mom: float = 1.9
+    __slots__ = ('is_paramagnetic', 'magnetic_model', 'init_mag_mom')
+
+    def __init__(self,
+                 is_paramagnetic: bool = True,
+                 magnetic_model: str = "N",
+                 init_mag_mom: float = 1.9):
+        object.__setattr__(self, 'is_paramagnetic', is_paramagnetic)
+        object.__setattr__(self, 'magnetic_model', magnetic_model)
+        object.__setattr__(self, 'init_mag_mom', init_mag_mom)
 
 
-@dataclass
-class ScreeningParams(MSONable):
+class ScreeningParams(_FrozenParams):
     """
     Class representing the electrostatics of an alloy component
 
     """
-    alpha: float = 0.70
-    beta: float = 1.2
+    __slots__ = ('alpha', 'beta')
+
+    def __init__(self, alpha: float = 0.70, beta: float = 1.2):
+        object.__setattr__(self, 'alpha', alpha)
+        object.__setattr__(self, 'beta', beta)
+
+
+def _get_params(params_class, params, size: int) -> List:
+    """
+    Convert params given in any accepted form into shared instances
+
+    :param params_class: MagneticParams or ScreeningParams
+    :param params: None, or a list of params objects or dicts
+    :param size: number of elements
+    :return: list of interned params
+    """
+    if params is None:
+        return [params_class.intern()] * size
+
+    _params = []
+    for i in range(size):
+        param = params[i]
+        if isinstance(param, params_class):
+            _params.append(params_class.intern(*param._values()))  # pylint: disable=protected-access
+        else:
+            _params.append(params_class.intern(**param))
+    return _params
 
 
 class AlloyComposition(Composition):  # pylint: disable=too-many-ancestors
@@ -48,6 +156,10 @@ class AlloyComposition(Composition):  # pylint: disable=too-many-ancestors
     Class representing a AlloyComposition
 
     """
+
+    _instances: MutableMapping[tuple, AlloyComposition] = \
+        WeakValueDictionary()
+
     def __init__(self,
                  elements: Sequence[Union[str, Element, Species]],
                  concentrations: Sequence[float],
@@ -65,38 +177,53 @@ class AlloyComposition(Composition):  # pylint: disable=too-many-ancestors
             raise ValueError("Elements and concentrations doesn't have the "
                              "same size")
 
-        self._magnetic_params = OrderedDict()
-        for i, element in enumerate(elements):
+        species = [get_el_sp(element) for element in elements]
 
-            if magnetic_params is None:
-                ele_params = MagneticParams()
-            elif not isinstance(magnetic_params[i], MagneticParams):
-                ele_params = MagneticParams(**magnetic_params[i])
-            else:
-                ele_params = magnetic_params[i]
+        self._magnetic_params = dict(
+            zip(species,
+                _get_params(MagneticParams, magnetic_params, len(species))))
 
-            self._magnetic_params[get_el_sp(element)] = ele_params
+        self._screening_params = dict(
+            zip(species,
+                _get_params(ScreeningParams, screening_params, len(species))))
 
-        self._screening_params = OrderedDict()
-        for i, element in enumerate(elements):
+        super().__init__(strict=True,
+                         **dict(zip([str(sp) for sp in species],
+                                    concentrations)))
 
-            if screening_params is None:
-                ele_params = ScreeningParams()
-            elif not isinstance(screening_params[i], ScreeningParams):
-                ele_params = ScreeningParams(**screening_params[i])
-            else:
-                ele_params = screening_params[i]
+    @classmethod
+    def intern(cls,
+               elements: Sequence[Union[str, Element, Species]],
+               concentrations: Sequence[float],
+               magnetic_params: Sequence[MagneticParamsLike] = None,
+               screening_params: Sequence[ScreeningParamsLike] = None
+               ) -> AlloyComposition:
+        """
+        Shared instance of an alloy composition
 
-            self._screening_params[get_el_sp(element)] = ele_params
+        Sites of a supercell usually share a handful of distinct
+        compositions. Identical compositions created through this factory
+        are the same object, as long as one of them is alive.
 
-        _elements = [str(get_el_sp(e)) for e in elements]
+        :param elements: list of elements
+        :param concentrations: list of concentrations
+        :param magnetic_params: list of magnetic model
+        :param screening_params: list of electrostatic model
+        :return: instance of the alloy composition
+        """
+        size = len(elements)
 
-        self._is_paramagnetic = {
-            get_el_sp(element): mag_param.is_paramagnetic
-            for element, mag_param in self._magnetic_params.items()
-        }
+        key = (tuple(str(get_el_sp(element)) for element in elements),
+               tuple(float(c) for c in concentrations),
+               tuple(_get_params(MagneticParams, magnetic_params, size)),
+               tuple(_get_params(ScreeningParams, screening_params, size)))
 
-        super().__init__(strict=True, **dict(zip(_elements, concentrations)))
+        composition = cls._instances.get(key)
+        if composition is None:
+            composition = cls(elements, concentrations, key[2], key[3])
+            cls._instances[key] = composition
+
+        return composition
 
     @property
     def is_paramagnetic(self) -> Dict[Element, bool]:
@@ -104,7 +231,10 @@ class AlloyComposition(Composition):  # pylint: disable=too-many-ancestors
 
         :return: dictionary which describes with element is paramagnetic
         """
-        return self._is_paramagnetic
+        return {
+            element: mag_param.is_paramagnetic
+            for element, mag_param in self._magnetic_params.items()
+        }
 
     @property
     def concentrations(self) -> List[float]:
@@ -154,19 +284,24 @@ class AlloyComposition(Composition):  # pylint: disable=too-many-ancestors
         """
 
         magnetic_params = [
-            MagneticParams.from_dict(sd) for sd in d['magnetic_params']
+            sd if isinstance(sd, MagneticParams)
+            else MagneticParams.from_dict(sd) for sd in d['magnetic_params']
         ]
 
         screening_params = [
-            ScreeningParams.from_dict(sd) for sd in d['screening_params']
+            sd if isinstance(sd, ScreeningParams)
+            else ScreeningParams.from_dict(sd) for sd in d['screening_params']
         ]
 
-        elements = [Element.from_dict(e) for e in d['elements']]
+        elements = [
+            e if isinstance(e, (Element, Species)) else Element.from_dict(e)
+            for e in d['elements']
+        ]
 
         concentrations = [float(c) for c in d['concentrations']]
 
-        return AlloyComposition(elements, concentrations, magnetic_params,
-                                screening_params)
+        return cls.intern(elements, concentrations, magnetic_params,
+                          screening_params)
 
     def __eq__(self, other):
         """
@@ -176,6 +311,9 @@ class AlloyComposition(Composition):  # pylint: disable=too-many-ancestors
         :return: bool if the two composition are the same
         """
 
+        if other is self:
+            return True
+
         #  elements with amounts < Composition.amount_tolerance don't show up
         #  in the elmap, so checking len enables us to only check one
         #  compositions elements
@@ -190,3 +328,5 @@ class AlloyComposition(Composition):  # pylint: disable=too-many-ancestors
                 return False
 
         return True
+
+    __hash__ = Composition.__hash__
@@ -1,5 +1,15 @@
+"""
+This module implements the entries of a KGRN calculation of an alloy
+
+AlloyEntries are backed by AlloyEntriesColumns, which store one row per
+component of every site in flat arrays. Total moments, splittings and
+element averages are reductions over these arrays, the mapping of the
+sites to their ComponentEntries is only built when it is accessed.
+"""
+from __future__ import annotations
+
 from collections import OrderedDict
-from typing import Sequence, Union
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
 
 import numpy as np
 
@@ -8,7 +18,7 @@ from numpy.typing import ArrayLike
 from pymatgen.core.periodic_table import get_el_sp
 from pymatgen.core.units import Energy, FloatWithUnit
 
-from adamant_base.core.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
 
 
 class StructureEntries(MSONable):
@@ -84,7 +94,235 @@ class ComponentEntry(MSONable):
         return str(self.magnetic_moments)
 
     def __eq__(self, other):
-        return np.isclose(self.magnetic_moments, other.magnetic_moments)
+        if not isinstance(other, ComponentEntry):
+            return NotImplemented
+        return self.magnetic_moments.shape == other.magnetic_moments.shape \
+            and bool(np.allclose(self.magnetic_moments,
+                                 other.magnetic_moments))
+
+
+def _get_moments(entry: Union[ComponentEntry, Mapping, Sequence[float]]
+                 ) -> List[float]:
+    """
+
+    :param entry: ComponentEntry or its serialized form
+    :return: magnetic moments of the entry
+    """
+    if isinstance(entry, ComponentEntry):
+        return entry.magnetic_moments.tolist()
+    if isinstance(entry, Mapping):
+        entry = entry['magnetic_moments']
+    if isinstance(entry, Mapping):
+        # numpy arrays serialized by the MontyEncoder
+        entry = entry['data']
+    return list(np.atleast_1d(entry))
+
+
+def _get_symbol(element: Any) -> str:
+    if isinstance(element, Mapping):
+        return element['element']
+    return getattr(element, 'symbol', str(element))
+
+
+class AlloyEntriesColumns:
+    """
+    Columnar representation of the component entries of an alloy
+
+    Every component of every site is one row. Paramagnetic (DLM)
+    components have two magnetic moments, the second moment of all other
+    components is zero.
+    """
+    def __init__(self,
+                 num_sites: int,
+                 elements: Sequence[str],
+                 site_index: np.ndarray,
+                 component_index: np.ndarray,
+                 element_index: np.ndarray,
+                 concentrations: np.ndarray,
+                 moments: np.ndarray,
+                 is_paramagnetic: np.ndarray):
+        """
+
+        :param num_sites: number of sites of the structure
+        :param elements: symbols of the unique elements
+        :param site_index: (M,) index of the site of every row
+        :param component_index: (M,) index of the component on its site
+        :param element_index: (M,) index of the element of every row
+        :param concentrations: (M,) concentration of every row
+        :param moments: (M, 2) magnetic moments of every row
+        :param is_paramagnetic: (M,) True for paramagnetic components
+        """
+        self.num_sites = int(num_sites)
+        self.elements = list(elements)
+        self.site_index = np.asarray(site_index, dtype=np.int32)
+        self.component_index = np.asarray(component_index, dtype=np.int32)
+        self.element_index = np.asarray(element_index, dtype=np.int32)
+        self.concentrations = np.asarray(concentrations, dtype=float)
+        self.moments = np.asarray(moments, dtype=float).reshape(-1, 2)
+        self.is_paramagnetic = np.asarray(is_paramagnetic, dtype=bool)
+
+        if not (len(self.site_index) == len(self.component_index) ==
+                len(self.element_index) == len(self.concentrations) ==
+                len(self.moments) == len(self.is_paramagnetic)):
+            raise ValueError("The columns doesn't have the same size")
+
+    def __len__(self):
+        return len(self.site_index)
+
+    @classmethod
+    def from_rows(cls, num_sites: int,
+                  rows: Sequence[Sequence[tuple]]) -> AlloyEntriesColumns:
+        """
+
+        :param num_sites: number of sites of the structure
+        :param rows: (symbol, concentration, moments) of every component
+            of every site
+        :return: columnar representation of the entries
+        """
+        if len(rows) != num_sites:
+            raise ValueError("The length is not the same")
+
+        elements: Dict[str, int] = {}
+        site_index, component_index, element_index = [], [], []
+        concentrations, moments, is_paramagnetic = [], [], []
+
+        for index_site, site_rows in enumerate(rows):
+            for index_comp, (symbol, concentration,
+                             values) in enumerate(site_rows):
+                if len(values) not in (1, 2):
+                    raise ValueError(f"Invalid number of magnetic moments "
+                                     f"{len(values)} on site {index_site}")
+
+                site_index.append(index_site)
+                component_index.append(index_comp)
+                element_index.append(elements.setdefault(symbol,
+                                                         len(elements)))
+                concentrations.append(concentration)
+                is_paramagnetic.append(len(values) == 2)
+                moments.append((values[0], values[1] if len(values) == 2
+                                else 0.0))
+
+        return cls(num_sites, list(elements), site_index, component_index,
+                   element_index, concentrations, np.reshape(moments, (-1, 2)),
+                   is_paramagnetic)
+
+    @classmethod
+    def from_site_entries(cls, alloy_structure: AlloyStructure,
+                          site_entries: Sequence[Sequence[ComponentEntry]]
+                          ) -> AlloyEntriesColumns:
+        """
+
+        :param alloy_structure: alloy structure of the entries
+        :param site_entries: component entries of every site
+        :return: columnar representation of the entries
+        """
+        if len(site_entries) != alloy_structure.num_sites:
+            raise ValueError("The length is not the same")
+
+        return cls.from_rows(alloy_structure.num_sites, [
+            [(comp.symbol, concentration, _get_moments(entry))
+             for (comp, concentration), entry in zip(
+                 site.species.items(), site_entry)]
+            for site, site_entry in zip(alloy_structure, site_entries)
+        ])
+
+    @classmethod
+    def from_dict(cls, d: Mapping) -> AlloyEntriesColumns:
+        """
+        Read serialized AlloyEntries without building the structure
+
+        :param d: dict created by AlloyEntries.as_dict, e.g. the
+            `alloy_entries` output of a KgrnCalculation
+        :return: columnar representation of the entries
+        """
+        sites = d['alloy_structure']['sites']
+
+        return cls.from_rows(len(sites), [
+            [(_get_symbol(element), float(concentration),
+              _get_moments(entry))
+             for element, concentration, entry in zip(
+                 site['species']['elements'],
+                 site['species']['concentrations'], site_entry)]
+            for site, site_entry in zip(sites, d['site_entries'])
+        ])
+
+    @property
+    def component_moments(self) -> np.ndarray:
+        """
+
+        :return: (M,) total magnetic moment of every component
+        """
+        return self.moments.sum(axis=1)
+
+    @property
+    def magnetic_splitting(self) -> np.ndarray:
+        """
+
+        :return: (M,) splitting of the paramagnetic components, zero for
+            all other components
+        """
+        return np.where(self.is_paramagnetic,
+                        self.moments[:, 1] - self.moments[:, 0], 0.0)
+
+    @property
+    def weighted_moments(self) -> np.ndarray:
+        """
+        Concentration weighted magnetic moment of every row
+
+        The two moments of a paramagnetic (DLM) component each belong to
+        half of its concentration.
+
+        :return: (M,) weighted magnetic moment of every row
+        """
+        weights = self.concentrations / np.where(self.is_paramagnetic, 2, 1)
+        return (weights[:, None] * self.moments).sum(axis=1)
+
+    @property
+    def site_magnetic_moments(self) -> np.ndarray:
+        """
+
+        :return: (N,) concentration weighted magnetic moment of every site
+        """
+        return np.bincount(self.site_index,
+                           weights=self.weighted_moments,
+                           minlength=self.num_sites)
+
+    @property
+    def total_magnetic_moment(self) -> float:
+        """
+
+        :return: magnetic moment of the structure
+        """
+        return float(self.weighted_moments.sum())
+
+    def get_element_averages(self,
+                             values: Optional[np.ndarray] = None
+                             ) -> Dict[str, float]:
+        """
+        Concentration weighted average of a quantity over all components of
+        the same element
+
+        :param values: (M,) quantity of every row, the magnetic moments
+            weighted as in weighted_moments by default
+        :return: average of every element
+        """
+        if values is None:
+            weighted = self.weighted_moments
+        else:
+            weighted = self.concentrations * values
+
+        size = len(self.elements)
+        weights = np.bincount(self.element_index,
+                              weights=self.concentrations,
+                              minlength=size)
+        sums = np.bincount(self.element_index,
+                           weights=weighted,
+                           minlength=size)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            averages = sums / weights
+
+        return dict(zip(self.elements, averages.tolist()))
 
 
 class AlloyEntries(MSONable):
@@ -100,22 +338,9 @@ class AlloyEntries(MSONable):
         # ensure that everything is a real mutable list
         self._base_site_entries = [list(s) for s in site_entries]
 
-        if len(site_entries) != alloy_structure.num_sites:
-            raise ValueError("The length is not the same")
-
-        self._site_entries = OrderedDict()
-        for index_site, site in enumerate(self._alloy_structure):
-
-            comp_mapping = ComponentEntries()
-
-            site_entry = site_entries[index_site]
-
-            for index_comp, comp in enumerate(site.species):
-                comp_entry = site_entry[index_comp]
-
-                comp_mapping[comp] = comp_entry
-
-            self._site_entries[site] = comp_mapping
+        self._columns = AlloyEntriesColumns.from_site_entries(
+            alloy_structure, self._base_site_entries)
+        self._site_entries = None
 
     def as_dict(self):
         return {
@@ -126,10 +351,39 @@ class AlloyEntries(MSONable):
             "site_entries": self._base_site_entries,
         }
 
+    @property
+    def columns(self) -> AlloyEntriesColumns:
+        return self._columns
+
     @property
     def site_entries(self):
+        if self._site_entries is None:
+            self._site_entries = OrderedDict()
+            for site, site_entry in zip(self._alloy_structure,
+                                        self._base_site_entries):
+                comp_mapping = ComponentEntries()
+                for comp, comp_entry in zip(site.species, site_entry):
+                    comp_mapping[comp] = comp_entry
+
+                self._site_entries[site] = comp_mapping
+
         return self._site_entries
 
+    @property
+    def total_magnetic_moment(self) -> float:
+        return self._columns.total_magnetic_moment
+
+    @property
+    def site_magnetic_moments(self) -> np.ndarray:
+        return self._columns.site_magnetic_moments
+
+    @property
+    def magnetic_splitting(self) -> np.ndarray:
+        return self._columns.magnetic_splitting
+
+    def get_element_averages(self) -> Dict[str, float]:
+        return self._columns.get_element_averages()
+
     @property
     def total_energy(self):
         return self._structure_entries.total_energy
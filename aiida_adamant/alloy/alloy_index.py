@@ -0,0 +1,85 @@
+"""
+This module implements an index to drop duplicate alloy structures
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List
+
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+
+
+class AlloyStructureIndex:
+    """
+    Index of unique alloy structures
+
+    Structures are bucketed by their canonical fingerprint, so adding N
+    structures costs O(N) fingerprints instead of O(N^2) comparisons. Only
+    structures of the same bucket are compared.
+    """
+    def __init__(self,
+                 structures: Iterable[AlloyStructure] = (),
+                 tolerance: float = 1e-5):
+        """
+
+        :param structures: structures to add to the index
+        :param tolerance: spacing of the rounding grid of the fingerprint
+        """
+        self.tolerance = tolerance
+
+        self._buckets: Dict[str, List[AlloyStructure]] = {}
+        self._unique: List[AlloyStructure] = []
+
+        for structure in structures:
+            self.add(structure)
+
+    def _find(self, structure: AlloyStructure, fingerprint: str):
+        for candidate in self._buckets.get(fingerprint, ()):
+            if candidate == structure:
+                return candidate
+        return None
+
+    def add(self, structure: AlloyStructure) -> bool:
+        """
+        Add a structure if no equal structure is part of the index
+
+        :param structure: alloy structure
+        :return: True if the structure was added
+        """
+        fingerprint = structure.fingerprint(self.tolerance)
+
+        if self._find(structure, fingerprint) is not None:
+            return False
+
+        self._buckets.setdefault(fingerprint, []).append(structure)
+        self._unique.append(structure)
+        return True
+
+    def __contains__(self, structure: AlloyStructure) -> bool:
+        fingerprint = structure.fingerprint(self.tolerance)
+        return self._find(structure, fingerprint) is not None
+
+    def __len__(self) -> int:
+        return len(self._unique)
+
+    def __iter__(self) -> Iterator[AlloyStructure]:
+        return iter(self._unique)
+
+    @property
+    def unique(self) -> List[AlloyStructure]:
+        """
+
+        :return: unique structures in the order they were added
+        """
+        return list(self._unique)
+
+
+def get_unique_structures(structures: Iterable[AlloyStructure],
+                          tolerance: float = 1e-5) -> List[AlloyStructure]:
+    """
+    Drop duplicate configurations from a list of structures
+
+    :param structures: candidate structures
+    :param tolerance: spacing of the rounding grid of the fingerprint
+    :return: first occurrence of every distinct structure
+    """
+    return AlloyStructureIndex(structures, tolerance).unique
@@ -4,9 +4,10 @@ from typing import Union, List, Sequence, Optional
 import numpy as np
 from monty.json import MontyDecoder, MontyEncoder
 from pymatgen.core import Lattice, Structure, PeriodicSite, FloatWithUnit, Unit
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 
 from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_symmetry import symmetry_cache, \
+    get_canonical_fingerprint, get_species_counts, match_sites
 
 
 class AlloyStructure(Structure):
@@ -21,30 +22,21 @@ class AlloyStructure(Structure):
                  coords_are_cartesian: bool = False,
                  site_properties: dict = None,
                  properties: dict = None,
+                 symprec: float = 0.01,
+                 analyze_symmetry: bool = True,
                  ):
-
-        structure = Structure(lattice, species, coords, charge,
-                              validate_proximity, to_unit_cell,
-                              coords_are_cartesian)
-
-        _site_properties = {'site_index': [],
-                            'neq_site_index': []}
-
-        symmetric_structure = SpacegroupAnalyzer(
-            structure).get_symmetrized_structure()
-
-        site_index = 0
-        nonequivalent_site_index = 0
-        for eq_sites in symmetric_structure.equivalent_sites:
-            nonequivalent_site_index += 1
-            for _ in eq_sites:
-                site_index += 1
-                _site_properties['site_index'].append(site_index)
-                _site_properties['neq_site_index'].append(
-                    nonequivalent_site_index)
-
-        if site_properties is not None:
-            _site_properties.update(site_properties)
+        """
+        The site_index and neq_site_index site properties are determined by
+        a symmetry analysis on first access, unless they are supplied in
+        site_properties.
+
+        :param symprec: tolerance of the symmetry analysis
+        :param analyze_symmetry: if False, missing indices are not determined
+            by a symmetry analysis but every site is treated as
+            nonequivalent
+        """
+        self._symprec = symprec
+        self._analyze_symmetry = analyze_symmetry
 
         super().__init__(lattice,
                          species,
@@ -53,7 +45,7 @@ class AlloyStructure(Structure):
                          validate_proximity,
                          to_unit_cell,
                          coords_are_cartesian,
-                         _site_properties)
+                         site_properties)
 
         self._properties = properties if properties is not None else {}
 
@@ -70,6 +62,49 @@ class AlloyStructure(Structure):
     def properties(self):
         return self._properties
 
+    @property
+    def site_index(self) -> List[int]:
+        """
+
+        :return: index of every site, grouped by equivalent sites
+        """
+        return self._get_site_indices()[0]
+
+    @property
+    def neq_site_index(self) -> List[int]:
+        """
+
+        :return: index of the nonequivalent site of every site
+        """
+        return self._get_site_indices()[1]
+
+    def _get_site_indices(self):
+        """
+        Determine the site indices if they are not yet set on every site
+
+        :return: lists of site_index and neq_site_index
+        """
+        site_index = [site.properties.get('site_index') for site in self]
+        neq_site_index = [site.properties.get('neq_site_index')
+                          for site in self]
+
+        if None not in site_index and None not in neq_site_index:
+            return site_index, neq_site_index
+
+        if self._analyze_symmetry:
+            site_index, neq_site_index = symmetry_cache.get_site_indices(
+                self._lattice, [site.species for site in self],
+                self.frac_coords, symprec=self._symprec)
+        else:
+            site_index = list(range(1, len(self) + 1))
+            neq_site_index = list(site_index)
+
+        for site, index, neq_index in zip(self, site_index, neq_site_index):
+            site.properties['site_index'] = index
+            site.properties['neq_site_index'] = neq_index
+
+        return site_index, neq_site_index
+
     @properties.setter
     def properties(self, value: dict):
         if value is not None:
@@ -167,6 +202,9 @@ class AlloyStructure(Structure):
 
         structure = super().copy(site_properties, sanitize)
 
+        structure._symprec = self._symprec
+        structure._analyze_symmetry = self._analyze_symmetry
+
         structure.properties.update(self._properties)
 
         if properties is not None:
@@ -178,18 +216,40 @@ class AlloyStructure(Structure):
 
         return structure
 
+    def fingerprint(self, tolerance: float = 1e-5) -> str:
+        """
+        Canonical fingerprint of the lattice, species and sites
+
+        The fingerprint does not depend on the order of the sites.
+        Coordinates and lattice vectors are compared on a grid with the
+        spacing tolerance.
+
+        :param tolerance: spacing of the rounding grid
+        :return: hex digest
+        """
+        return get_canonical_fingerprint(self._lattice,
+                                         [site.species for site in self],
+                                         self.frac_coords, tolerance)
+
     def __eq__(self, other):
         if other is self:
             return True
-        if other is None:
+        if not isinstance(other, AlloyStructure):
             return False
         if len(self) != len(other):
             return False
         if self.lattice != other.lattice:
             return False
-        for site in self:
-            if site not in other:
-                return False
         if self.properties != other.properties:
             return False
-        return True
+        return match_sites(self._lattice, [site.species for site in self],
+                           self.frac_coords,
+                           [site.species for site in other],
+                           other.frac_coords,
+                           atol=PeriodicSite.position_atol)
+
+    def __hash__(self):
+        # coordinates are not part of the hash, equal structures could be
+        # rounded to different values
+        return hash(frozenset(
+            get_species_counts([site.species for site in self]).items()))
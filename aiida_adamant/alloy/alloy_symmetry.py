@@ -0,0 +1,338 @@
+"""
+This module implements a cache for the symmetry analysis of alloy structures
+
+The assignment of the site_index and neq_site_index properties only depends
+on the lattice, the fractional coordinates and the species of the sites.
+The result of the analysis is therefore cached under a canonical fingerprint
+of these quantities, so that structures which are constructed over and over
+again (from_dict, from_sites, copy, lattice scans, ...) only run spglib once.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import Counter, OrderedDict, namedtuple
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from pymatgen.core import Lattice, Structure
+from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+SiteIndices = Tuple[List[int], List[int]]
+
+
+def get_species_key(species) -> Tuple:
+    """
+    Hashable key of an alloy composition
+
+    Two compositions with the same key are treated as the same species by the
+    symmetry analysis.
+
+    :param species: alloy composition
+    :return: tuple describing the composition and its component params
+    """
+    key = []
+    for comp, concentration in species.items():
+        screening = species.screening_params[comp]
+        magnetic = species.magnetic_params[comp]
+        key.append((str(comp), round(concentration, 8), screening.alpha,
+                    screening.beta, magnetic.is_paramagnetic,
+                    magnetic.magnetic_model, magnetic.init_mag_mom))
+    return tuple(key)
+
+
+def round_to_grid(lattice: Lattice, frac_coords: np.ndarray,
+                  tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Round lattice vectors and wrapped fractional coordinates to a grid
+
+    :param lattice: lattice of the structure
+    :param frac_coords: (N, 3) fractional coordinates
+    :param tolerance: spacing of the rounding grid
+    :return: integer lattice matrix and (N, 3) integer coordinates
+    """
+    grid = int(round(1 / tolerance))
+
+    matrix = np.rint(lattice.matrix * grid).astype(np.int64)
+    coords = np.rint(np.asarray(frac_coords, dtype=float) * grid)
+    coords = coords.astype(np.int64).reshape(-1, 3) % grid
+
+    return matrix, coords
+
+
+def _get_site_keys(species: Sequence[Any]) -> List[Tuple]:
+    """
+
+    :param species: alloy composition of every site
+    :return: species key of every site, computed once per composition
+    """
+    species_keys: Dict[int, Tuple] = {}
+    site_keys = []
+    for specie in species:
+        key = species_keys.get(id(specie))
+        if key is None:
+            key = species_keys[id(specie)] = get_species_key(specie)
+        site_keys.append(key)
+    return site_keys
+
+
+def get_fingerprint(lattice: Lattice,
+                    species: Sequence[Any],
+                    frac_coords: np.ndarray,
+                    tolerance: float = 1e-5) -> str:
+    """
+    Canonical fingerprint of an ordered list of sites
+
+    Lattice vectors and fractional coordinates are rounded to a grid with the
+    spacing tolerance. Fractional coordinates are wrapped into the unit cell.
+
+    :param lattice: lattice of the structure
+    :param species: alloy composition of every site
+    :param frac_coords: (N, 3) fractional coordinates
+    :param tolerance: spacing of the rounding grid
+    :return: hex digest
+    """
+    matrix, coords = round_to_grid(lattice, frac_coords, tolerance)
+
+    labels: Dict[Tuple, int] = {}
+    site_labels = [labels.setdefault(key, len(labels))
+                   for key in _get_site_keys(species)]
+
+    digest = hashlib.sha1()
+    digest.update(matrix.tobytes())
+    digest.update(coords.tobytes())
+    digest.update(np.array(site_labels, dtype=np.int64).tobytes())
+    digest.update(repr(list(labels)).encode())
+
+    return digest.hexdigest()
+
+
+def get_canonical_fingerprint(lattice: Lattice,
+                              species: Sequence[Any],
+                              frac_coords: np.ndarray,
+                              tolerance: float = 1e-5) -> str:
+    """
+    Fingerprint of a structure which does not depend on the order of sites
+
+    Species are labeled by the rank of their key and the sites are sorted by
+    label and rounded fractional coordinates before hashing, so the
+    fingerprint is obtained in O(N log N).
+
+    :param lattice: lattice of the structure
+    :param species: alloy composition of every site
+    :param frac_coords: (N, 3) fractional coordinates
+    :param tolerance: spacing of the rounding grid
+    :return: hex digest
+    """
+    matrix, coords = round_to_grid(lattice, frac_coords, tolerance)
+
+    site_keys = _get_site_keys(species)
+    unique_keys = sorted(set(site_keys))
+    ranks = {key: rank for rank, key in enumerate(unique_keys)}
+
+    sites = np.empty((len(site_keys), 4), dtype=np.int64)
+    sites[:, 0] = [ranks[key] for key in site_keys]
+    sites[:, 1:] = coords
+    sites = sites[np.lexsort(sites.T[::-1])]
+
+    digest = hashlib.sha1()
+    digest.update(matrix.tobytes())
+    digest.update(sites.tobytes())
+    digest.update(repr(unique_keys).encode())
+
+    return digest.hexdigest()
+
+
+def get_species_counts(species: Sequence[Any]) -> Counter:
+    """
+
+    :param species: alloy composition of every site
+    :return: number of sites of every species key
+    """
+    return Counter(_get_site_keys(species))
+
+
+def _get_distances(lattice: Lattice, diff: np.ndarray) -> np.ndarray:
+    """
+
+    :param lattice: lattice of the structure
+    :param diff: (..., 3) differences of fractional coordinates
+    :return: cartesian length of the shortest periodic image
+    """
+    diff = diff - np.round(diff)
+    return np.linalg.norm(diff @ lattice.matrix, axis=-1)
+
+
+def match_sites(lattice: Lattice,
+                species: Sequence[Any],
+                frac_coords: np.ndarray,
+                other_species: Sequence[Any],
+                other_frac_coords: np.ndarray,
+                atol: float = 1e-5) -> bool:
+    """
+    Check whether two lists of sites in the same lattice are equal up to
+    the order of the sites
+
+    The sites are sorted by species and wrapped fractional coordinates and
+    compared with a tolerance. Only if this fails, e.g. because a coordinate
+    lies close to the cell boundary, the sites of every species are matched
+    one by one.
+
+    :param lattice: common lattice of the sites
+    :param species: alloy composition of every site
+    :param frac_coords: (N, 3) fractional coordinates
+    :param other_species: alloy composition of every other site
+    :param other_frac_coords: (N, 3) fractional coordinates of the other
+        sites
+    :param atol: tolerance of the cartesian distance of matching sites
+    :return: True if every site has a matching other site
+    """
+    site_keys = _get_site_keys(species)
+    other_keys = _get_site_keys(other_species)
+
+    if Counter(site_keys) != Counter(other_keys):
+        return False
+
+    ranks = {key: rank for rank, key in enumerate(sorted(set(site_keys)))}
+    labels = np.array([ranks[key] for key in site_keys], dtype=np.int64)
+    other_labels = np.array([ranks[key] for key in other_keys],
+                            dtype=np.int64)
+
+    coords = np.mod(np.asarray(frac_coords, dtype=float).reshape(-1, 3), 1.)
+    other_coords = np.mod(
+        np.asarray(other_frac_coords, dtype=float).reshape(-1, 3), 1.)
+
+    order = np.lexsort((*coords.T[::-1], labels))
+    other_order = np.lexsort((*other_coords.T[::-1], other_labels))
+
+    if np.all(_get_distances(lattice, coords[order] -
+                             other_coords[other_order]) <= atol):
+        return True
+
+    for rank in range(len(ranks)):
+        candidates = other_coords[other_labels == rank]
+        unmatched = np.ones(len(candidates), dtype=bool)
+
+        for site_coords in coords[labels == rank]:
+            close = unmatched & (_get_distances(
+                lattice, candidates - site_coords) <= atol)
+            index = int(np.argmax(close))
+            if not close[index]:
+                return False
+            unmatched[index] = False
+
+    return True
+
+
+def analyze_equivalent_sites(lattice: Lattice,
+                             species: Sequence[Any],
+                             frac_coords: np.ndarray,
+                             symprec: float = 0.01) -> SiteIndices:
+    """
+    Run the symmetry analysis and enumerate the equivalent sites
+
+    :param lattice: lattice of the structure
+    :param species: alloy composition of every site
+    :param frac_coords: (N, 3) fractional coordinates
+    :param symprec: tolerance of the symmetry analysis
+    :return: lists of site_index and neq_site_index
+    """
+    structure = Structure(lattice, species, frac_coords)
+
+    symmetric_structure = SpacegroupAnalyzer(
+        structure, symprec=symprec).get_symmetrized_structure()
+
+    site_index = []
+    neq_site_index = []
+
+    index = 0
+    nonequivalent_site_index = 0
+    for eq_sites in symmetric_structure.equivalent_sites:
+        nonequivalent_site_index += 1
+        for _ in eq_sites:
+            index += 1
+            site_index.append(index)
+            neq_site_index.append(nonequivalent_site_index)
+
+    return site_index, neq_site_index
+
+
+class SymmetryCache:
+    """
+    Bounded LRU cache of the equivalent site indices
+
+    """
+    def __init__(self, maxsize: int = 256, tolerance: float = 1e-5):
+        """
+
+        :param maxsize: maximal number of cached structures
+        :param tolerance: spacing of the rounding grid of the fingerprint
+        """
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+
+        self._entries: OrderedDict[str, Tuple[Tuple[int, ...],
+                                              Tuple[int, ...]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_site_indices(self,
+                         lattice: Lattice,
+                         species: Sequence[Any],
+                         frac_coords: np.ndarray,
+                         symprec: float = 0.01) -> SiteIndices:
+        """
+        Cached version of analyze_equivalent_sites
+
+        :param lattice: lattice of the structure
+        :param species: alloy composition of every site
+        :param frac_coords: (N, 3) fractional coordinates
+        :param symprec: tolerance of the symmetry analysis
+        :return: lists of site_index and neq_site_index
+        """
+        key = f"{symprec!r}:" + get_fingerprint(lattice, species, frac_coords,
+                                                self.tolerance)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return list(entry[0]), list(entry[1])
+            self._misses += 1
+
+        site_index, neq_site_index = analyze_equivalent_sites(
+            lattice, species, frac_coords, symprec)
+
+        with self._lock:
+            self._entries[key] = (tuple(site_index), tuple(neq_site_index))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return site_index, neq_site_index
+
+    def cache_info(self) -> CacheInfo:
+        """
+
+        :return: hit/miss statistics in the format of functools.lru_cache
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize,
+                             len(self._entries))
+
+    def cache_clear(self) -> None:
+        """
+        Remove all entries and reset the statistics
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+#: cache used by AlloyStructure
+symmetry_cache = SymmetryCache()
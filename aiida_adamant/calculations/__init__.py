@@ -1,3 +1,4 @@
 from .kgrn_calculation import KgrnCalculation
+from .kgrn_input_deck import KgrnInputDeck
 
-__all__ = ['KgrnCalculation']
+__all__ = ['KgrnCalculation', 'KgrnInputDeck']
@@ -5,18 +5,76 @@ Register calculations via the "aiida.calculations" entry point in setup.json.
 """
 from __future__ import annotations
 
-from typing import Optional
+import os
+from typing import TYPE_CHECKING, Optional
 
 from aiida.common import datastructures, CalcInfo, CodeInfo
 from aiida.common.folders import Folder
 from aiida.engine import CalcJob
-from aiida.orm import SinglefileData, StructureData, List
-from aiida.plugins import DataFactory
-from pymatgen.util.typing import PathLike
-
+from aiida.orm import Dict, RemoteData, SinglefileData, StructureData, List
+
+from aiida_adamant.calculations.kgrn_renderer import KgrnInputRenderer
+from aiida_adamant.data.inputs.atom_cfg import AtomConfigData
+from aiida_adamant.data.inputs.kgrn_params import (KgrnParams,
+                                                   get_params_validator)
+from aiida_adamant.data.inputs.kgrn_params import \
+    KgrnParamsData as KgrnInputData
+from aiida_adamant.data.inputs.transfer_matrix import TransferMatrixData
+from aiida_adamant.data.outputs.compressed_folder import CompressedFolderData
 from aiida_adamant.utils.defaults import KgrnDefaults
+from aiida_adamant.utils.remote_cache import STATIC_INPUTS, get_cached_path
+from aiida_adamant.utils.timing import (NULL_TIMER, TIMINGS_EXTRA,
+                                        SectionTimer)
+
+if TYPE_CHECKING:
+    from pymatgen.util.typing import PathLike
+
+
+def validate_kgrn_inputs(value, _):
+    """
+    Check that the parameters without a default are given and that an
+    atomic configuration exists for every element
+
+    :param value: inputs of the kgrn namespace
+    :return: error message, if the validation fails
+    """
+    params = value.get('params')
+    if isinstance(params, KgrnInputData):
+        try:
+            get_params_validator().check_required(params.get_dict())
+        except ValueError as exc:
+            return str(exc)
 
-KgrnInputData = DataFactory('adamant.kgrn_data')
+    atom_cfg = value.get('atom_cfg')
+    structure = value.get('structure')
+
+    if not isinstance(atom_cfg, AtomConfigData) or structure is None:
+        return None
+
+    missing = atom_cfg.get_missing(
+        {symbol for kind in structure.kinds for symbol in kind.symbols})
+    if missing:
+        return (f"atom_cfg has no atomic configuration for "
+                f"{', '.join(missing)}")
+
+    return None
+
+
+def validate_retrieve_categories(value, _):
+    """
+    Check the names of the retrieved output categories
+
+    :param value: names of the categories
+    :return: error message, if the validation fails
+    """
+    categories = KgrnDefaults.OUTPUT_CATEGORIES._fields
+
+    unknown = set(value) - set(categories)
+    if unknown:
+        return (f"Unknown output categories {', '.join(sorted(unknown))}, "
+                f"choose from {', '.join(categories)}")
+
+    return None
 
 
 class KgrnCalculation(CalcJob):
@@ -25,6 +83,10 @@ class KgrnCalculation(CalcJob):
 
     Simple AiiDA plugin wrapper for 'diffing' two files.
     """
+    config_files = KgrnDefaults.CONFIG_FILES
+    output_dirs = KgrnDefaults.OUTPUT_DIRS
+    output_categories = KgrnDefaults.OUTPUT_CATEGORIES
+
     @classmethod
     def define(cls, spec):
         """Define inputs and outputs of the calculation."""
@@ -32,7 +94,8 @@ class KgrnCalculation(CalcJob):
 
         spec.input_namespace('kgrn',
                              required=True,
-                             help='Structure related kgrn input files')
+                             help='Structure related kgrn input files',
+                             validator=validate_kgrn_inputs)
 
         spec.input('kgrn.structure',
                    required=True,
@@ -47,8 +110,9 @@ class KgrnCalculation(CalcJob):
         # Transfer Matrix
         spec.input('kgrn.transfer_matrix',
                    required=True,
-                   valid_type=List,
-                   help='List of structure constants')
+                   valid_type=(List, TransferMatrixData),
+                   help='Structure constants, only TransferMatrixData is '
+                   'written into the calculation folder')
 
         # Shape function
         spec.input('kgrn.shape_function',
@@ -65,8 +129,68 @@ class KgrnCalculation(CalcJob):
         # Atomic config
         spec.input('kgrn.atom_cfg',
                    required=True,
-                   valid_type=SinglefileData,
-                   help='Atomic configuration for this structure')
+                   valid_type=(SinglefileData, AtomConfigData),
+                   help='Atomic configuration for this structure. Of an '
+                   'AtomConfigData only the elements of the structure are '
+                   'written.')
+
+        spec.input('static_inputs',
+                   required=False,
+                   valid_type=RemoteData,
+                   help='Cache folder created by stage_static_inputs. '
+                   'Staged static inputs are linked instead of uploaded.')
+
+        spec.input('metadata.options.symlink_static_inputs',
+                   valid_type=bool,
+                   default=True,
+                   help='If False, staged static inputs are copied on the '
+                   'remote computer instead of symlinked.')
+
+        spec.input('parent_folder',
+                   required=False,
+                   valid_type=RemoteData,
+                   help='Remote folder of a converged calculation. Its '
+                   'potential and charge density are used as starting point '
+                   '(STRT=B).')
+
+        spec.input('metadata.options.symlink_parent_folder',
+                   valid_type=bool,
+                   default=False,
+                   help='If True, the restart directories are symlinked '
+                   'instead of copied. KGRN overwrites the files in these '
+                   'directories, so only use it if the parent folder is not '
+                   'needed anymore.')
+
+        spec.input('metadata.options.retrieve_categories',
+                   valid_type=(list, tuple),
+                   default=KgrnDefaults.RETRIEVE_CATEGORIES,
+                   validator=validate_retrieve_categories,
+                   help='Output files which are kept: the output file '
+                   "('output'), the prints ('prints', DIR006), the control "
+                   "files ('control', DIR003) and the full charge densities "
+                   "('charge_density', DIR010).")
+
+        spec.input('metadata.options.compress_retrieved',
+                   valid_type=bool,
+                   default=True,
+                   help='If True, the kept prints, control files and full '
+                   'charge densities are stored gzip compressed in the '
+                   '`output_files` output, otherwise uncompressed in the '
+                   'retrieved folder. The output file is always kept '
+                   'uncompressed in the retrieved folder.')
+
+        spec.input('metadata.options.record_timings',
+                   valid_type=bool,
+                   default=False,
+                   help='If True, the time spent in the sections of '
+                   'prepare_for_submission is stored in the '
+                   f'`{TIMINGS_EXTRA}` extra of the calculation, nested '
+                   'sections under the path of their parents.')
+
+        spec.input('metadata.options.job_name',
+                   valid_type=str,
+                   default=KgrnDefaults.JOB_NAME,
+                   help='Job name (JOBNAM) written into the input file')
 
         spec.input('metadata.options.input_filename',
                    valid_type=str,
@@ -76,13 +200,82 @@ class KgrnCalculation(CalcJob):
                    valid_type=str,
                    default=KgrnDefaults.OUTPUT_FILENAME)
 
+        spec.input('metadata.options.parser_name',
+                   valid_type=str,
+                   default=KgrnDefaults.PARSER_NAME)
+
+        spec.output('output_parameters',
+                    valid_type=Dict,
+                    help='Energies and SCF history of the calculation')
+
+        spec.output('alloy_entries',
+                    valid_type=Dict,
+                    required=False,
+                    help='Serialized AlloyEntries with the magnetic moments '
+                    'of every component')
+
+        spec.output('output_files',
+                    valid_type=CompressedFolderData,
+                    required=False,
+                    help='Compressed output files of the retrieved '
+                    'categories')
+
+        spec.default_output_node = 'output_parameters'
 
         spec.exit_code(100,
                        'ERROR_MISSING_OUTPUT_FILES',
                        message='Calculation did not produce all expected '
                        'output files.')
 
-        print("DEFINE WAS CALLED")
+        spec.exit_code(300,
+                       'ERROR_READING_OUTPUT_FILE',
+                       message='The output file could not be read.')
+
+        spec.exit_code(301,
+                       'ERROR_INVALID_OUTPUT',
+                       message='The output file is incomplete or does not '
+                       'match the structure.')
+
+        spec.exit_code(400,
+                       'ERROR_SCF_NOT_CONVERGED',
+                       message='The self-consistency cycle did not '
+                       'converge.')
+
+    @property
+    def structure(self):
+        """
+
+        :return: alloy structure of the kgrn structure input
+        """
+        try:
+            return self._alloy_structure
+        except AttributeError:
+            # pymatgen is only imported when an input file is written
+            from aiida_adamant.utils.structure import get_alloy_structure
+
+            self._alloy_structure = get_alloy_structure(
+                self.inputs.kgrn.structure)
+            return self._alloy_structure
+
+    @property
+    def job_name(self) -> str:
+        return self.options.job_name
+
+    @property
+    def params(self) -> KgrnParams:
+        """
+
+        :return: resolved kgrn parameters, STRT is switched to a restart if
+            a parent folder is given
+        """
+        try:
+            return self._params
+        except AttributeError:
+            params = KgrnParams(self.inputs.kgrn.params.get_dict())
+            if 'parent_folder' in self.inputs:
+                params['strt'] = KgrnDefaults.RESTART_STRT
+            self._params = params
+            return self._params
 
     def prepare_for_submission(self, folder: Folder) -> CalcInfo:
         """
@@ -93,16 +286,105 @@ class KgrnCalculation(CalcJob):
             the calculation.
         :return: `aiida.common.datastructures.CalcInfo` instance
         """
+        timer = SectionTimer() if self.options.record_timings \
+            else NULL_TIMER
 
+        with timer.section('total'):
+            calcinfo = self._prepare_for_submission(folder, timer)
 
-        with folder.open(self.options.input_filename, 'w',
-                         encoding='utf8') as handle:
+        if timer is not NULL_TIMER:
+            self.node.set_extra(TIMINGS_EXTRA, timer.timings)
+            self.logger.info('prepare_for_submission timings [s]: %s',
+                             ', '.join(f'{name}={seconds:.4f}' for name,
+                                       seconds in timer.timings.items()))
 
-            handle.write(self.create_input_file_string())
-
-        # Write shape function
+        return calcinfo
 
+    def _prepare_for_submission(self, folder: Folder,
+                                timer: SectionTimer) -> CalcInfo:
+        """
+        Create input files, timing the sections
 
+        :param folder: folder of the input files
+        :param timer: timer of the sections
+        :return: `aiida.common.datastructures.CalcInfo` instance
+        """
+        # the inputs are loaded and the symmetry is analyzed on first use,
+        # trigger it here to time it separately from the input file
+        with timer.section('load_inputs'):
+            _ = self.params
+            structure = self.structure
+
+        with timer.section('symmetry'):
+            _ = structure.site_index
+
+        with timer.section('input_file'), \
+                folder.open(self.options.input_filename, 'w',
+                            encoding='utf8') as handle:
+
+            KgrnInputRenderer(self, timer).write(handle)
+
+        transfer_matrix = self.inputs.kgrn.transfer_matrix
+        if isinstance(transfer_matrix, TransferMatrixData):
+            with timer.section('transfer_matrix'), \
+                    folder.open(self.config_files.transfer_matrix.name,
+                                'wb') as handle:
+                transfer_matrix.write(handle)
+        else:
+            self.logger.warning('The transfer matrix is given as List, '
+                                'it is not written into the calculation '
+                                'folder')
+
+        local_copy_list = []
+        remote_copy_list = []
+        remote_symlink_list = []
+
+        if self.options.symlink_static_inputs:
+            remote_list = remote_symlink_list
+        else:
+            remote_list = remote_copy_list
+
+        static_inputs = self.inputs.get('static_inputs')
+        computer = self.inputs.code.computer
+
+        if static_inputs is not None and \
+                static_inputs.computer.uuid != computer.uuid:
+            static_inputs = None
+
+        for port, config_file in STATIC_INPUTS.items():
+            node = self.inputs.kgrn[port]
+            filename = getattr(self.config_files, config_file).name
+
+            if isinstance(node, AtomConfigData):
+                with timer.section('atom_cfg'), \
+                        folder.open(filename, 'w', encoding='utf8') as handle:
+                    node.write(handle, self.structure.symbol_set)
+                continue
+
+            remote_path = None
+            if static_inputs is not None:
+                with timer.section('static_inputs'):
+                    remote_path = get_cached_path(static_inputs, node)
+
+            if remote_path is None:
+                local_copy_list.append((node.uuid, node.filename, filename))
+            else:
+                remote_list.append((computer.uuid, remote_path, filename))
+
+        parent_folder = self.inputs.get('parent_folder')
+
+        if parent_folder is not None:
+            if self.options.symlink_parent_folder:
+                parent_list = remote_symlink_list
+            else:
+                parent_list = remote_copy_list
+
+            for directory in (self.output_dirs.ctrl_dir,
+                              self.output_dirs.full_chd_dir):
+                parent_list.append(
+                    (parent_folder.computer.uuid,
+                     os.path.join(parent_folder.get_remote_path(),
+                                  directory.name), directory.name))
 
         codeinfo = CodeInfo()
         codeinfo.code_uuid = self.inputs.code.uuid
@@ -111,10 +393,45 @@ class KgrnCalculation(CalcJob):
 
         calcinfo = CalcInfo()
         calcinfo.codes_info = [codeinfo]
-        calcinfo.retrieve_list = [self.options.output_filename]
+        calcinfo.local_copy_list = local_copy_list
+        calcinfo.remote_copy_list = remote_copy_list
+        calcinfo.remote_symlink_list = remote_symlink_list
+        calcinfo.retrieve_list, calcinfo.retrieve_temporary_list = \
+            self._get_retrieve_lists()
 
         return calcinfo
 
+    def _get_retrieve_lists(self):
+        """
+        The output file is retrieved into the retrieved folder if the
+        'output' category is kept, otherwise into the temporary folder, it
+        is parsed from either. The files of the other kept categories are
+        either compressed by the parser or retrieved as they are.
+
+        :return: retrieve list and retrieve temporary list
+        """
+        output_filename = self.options.output_filename
+        entries = [
+            getattr(self.output_categories, category)
+            for category in self.options.retrieve_categories
+            if category != 'output'
+        ]
+
+        retrieve_list = []
+        retrieve_temporary_list = []
+
+        if 'output' in self.options.retrieve_categories:
+            retrieve_list.append(output_filename)
+        else:
+            retrieve_temporary_list.append(output_filename)
+
+        if self.options.compress_retrieved:
+            retrieve_temporary_list += entries
+        else:
+            retrieve_list += entries
+
+        return retrieve_list, retrieve_temporary_list
+
     def create_input_file_string(self):
 
         lines = []
@@ -135,14 +452,14 @@ class KgrnCalculation(CalcJob):
             "Symb  IQ  IT ITA NRM  CONC      a_scr b_scr |Teta    Phi    FXM  "
             "m(split)")
 
-        for site in self.structure:
+        structure = self.structure
+
+        for site, site_index, neq_site_index in zip(
+                structure, structure.site_index, structure.neq_site_index):
 
             component_index = 0
 
             for comp in site.species:
-                site_index = site.properties['site_index']
-                neq_site_index = site.properties['neq_site_index']
-
                 alpha = site.species.screening_params[comp].alpha
                 beta = site.species.screening_params[comp].beta
                 model_param = site.species.magnetic_params[comp].magnetic_model
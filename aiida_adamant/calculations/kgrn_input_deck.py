@@ -0,0 +1,126 @@
+"""
+KGRN input file of a structure and parameters outside of a calculation
+"""
+from __future__ import annotations
+
+from typing import (TYPE_CHECKING, Iterable, Iterator, Mapping, Optional,
+                    TextIO, Tuple, Union)
+
+from aiida.orm import Dict
+
+from aiida_adamant.calculations.kgrn_calculation import KgrnCalculation
+from aiida_adamant.calculations.kgrn_renderer import KgrnInputRenderer
+from aiida_adamant.data.inputs.kgrn_params import (KgrnParams,
+                                                   get_params_validator)
+from aiida_adamant.utils.defaults import KgrnDefaults
+from aiida_adamant.utils.pool import imap_batched
+
+if TYPE_CHECKING:
+    from aiida_adamant.alloy.alloy_structure import AlloyStructure
+
+
+class KgrnInputDeck:
+    """
+    KgrnInputDeck(structure, params, job_name='emtocalc')
+
+    Input file of an alloy structure and KGRN parameters, rendered with the
+    section builders of the KgrnCalculation. It needs neither stored nodes
+    nor a profile and can be pickled, so input files can be rendered in
+    worker processes.
+    """
+    # pylint: disable=protected-access
+    _get_control_section = KgrnCalculation._get_control_section
+    _get_scfp_section = KgrnCalculation._get_scfp_section
+    _get_energy_mesh_sector = KgrnCalculation._get_energy_mesh_sector
+    _get_atomic_section = KgrnCalculation._get_atomic_section
+    create_input_file_string = KgrnCalculation.create_input_file_string
+
+    config_files = KgrnDefaults.CONFIG_FILES
+    output_dirs = KgrnDefaults.OUTPUT_DIRS
+
+    def __init__(self,
+                 structure: AlloyStructure,
+                 params: Mapping,
+                 job_name: str = KgrnDefaults.JOB_NAME):
+        """
+
+        :param structure: alloy structure
+        :param params: kgrn parameters, missing parameters are taken from
+            the defaults. A KgrnParams is used as is. Parameters without a
+            default, e.g. sws, must be given.
+        :param job_name: name written into the input file
+        """
+        self.structure = structure
+        if isinstance(params, KgrnParams):
+            get_params_validator().check_required(params)
+            self.params = params
+        else:
+            self.params = KgrnParams(get_params_validator()(params,
+                                                            complete=True))
+        self.job_name = job_name
+
+    def write(self, handle: TextIO) -> None:
+        """
+        Stream the input file into the handle
+
+        :param handle: writable text handle
+        """
+        KgrnInputRenderer(self).write(handle)
+
+    def render(self) -> str:
+        """
+
+        :return: the complete input file as string
+        """
+        return KgrnInputRenderer(self).render()
+
+
+def _render_input_deck(
+        item: Tuple[AlloyStructure, Mapping, str, bool]
+) -> Union[str, Exception]:
+    """
+    Render an input file in a worker process
+
+    :param item: structure, parameters, job name and whether exceptions are
+        returned instead of raised
+    :return: the input file or the exception
+    """
+    structure, params, job_name, return_exceptions = item
+
+    try:
+        return KgrnInputDeck(structure, params, job_name).render()
+    except Exception as exc:  # pylint: disable=broad-except
+        if not return_exceptions:
+            raise
+        return exc
+
+
+def render_input_decks(pairs: Iterable[Tuple[AlloyStructure, Mapping]],
+                       processes: Optional[int] = None,
+                       batch_size: int = 100,
+                       job_name: str = KgrnDefaults.JOB_NAME,
+                       return_exceptions: bool = False
+                       ) -> Iterator[Union[str, Exception]]:
+    """
+    Render the input files of many structures in parallel
+
+    Neither a daemon nor stored nodes are needed. The parameters are
+    validated, the symmetry of the structures analyzed and the input files
+    formatted in a pool of worker processes.
+
+    :param pairs: alloy structures and their parameters, either a
+        KgrnParamsData or a mapping of the parameters that differ from the
+        defaults
+    :param processes: number of worker processes, all cores if None
+    :param batch_size: number of pairs handed to the pool at once
+    :param job_name: name written into the input files
+    :param return_exceptions: if True, the exception of a pair that can not
+        be rendered is returned in place of its input file instead of
+        raised, e.g. to validate many inputs at once
+    :return: iterator over the input files in the order of the pairs
+    """
+    items = ((structure,
+              params.get_dict() if isinstance(params, Dict) else params,
+              job_name, return_exceptions) for structure, params in pairs)
+
+    return imap_batched(_render_input_deck, items, processes, batch_size)
@@ -0,0 +1,265 @@
+"""
+Streaming writer for the KGRN input file
+
+The fixed-width record layouts of the KGRN input are compiled once at import
+time. The alloy ("Sort") section, which grows with the number of sites, is
+flattened into a table with one row per emitted component, formatted in
+bulk and streamed in chunks into the output handle.
+"""
+from __future__ import annotations
+
+import io
+from typing import Any, Dict, Iterator, List, Sequence, TextIO
+
+import numpy as np
+from numpy.lib.recfunctions import repack_fields
+
+from aiida_adamant.utils.timing import NULL_TIMER, SectionTimer
+
+SEPARATOR = "*" * 70
+
+ALLOY_HEADER = (
+    SEPARATOR,
+    "Sort:  information for alloy:                                        *",
+    "******************************SS-screeining*|***Magnetic structure ***",
+    "Symb  IQ  IT ITA NRM  CONC      a_scr b_scr |Teta    Phi    FXM  "
+    "m(split)",
+)
+
+ATOM_HEADER = (
+    SEPARATOR,
+    "Atom:  information for atomic calculation:                           *",
+    SEPARATOR,
+)
+
+# Column layout of one component row of the alloy section:
+#   Symb IQ IT ITA NRM CONC a_scr b_scr Teta Phi FXM m(split)
+# NRM, Teta and Phi are constant and therefore part of the compiled layout.
+_ROW_SYMBOL = "\n%-4s"
+_ROW_INDICES = "%4d%4d%4d   1"
+_ROW_COMPONENT = "%10.6f %6.3f%6.3f  0.0000  0.0000  %1s%9.4f"
+
+#: One row per emitted component of the alloy section
+COMPONENT_DTYPE = np.dtype([
+    ('symbol', 'U8'),
+    ('iq', 'i4'),
+    ('it', 'i4'),
+    ('ita', 'i4'),
+    ('concentration', 'f8'),
+    ('alpha', 'f8'),
+    ('beta', 'f8'),
+    ('model', 'U1'),
+    ('moment', 'f8'),
+])
+
+#: Columns which only depend on the alloy composition of a site
+_COMPONENT_COLUMNS = ['symbol', 'concentration', 'alpha', 'beta', 'model',
+                      'moment']
+
+_SPIN_SPIRAL = "qx....={:^10.6f}qy....={:^10.6f}qz....={:^10.6f}".format
+
+
+def _join(lines: Sequence[str]) -> str:
+    """
+    Join lines the same way the KGRN input writer does
+
+    :param lines: lines of a section
+    :return: stripped lines joined by newlines
+    """
+    return "\n".join([line.strip() for line in lines])
+
+
+def _get_composition_table(species) -> np.ndarray:
+    """
+    Component rows of a single alloy composition
+
+    Paramagnetic (DLM) components are emitted twice with half of the
+    concentration and opposite initial magnetic moments.
+
+    :param species: alloy composition of a site
+    :return: table with the site independent columns filled
+    """
+    rows = []
+
+    for comp, concentration in species.items():
+        screening = species.screening_params[comp]
+        magnetic = species.magnetic_params[comp]
+
+        prefactor = (-1, 1) if magnetic.is_paramagnetic else (1,)
+
+        for factor in prefactor:
+            rows.append((str(comp), 0, 0, len(rows) + 1,
+                         concentration / len(prefactor),
+                         screening.alpha, screening.beta,
+                         magnetic.magnetic_model,
+                         factor * magnetic.init_mag_mom))
+
+    return np.array(rows, dtype=COMPONENT_DTYPE)
+
+
+def get_component_table(structure) -> np.ndarray:
+    """
+    Flatten an alloy structure into the rows of the KGRN alloy section
+
+    The component rows are built once per distinct composition object and
+    gathered for all sites sharing it.
+
+    :param structure: alloy structure
+    :return: structured array of dtype COMPONENT_DTYPE
+    """
+    blocks: List[np.ndarray] = []
+    block_ids: Dict[int, int] = {}
+
+    site_blocks = []
+
+    for site in structure:
+        species = site.species
+
+        block = block_ids.get(id(species))
+        if block is None:
+            block = block_ids[id(species)] = len(blocks)
+            blocks.append(_get_composition_table(species))
+
+        site_blocks.append(block)
+
+    if not blocks:
+        return np.empty(0, dtype=COMPONENT_DTYPE)
+
+    sizes = np.array([len(block) for block in blocks])
+    offsets = np.cumsum(sizes) - sizes
+
+    site_blocks = np.array(site_blocks)
+    counts = sizes[site_blocks]
+
+    # index of every row of the table in the stacked composition blocks
+    ends = np.cumsum(counts)
+    rows = np.arange(ends[-1]) - np.repeat(ends - counts, counts)
+    rows += np.repeat(offsets[site_blocks], counts)
+
+    table = np.concatenate(blocks)[rows]
+    table['iq'] = np.repeat(structure.site_index, counts)
+    table['it'] = np.repeat(structure.neq_site_index, counts)
+
+    return table
+
+
+def format_component_table(table: np.ndarray) -> str:
+    """
+    Format rows of the alloy section in bulk
+
+    The composition dependent columns are formatted once per distinct row
+    into a row template. The templates are gathered for the whole table and
+    the site indices are filled in by a single formatting operation.
+
+    :param table: structured array of dtype COMPONENT_DTYPE
+    :return: formatted rows, each prefixed by a newline
+    """
+    if len(table) == 0:
+        return ""
+
+    components = repack_fields(table[_COMPONENT_COLUMNS])
+    keys = components.view(np.dtype((np.void, components.dtype.itemsize)))
+    _, first, inverse = np.unique(keys, return_index=True,
+                                  return_inverse=True)
+
+    templates = []
+    for row in components[first].tolist():
+        symbol = (_ROW_SYMBOL % row[0]).replace("%", "%%")
+        component = (_ROW_COMPONENT % row[1:]).replace("%", "%%")
+        templates.append(symbol + _ROW_INDICES + component)
+
+    templates = np.array(templates, dtype=object)[inverse.ravel()]
+
+    indices = np.column_stack((table['iq'], table['it'], table['ita']))
+
+    return "".join(templates.tolist()) % tuple(indices.ravel().tolist())
+
+
+class KgrnInputRenderer:
+    """
+    Render the KGRN input file of a calculation into an open file handle
+
+    The source has to provide the ``structure`` and ``params`` attributes as
+    well as the ``_get_control_section``, ``_get_scfp_section`` and
+    ``_get_atomic_section`` builders of the ``KgrnCalculation``.
+    The output is identical to ``KgrnCalculation.create_input_file_string``.
+    """
+
+    #: number of alloy rows formatted at once
+    chunk_size = 4096
+
+    def __init__(self, source: Any, timer: SectionTimer = NULL_TIMER):
+        """
+
+        :param source: object providing the section builders
+        :param timer: timer of the sections, nothing is timed by default
+        """
+        self._source = source
+        self._timer = timer
+
+    def write(self, handle: TextIO) -> None:
+        """
+        Stream the input file into the handle
+
+        :param handle: writable text handle
+        """
+        handle.writelines(self.iter_chunks())
+
+    def render(self) -> str:
+        """
+
+        :return: the complete input file as string
+        """
+        handle = io.StringIO()
+        self.write(handle)
+        return handle.getvalue()
+
+    def iter_chunks(self) -> Iterator[str]:
+        """
+        Iterate over the chunks of the input file
+
+        Every chunk except the first one starts with the line separator, so
+        the chunks can be written directly one after another.
+
+        :return: iterator over the chunks of the input file
+        """
+        # pylint: disable=protected-access
+        source = self._source
+        timer = self._timer
+
+        with timer.section('control_section'):
+            head = source._get_control_section()
+        with timer.section('scfp_section'):
+            head += source._get_scfp_section()
+        head += ALLOY_HEADER
+
+        yield _join(head)
+
+        yield from self.iter_alloy_rows()
+
+        params = source.params
+
+        tail = [SEPARATOR, "Spin-spiral wave vector:"]
+        tail.append(_SPIN_SPIRAL(params['qx'], params['qy'], params['qz']))
+        tail += ATOM_HEADER
+        with timer.section('atomic_section'):
+            tail += source._get_atomic_section()
+
+        yield "\n" + _join(tail)
+
+    def iter_alloy_rows(self) -> Iterator[str]:
+        """
+        Iterate over the component rows of the alloy section
+
+        :return: iterator over blocks of at most chunk_size formatted rows
+        """
+        timer = self._timer
+
+        with timer.section('alloy_section'):
+            table = get_component_table(self._source.structure)
+
+        for start in range(0, len(table), self.chunk_size):
+            with timer.section('alloy_section'):
+                chunk = format_component_table(table[start:start +
+                                                     self.chunk_size])
+            yield chunk
@@ -6,36 +6,144 @@ directly into the 'verdi' command by using AiiDA-specific entry points like
 "aiida.cmdline.data" (both in the setup.json file).
 """
 
-import sys
 import click
 from aiida.cmdline.utils import decorators
 from aiida.cmdline.commands.cmd_data import verdi_data
-from aiida.cmdline.params.types import DataParamType
+from aiida.cmdline.params.types import DataParamType, GroupParamType
+
+DEFAULT_LIST_PARAMS = ('sws', 'niter', 'strt', 'func')
 
 
 # See aiida.cmdline.data entry point in setup.json
 @verdi_data.group('adamant')
 def data_cli():
     """Command line interface for aiida-adamant"""
+
+
+def _get_params_query(sws_range=None, elements=()):
+    """
+    Query of KgrnParamsData nodes
+
+    :param sws_range: lower and upper bound of the SWS parameter
+    :param elements: only parameters used by calculations of structures
+        containing all of these elements
+    :return: QueryBuilder with the nodes tagged as 'params'
+    """
+    from aiida.orm import CalcJobNode, QueryBuilder, StructureData
+    from aiida.plugins import DataFactory
+
+    KgrnParamsData = DataFactory('adamant.kgrn_data')
+
+    filters = {}
+    if sws_range is not None:
+        filters['attributes.sws'] = {
+            'and': [{
+                '>=': sws_range[0]
+            }, {
+                '<=': sws_range[1]
+            }]
+        }
+
+    builder = QueryBuilder()
+    builder.append(KgrnParamsData, tag='params', filters=filters)
+
+    if elements:
+        builder.append(CalcJobNode, with_incoming='params', tag='calculation')
+        builder.append(StructureData,
+                       with_outgoing='calculation',
+                       filters={
+                           'and': [{
+                               'attributes.kinds': {
+                                   'contains': [{
+                                       'symbols': [element]
+                                   }]
+                               }
+                           } for element in elements]
+                       })
+        builder.distinct()
+
+    return builder
+
+
 @data_cli.command('list')
+@click.option('--sws-range',
+              type=click.FLOAT,
+              nargs=2,
+              default=None,
+              help='Only parameters with SWS in the closed interval. Only '
+              'the SWS stored on a node is matched, not a SWS inherited by '
+              'an overlay node from its defaults node.')
+@click.option('--element',
+              'elements',
+              multiple=True,
+              help='Only parameters used for structures with this element. '
+              'Can be given multiple times.')
+@click.option('--param',
+              '-p',
+              'params',
+              multiple=True,
+              help='Parameters to show, default: '
+              f'{", ".join(DEFAULT_LIST_PARAMS)}.')
+@click.option('--limit', type=click.INT, default=None,
+              help='Maximum number of nodes to show.')
+@click.option('--offset', type=click.INT, default=None,
+              help='Number of nodes to skip.')
+@click.option('--batch-size', type=click.INT, default=1000,
+              show_default=True,
+              help='Number of rows fetched from the database at once.')
+@click.option('--count', is_flag=True,
+              help='Only print the number of matching nodes, after --limit '
+              'and --offset.')
 @decorators.with_dbenv()
-def list_():  # pylint: disable=redefined-builtin
+def list_(  # pylint: disable=too-many-arguments
+        sws_range, elements, params, limit, offset, batch_size, count):
     """
-    Display all DiffParameters nodes
+    Display KgrnParamsData nodes
+
+    Only the shown parameters are fetched and the rows are streamed in
+    batches, so the command runs in constant memory.
     """
-    from aiida.orm import QueryBuilder
-    from aiida.plugins import DataFactory
-    DiffParameters = DataFactory('adamant')
+    from aiida_adamant.data.inputs.kgrn_params import (DEFAULTS_UUID_KEY,
+                                                       _get_defaults_dict)
+
+    builder = _get_params_query(sws_range, elements)
 
-    qb = QueryBuilder()
-    qb.append(DiffParameters)
-    results = qb.all()
+    if count:
+        # limit and offset are applied to the count like to the rows
+        number = max(builder.count() - (offset or 0), 0)
+        if limit is not None:
+            number = min(number, limit)
+        click.echo(number)
+        return
 
-    s = ""
-    for result in results:
-        obj = result[0]
-        s += "{}, pk: {}\n".format(str(obj), obj.pk)
-    sys.stdout.write(s)
+    params = [param.lower() for param in params] or list(DEFAULT_LIST_PARAMS)
+
+    builder.add_projection('params', ['id', 'label'] +
+                           [f'attributes.{param}' for param in params] +
+                           [f'attributes.{DEFAULTS_UUID_KEY}'])
+    builder.order_by({'params': {'id': 'asc'}})
+
+    if limit is not None:
+        builder.limit(limit)
+    if offset is not None:
+        builder.offset(offset)
+
+    click.echo('\t'.join(['pk', 'label'] + params))
+
+    for row in builder.iterall(batch_size=batch_size):
+        pk, label, *values, defaults_uuid = row
+
+        if defaults_uuid is not None:
+            # overlay nodes only store the overridden parameters
+            defaults = _get_defaults_dict(defaults_uuid)
+            values = [
+                defaults.get(param) if value is None else value
+                for param, value in zip(params, values)
+            ]
+
+        click.echo('\t'.join(
+            [str(pk), label or '-'] +
+            ['-' if value is None else str(value) for value in values]))
 
 
 @data_cli.command('export')
@@ -54,3 +162,217 @@ def export(node, outfile):
             f.write(string)
     else:
         click.echo(string)
+
+
+@data_cli.command('export-inputs')
+@click.argument('output', type=click.Path())
+@click.option('--group',
+              '-G',
+              type=GroupParamType(),
+              default=None,
+              help='Only calculations in this group.')
+@click.option('--filters',
+              default=None,
+              help='QueryBuilder filters of the calculations as JSON, e.g. '
+              '\'{"ctime": {">": "2021-01-01"}}\'.')
+@click.option('--tar',
+              'tar',
+              is_flag=True,
+              help='Stream a tar archive, OUTPUT "-" writes to stdout. The '
+              'compression is taken from the file extension.')
+@click.option('--processes',
+              '-n',
+              type=click.INT,
+              default=None,
+              help='Number of worker processes, default: all cores.')
+@click.option('--batch-size', type=click.INT, default=100,
+              show_default=True,
+              help='Number of calculations fetched and rendered at once.')
+@decorators.with_dbenv()
+def export_inputs(  # pylint: disable=too-many-arguments
+        output, group, filters, tar, processes, batch_size):
+    """
+    Export the KGRN input files of many calculations
+
+    The input file of every KgrnCalculation is written to
+    OUTPUT/<pk>/emtocalc.dat, or into a tar archive. The input files are
+    rendered in parallel.
+    """
+    import json
+    import sys
+
+    from aiida.cmdline.utils import echo
+
+    from aiida_adamant.utils.export import (export_input_files,
+                                            iter_export_items)
+
+    if filters is not None:
+        try:
+            filters = json.loads(filters)
+        except ValueError as exc:
+            echo.echo_critical(f'Invalid filters: {exc}')
+
+    items = iter_export_items(group, filters, batch_size=batch_size)
+
+    compression = ''
+    if tar:
+        for suffix, name in (('gz', 'gz'), ('tgz', 'gz'), ('bz2', 'bz2'),
+                             ('xz', 'xz')):
+            if output.endswith(f'.{suffix}'):
+                compression = name
+        if output == '-':
+            output = sys.stdout.buffer
+
+    count = export_input_files(items,
+                               output,
+                               tar=tar,
+                               compression=compression,
+                               processes=processes,
+                               batch_size=batch_size)
+
+    click.echo(f'Exported {count} input files', err=True)
+
+
+@data_cli.command('render-inputs')
+@click.argument('structures',
+                nargs=-1,
+                required=True,
+                type=click.Path(exists=True, dir_okay=False))
+@click.option('--params',
+              'params_file',
+              type=click.Path(exists=True, dir_okay=False),
+              default=None,
+              help='JSON file with the kgrn parameters that differ from the '
+              'defaults, used for all structures.')
+@click.option('--output',
+              '-o',
+              type=click.Path(file_okay=False),
+              default=None,
+              help='Write the input files to OUTPUT/<name>/emtocalc.dat. '
+              'Without it the inputs are only validated.')
+@click.option('--processes',
+              '-n',
+              type=click.INT,
+              default=None,
+              help='Number of worker processes, default: all cores.')
+@click.option('--batch-size', type=click.INT, default=100,
+              show_default=True,
+              help='Number of structures rendered at once.')
+def render_inputs(structures, params_file, output, processes, batch_size):
+    """
+    Render the KGRN input files of AlloyStructure JSON files
+
+    The input files are rendered in parallel without a profile or daemon.
+    Structures whose input can not be rendered are reported and the exit
+    status is non-zero.
+    """
+    import json
+    from pathlib import Path
+
+    from monty.serialization import loadfn
+
+    from aiida_adamant.calculations.kgrn_input_deck import render_input_decks
+    from aiida_adamant.utils.defaults import KgrnDefaults
+
+    params = {}
+    if params_file is not None:
+        with open(params_file) as handle:
+            params = json.load(handle)
+
+    paths = [Path(structure) for structure in structures]
+    pairs = ((loadfn(path), params) for path in paths)
+
+    failed = 0
+    for path, result in zip(
+            paths,
+            render_input_decks(pairs,
+                               processes=processes,
+                               batch_size=batch_size,
+                               return_exceptions=True)):
+
+        if isinstance(result, Exception):
+            failed += 1
+            click.echo(f'{path}: {result!r}', err=True)
+            continue
+
+        if output is not None:
+            name = path.name.split('.')[0]
+            directory = Path(output) / name
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / KgrnDefaults.INPUT_FILENAME).write_text(result)
+
+    click.echo(f'Rendered {len(paths) - failed} of {len(paths)} input files',
+               err=True)
+
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
+@data_cli.command('timings')
+@click.option('--group',
+              '-G',
+              type=GroupParamType(),
+              default=None,
+              help='Only calculations in this group.')
+@click.option('--filters',
+              default=None,
+              help='QueryBuilder filters of the calculations as JSON.')
+@click.option('--batch-size', type=click.INT, default=1000,
+              show_default=True,
+              help='Number of rows fetched from the database at once.')
+@decorators.with_dbenv()
+def timings(group, filters, batch_size):
+    """
+    Summarize the prepare_for_submission timings of calculations
+
+    Only calculations submitted with the record_timings option have
+    timings. Nested sections are indented below their parent, their share
+    is the fraction of the time of the parent section.
+    """
+    import json
+
+    from aiida.cmdline.utils import echo
+    from aiida.orm import QueryBuilder
+
+    from aiida_adamant.utils.export import append_kgrn_calculations
+    from aiida_adamant.utils.timing import (SEPARATOR, TIMINGS_EXTRA,
+                                            get_parent_section,
+                                            iter_section_tree,
+                                            summarize_timings)
+
+    if filters is not None:
+        try:
+            filters = json.loads(filters)
+        except ValueError as exc:
+            echo.echo_critical(f'Invalid filters: {exc}')
+
+    filters = dict(filters or {})
+    filters['extras'] = {'has_key': TIMINGS_EXTRA}
+
+    builder = QueryBuilder()
+    append_kgrn_calculations(builder, group, filters)
+    builder.add_projection('calculation', f'extras.{TIMINGS_EXTRA}')
+
+    summary = summarize_timings(
+        row[0] for row in builder.iterall(batch_size=batch_size))
+
+    if not summary:
+        echo.echo_warning('No calculations with timings found')
+        return
+
+    click.echo(f"{'section':<28s} {'count':>7s} {'mean [s]':>10s} "
+               f"{'min [s]':>10s} {'max [s]':>10s} {'share':>7s}")
+
+    for name, depth in iter_section_tree(summary):
+        entry = summary[name]
+        share = f"{'-':>7s}"
+        label = name
+
+        if depth:
+            parent = summary[get_parent_section(name)]
+            label = '  ' * depth + name.rpartition(SEPARATOR)[2]
+            if parent['total']:
+                share = f"{entry['total'] / parent['total']:7.1%}"
+
+        click.echo(f"{label:<28s} {entry['count']:7d} {entry['mean']:10.4f} "
+                   f"{entry['min']:10.4f} {entry['max']:10.4f} {share}")
@@ -1,3 +1,9 @@
+from .inputs.atom_cfg import AtomConfigData
 from .inputs.kgrn_params import KgrnParamsData
+from .inputs.transfer_matrix import TransferMatrixData
+from .outputs.compressed_folder import CompressedFolderData
 
-__all__ = ['KgrnParamsData']
+__all__ = [
+    'AtomConfigData', 'CompressedFolderData', 'KgrnParamsData',
+    'TransferMatrixData'
+]
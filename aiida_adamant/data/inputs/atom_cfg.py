@@ -0,0 +1,193 @@
+"""
+Datatype and methods for the atomic configurations of KGRN (ATOM.cfg)
+
+The file consists of one block per element label, separated by blank lines::
+
+    Fe
+    Iz=  26 Norb= 10 Ion=  0 Config= 3d6_4s2
+    n      1  2  2  2  3  3  3  3  3  4
+    Kappa -1 -1  1 -2 -1  1 -2  2 -3 -1
+    Occup  2  2  2  4  2  2  4  4  6  2
+    Valen  0  0  0  0  0  1  1  1  1  1
+"""
+from __future__ import annotations
+
+import io
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, TextIO
+
+from aiida.orm import Data
+
+if TYPE_CHECKING:
+    from pymatgen.util.typing import PathLike
+
+HEADER = re.compile(r'Iz=\s*(-?\d+)\s+Norb=\s*(\d+)\s+Ion=\s*(-?\d+)\s+'
+                    r'Config=?\s*(.*)$')
+
+#: Rows of the orbital table and the keys of the parsed entries
+ORBITAL_ROWS = (('n', 'n'), ('Kappa', 'kappa'), ('Occup', 'occup'),
+                ('Valen', 'valen'))
+
+
+def parse_atom_cfg(handle: TextIO) -> Dict[str, dict]:
+    """
+    Parse the blocks of an ATOM.cfg file
+
+    :param handle: text handle of the file
+    :return: entries with the keys iz, norb, ion, config, n, kappa, occup
+        and valen indexed by the element label, in the order of the file
+    """
+    entries: Dict[str, dict] = {}
+
+    lines = (line.strip() for line in handle)
+
+    for label in lines:
+        if not label:
+            continue
+
+        match = HEADER.match(next(lines, ''))
+        if match is None:
+            raise ValueError(f"Block of {label} has no valid Iz= line")
+
+        entry = {
+            'iz': int(match.group(1)),
+            'norb': int(match.group(2)),
+            'ion': int(match.group(3)),
+            'config': match.group(4).strip(),
+        }
+
+        for name, key in ORBITAL_ROWS:
+            row = next(lines, '').split()
+            if not row or row[0] != name:
+                raise ValueError(f"Block of {label} has no {name} row")
+
+            entry[key] = [int(value) for value in row[1:]]
+
+            # Norb is not reliable, e.g. the empty sphere lists one orbital
+            if len(entry[key]) != len(entry['n']):
+                raise ValueError(f"Orbital rows of {label} don't have "
+                                 f"the same length")
+
+        entries[label] = entry
+
+    return entries
+
+
+def format_atom_cfg_entry(label: str, entry: dict) -> str:
+    """
+
+    :param label: element label
+    :param entry: parsed entry of the element
+    :return: block of the element including the trailing blank line
+    """
+    lines = [
+        label,
+        f"Iz= {entry['iz']:3d} Norb= {entry['norb']:2d} "
+        f"Ion= {entry['ion']:2d} Config= {entry['config']}",
+        "n    " + "".join(f"{value:3d}" for value in entry['n']),
+    ]
+    for name, key in ORBITAL_ROWS[1:]:
+        lines.append(name + "".join(f"{value:3d}" for value in entry[key]))
+
+    return "\n".join(lines) + "\n\n"
+
+
+class AtomConfigData(Data):
+    """
+    AtomConfigData(file=None, entries=None)
+
+    AiiDA compatible node representing an ATOM.cfg file indexed by the
+    element labels.
+
+    The file is parsed once, calculations write only the blocks of the
+    elements they contain.
+    """
+    def __init__(self,
+                 file: Optional[PathLike] = None,
+                 entries: Optional[Dict[str, dict]] = None,
+                 **kwargs):
+        super().__init__(**kwargs)
+
+        if file is not None:
+            from monty.io import zopen
+
+            with zopen(file, 'rt') as handle:
+                entries = parse_atom_cfg(handle)
+
+        if entries is not None:
+            self.set_attribute('labels', list(entries))
+            self.set_attribute('elements', dict(entries))
+
+    @classmethod
+    def from_string(cls, content: str, **kwargs) -> 'AtomConfigData':
+        """
+
+        :param content: content of an ATOM.cfg file
+        :return: unstored node
+        """
+        return cls(entries=parse_atom_cfg(io.StringIO(content)), **kwargs)
+
+    @property
+    def labels(self) -> List[str]:
+        """
+
+        :return: element labels in the order of the original file
+        """
+        return self.get_attribute('labels', [])
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.get_attribute('elements', {})
+
+    def get_entry(self, label: str) -> dict:
+        """
+
+        :param label: element label
+        :return: Iz, Norb, Ion, Config and the orbital rows of the element
+        """
+        try:
+            return self.get_attribute('elements')[label]
+        except (AttributeError, KeyError):
+            raise ValueError(f"Element {label} is not part of the "
+                             f"atomic configurations")
+
+    def get_missing(self, labels: Iterable[str]) -> List[str]:
+        """
+
+        :param labels: element labels
+        :return: the labels without an atomic configuration
+        """
+        elements = self.get_attribute('elements', {})
+        return sorted({label for label in labels if label not in elements})
+
+    def write(self, handle: TextIO,
+              labels: Optional[Iterable[str]] = None) -> None:
+        """
+        Write the ATOM.cfg file
+
+        :param handle: text handle
+        :param labels: element labels to write, all if None. The blocks are
+            written in the order of the original file.
+        """
+        if labels is None:
+            selected = self.labels
+        else:
+            missing = self.get_missing(labels)
+            if missing:
+                raise ValueError(f"Elements {', '.join(missing)} are not "
+                                 f"part of the atomic configurations")
+            labels = set(labels)
+            selected = [label for label in self.labels if label in labels]
+
+        elements = self.get_attribute('elements')
+        for label in selected:
+            handle.write(format_atom_cfg_entry(label, elements[label]))
+
+    def get_content(self, labels: Optional[Iterable[str]] = None) -> str:
+        """
+
+        :param labels: element labels to write, all if None
+        :return: content of the ATOM.cfg file
+        """
+        handle = io.StringIO()
+        self.write(handle, labels)
+        return handle.getvalue()
@@ -2,39 +2,470 @@
 Datatype and methods for the KGRN params
 """
 import copy
+import functools
+import hashlib
 import json
+import numbers
 import operator
 from pathlib import Path
-from typing import Mapping, Optional
+from typing import Any, Iterable, List, Mapping, Optional
 
-from aiida.orm import Dict
-from monty.io import zopen
-from pymatgen.util.typing import PathLike
+from aiida.common.extendeddicts import AttributeDict
+from aiida.orm import Dict, load_node
 
 cwd = Path(__file__).parent
-with open(cwd / "DEFAULT_PARAMS.json") as params:
-    DEFAULT_PARAMS = json.loads(params.read())
+
+
+@functools.lru_cache(maxsize=None)
+def _load_json(filename: str) -> dict:
+    """
+
+    :param filename: name of a JSON file next to this module
+    :return: its content, read on first use
+    """
+    with open(cwd / filename) as handle:
+        return json.loads(handle.read())
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise TypeError
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return int(value)
+    raise TypeError
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise TypeError
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if isinstance(value, str):
+        # Fortran double precision exponent, e.g. 1.0d-6
+        return float(value.replace('d', 'e').replace('D', 'e'))
+    raise TypeError
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    raise TypeError
+
+
+_CONVERTERS = {
+    'int': _to_int,
+    'float': _to_float,
+    'str': _to_str,
+}
+
+
+class KgrnParamsValidator:
+    """
+    Validator of KGRN parameters compiled from a table of types
+
+    The converter of every parameter and the typed, sorted defaults are
+    resolved once, validating a parameter set is a single dict lookup per
+    given parameter.
+    """
+    def __init__(self, types: Mapping[str, str], defaults: Mapping[str, Any]):
+        """
+
+        :param types: type name ('int', 'float' or 'str') of every parameter
+        :param defaults: default values of the parameters
+        """
+        self._types = dict(types)
+        self._converters = {
+            param: _CONVERTERS[type_name]
+            for param, type_name in self._types.items()
+        }
+
+        self._defaults = self.convert(
+            dict(sorted(defaults.items(), key=operator.itemgetter(0))))
+
+        # parameters without a default, e.g. sws
+        self._required = sorted(set(self._types) - set(self._defaults))
+
+    def _convert(self, param: str, value: Any) -> Any:
+        try:
+            converter = self._converters[param]
+        except KeyError:
+            raise ValueError(f'Parameter {param} '
+                             f'is not part of the kgrn input')
+
+        try:
+            return converter(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'Parameter {param} must be of type '
+                             f'{self._types[param]}, got {value!r}')
+
+    def convert(self, dictionary: Mapping) -> dict:
+        """
+
+        :param dictionary: parameters, the names are case insensitive
+        :return: the converted parameters, without defaults
+        """
+        return {
+            param.lower(): self._convert(param.lower(), value)
+            for param, value in dictionary.items()
+        }
+
+    @property
+    def required(self) -> List[str]:
+        """
+
+        :return: parameters which have no default
+        """
+        return list(self._required)
+
+    def check_required(self, dictionary: Mapping) -> None:
+        """
+        Check that the parameters without a default are given
+
+        :param dictionary: parameters, the names are case insensitive
+        """
+        given = {param.lower() for param in dictionary}
+        missing = [param for param in self._required if param not in given]
+        if missing:
+            raise ValueError(f"Required parameters {', '.join(missing)} "
+                             f"are missing")
+
+    def __call__(self, dictionary: Mapping, complete: bool = False) -> dict:
+        """
+
+        :param dictionary: parameters that differ from the defaults, the
+            names are case insensitive
+        :param complete: if True, the parameters without a default must be
+            given. Otherwise they can be added later, e.g. by an overlay
+            node.
+        :return: defaults updated by the converted parameters
+        """
+        _dictionary = dict(self._defaults)
+        _dictionary.update(self.convert(dictionary))
+        if complete:
+            self.check_required(_dictionary)
+        return _dictionary
+
+
+@functools.lru_cache(maxsize=None)
+def get_params_validator() -> KgrnParamsValidator:
+    """
+
+    :return: validator of the package defaults, compiled on first use
+    """
+    return KgrnParamsValidator(_load_json("DEFAULT_PARAMS_TYPES.json"),
+                               _load_json("DEFAULT_PARAMS.json"))
+
+
+_LAZY_ATTRIBUTES = {
+    'DEFAULT_PARAMS': lambda: _load_json("DEFAULT_PARAMS.json"),
+    'DEFAULT_PARAMS_TYPES': lambda: _load_json("DEFAULT_PARAMS_TYPES.json"),
+    'KGRN_PARAMS_VALIDATOR': get_params_validator,
+}
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Load the defaults on first access instead of at import time
+
+    Importing the module, e.g. by a daemon worker loading the entry points,
+    does not read the JSON files.
+    """
+    try:
+        return _LAZY_ATTRIBUTES[name]()
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}") from None
+
+
+#: Format of the floating point parameters in the KGRN input file
+WRITTEN_FORMATS = {
+    **dict.fromkeys(('depth', 'imagz', 'eps', 'elim', 'amix', 'vmix',
+                     'efmix', 'vmtz', 'sws', 'mmom', 'efgs', 'hx'), '.3f'),
+    **dict.fromkeys(('tole', 'tolef', 'tolcpa'), '.1e'),
+    'tfermi': '.1f',
+    **dict.fromkeys(('qx', 'qy', 'qz', 'vmixatm', 'rwat', 'rmax', 'dx',
+                     'dr1'), '.6f'),
+    **dict.fromkeys(('test', 'teste', 'testy', 'testv'), '.2e'),
+}
+
+
+def get_canonical_params(dictionary: Mapping) -> dict:
+    """
+    Normalized parameters, equal for all sets which give the same input
+
+    Names are lower case and sorted, floats are rounded to the precision
+    they are written with into the input file.
+
+    :param dictionary: complete kgrn parameters
+    :return: canonical parameters
+    """
+    canonical = {}
+    for param, value in sorted((param.lower(), value)
+                               for param, value in dictionary.items()):
+        written_format = WRITTEN_FORMATS.get(param)
+        if written_format is not None and isinstance(value, numbers.Real):
+            value = float(format(value, written_format))
+            # avoid distinct hashes of 0.0 and -0.0
+            value = value + 0.0
+        canonical[param] = value
+    return canonical
+
+
+class KgrnParams(dict):
+    """
+    Case insensitive view of resolved KGRN parameters
+
+    The section builders of the input file use the spelling of the KGRN
+    input (e.g. 'NITER', 'Lmaxh'), the nodes store lower case names.
+    """
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key.lower(), value)
+
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+
+#: Attribute of an overlay node referencing its defaults node
+DEFAULTS_UUID_KEY = 'kgrn_defaults_uuid'
+
+#: Extra marking the shared node with the package defaults
+DEFAULTS_EXTRA = 'kgrn_package_defaults'
+
+#: Group of the defaults nodes referenced by overlay nodes
+DEFAULTS_GROUP_LABEL = 'adamant/kgrn_defaults'
+
+
+@functools.lru_cache(maxsize=64)
+def _add_to_defaults_group(uuid: str) -> None:
+    """
+    Keep a defaults node in the group of the defaults nodes
+
+    Overlay nodes reference their defaults only by uuid, there is no link.
+    The group makes the defaults nodes visible, they must be exported
+    together with the overlay nodes and must not be deleted. Every defaults
+    node is added only once per process.
+
+    :param uuid: uuid of a stored defaults node
+    """
+    from aiida.orm import Group
+
+    group, _ = Group.objects.get_or_create(label=DEFAULTS_GROUP_LABEL)
+    group.add_nodes(load_node(uuid))
+
+
+@functools.lru_cache(maxsize=64)
+def _get_defaults_dict(uuid: str) -> dict:
+    """
+
+    :param uuid: uuid of a stored, complete KgrnParamsData
+    :return: its parameters, stored nodes are immutable
+    """
+    return load_node(uuid).get_dict()
+
+
+def resolve_params(attributes: Mapping) -> dict:
+    """
+    Complete parameters from the attributes of a KgrnParamsData
+
+    :param attributes: attributes of a complete or an overlay node, e.g.
+        projected by a QueryBuilder
+    :return: the complete parameters
+    """
+    dictionary = dict(attributes)
+    uuid = dictionary.pop(DEFAULTS_UUID_KEY, None)
+
+    if uuid is not None:
+        dictionary = dict(_get_defaults_dict(uuid), **dictionary)
+
+    return dictionary
 
 
 class KgrnParamsData(Dict):
     """
-    KgrnParamsData(kgrn=None)
+    KgrnParamsData(kgrn=None, defaults=None)
 
     AiiDA compatible node representing a KGRN parameter data object.
 
     The parameters a validate before. The only things that is done here
 
+    If a stored KgrnParamsData is passed as defaults, the node is an
+    overlay: only the parameters which differ from the defaults and the uuid
+    of the defaults node are stored. The complete parameters are resolved
+    on access.
+
+    The defaults node is referenced by the `kgrn_defaults_uuid` attribute,
+    not by a link. It is added to the `adamant/kgrn_defaults` group, export
+    this group together with overlay nodes and don't delete its nodes.
+    QueryBuilder filters on `attributes.<param>` only see the parameters
+    stored on the node itself, values inherited from the defaults node are
+    not matched.
     """
 
     def __init__(self, **kwargs):
         dictionary = kwargs.pop('kgrn', None)
+        defaults = kwargs.pop('defaults', None)
 
-        if dictionary is None:
+        if defaults is not None:
+            _dictionary = self._get_overlay(
+                get_params_validator().convert(dictionary or {}), defaults)
+            super().__init__(dict=_dictionary)
+        elif dictionary is None:
             super().__init__(**kwargs)
         else:
             _dictionary = self._check_params(dictionary)
             super().__init__(dict=_dictionary)
 
+    @staticmethod
+    def _get_overlay(dictionary: Mapping,
+                     defaults: 'KgrnParamsData') -> dict:
+        """
+
+        :param dictionary: converted parameters of the node
+        :param defaults: stored, complete parameter node
+        :return: attributes of the overlay node
+        """
+        if not isinstance(defaults, KgrnParamsData) or not defaults.is_stored:
+            raise ValueError('The defaults must be a stored KgrnParamsData')
+        if defaults.is_overlay:
+            raise ValueError('The defaults can not be an overlay node')
+
+        base = defaults.get_dict()
+        _dictionary = {
+            param: value
+            for param, value in dictionary.items()
+            if param not in base or base[param] != value
+        }
+        _dictionary[DEFAULTS_UUID_KEY] = defaults.uuid
+
+        _add_to_defaults_group(defaults.uuid)
+        return _dictionary
+
+    @classmethod
+    def overlay(cls, dictionary: Mapping,
+                defaults: Optional['KgrnParamsData'] = None
+                ) -> 'KgrnParamsData':
+        """
+
+        :param dictionary: parameters that differ from the defaults
+        :param defaults: stored defaults node, the shared node with the
+            package defaults if not given
+        :return: unstored overlay node
+        """
+        if defaults is None:
+            defaults = cls.get_defaults_node()
+        return cls(kgrn=dictionary, defaults=defaults)
+
+    @classmethod
+    def get_defaults_node(cls) -> 'KgrnParamsData':
+        """
+        Shared node with the package defaults
+
+        The node is looked up by the hash of the defaults, so all overlays
+        created with the same package version reference the same node. If
+        concurrent processes create the node at the same time, all of them
+        use the oldest node.
+
+        :return: stored node, created if it does not exist yet
+        """
+        from aiida.orm import QueryBuilder
+
+        defaults = get_params_validator()({})
+        defaults_hash = hashlib.sha256(
+            json.dumps(defaults, sort_keys=True).encode()).hexdigest()
+
+        def get_oldest():
+            builder = QueryBuilder()
+            builder.append(
+                cls,
+                filters={f'extras.{DEFAULTS_EXTRA}': defaults_hash},
+                project='*',
+                tag='defaults')
+            builder.order_by({'defaults': {'id': 'asc'}})
+            result = builder.first()
+            return result[0] if result is not None else None
+
+        node = get_oldest()
+        if node is not None:
+            return node
+
+        # the extra is stored together with the node, so it can be found
+        # by concurrent processes as soon as it exists
+        node = cls(dict=defaults)
+        node.set_extra(DEFAULTS_EXTRA, defaults_hash)
+        node.store()
+        _add_to_defaults_group(node.uuid)
+
+        return get_oldest()
+
+    @property
+    def is_overlay(self) -> bool:
+        return DEFAULTS_UUID_KEY in self.attributes
+
+    @property
+    def defaults_uuid(self) -> Optional[str]:
+        """
+
+        :return: uuid of the defaults node of an overlay node
+        """
+        return self.get_attribute(DEFAULTS_UUID_KEY, None)
+
+    def get_overrides(self) -> dict:
+        """
+
+        :return: the stored parameters, without the defaults
+        """
+        dictionary = super().get_dict()
+        dictionary.pop(DEFAULTS_UUID_KEY, None)
+        return dictionary
+
+    def get_dict(self) -> dict:
+        """
+
+        :return: the complete parameters
+        """
+        resolved = getattr(self, '_resolved', None)
+        if resolved is not None:
+            return dict(resolved)
+
+        dictionary = resolve_params(super().get_dict())
+
+        # attributes of stored nodes can not change anymore
+        if self.is_stored:
+            self._resolved = dictionary
+
+        return dict(dictionary)
+
+    def _get_objects_to_hash(self) -> list:
+        """
+        Hash the canonical, resolved parameters
+
+        Key case and order, restated defaults, overlay or complete storage
+        and float noise below the written precision don't change the hash.
+        """
+        objects = super()._get_objects_to_hash()
+        objects[1] = get_canonical_params(self.get_dict())
+        return objects
+
+    def keys(self):
+        return self.get_dict().keys()
+
+    def __getitem__(self, key):
+        return self.get_dict()[key]
+
+    @property
+    def dict(self):
+        return AttributeDict(self.get_dict())
+
     @staticmethod
     def _check_params(dictionary: Mapping) -> Mapping:
         """
@@ -43,19 +474,43 @@ class KgrnParamsData(Dict):
         :param dictionary:
         :return:
         """
+        return get_params_validator()(dictionary)
 
-        _dictionary = dict(sorted(DEFAULT_PARAMS.items(),
-                                  key=operator.itemgetter(0)))
+    @classmethod
+    def bulk(cls,
+             overrides: Iterable[Mapping],
+             defaults: Optional['KgrnParamsData'] = None
+             ) -> List['KgrnParamsData']:
+        """
+        Create parameter nodes for many parameter sets
 
-        for param, value in dictionary.items():
+        All parameter sets are validated before the first node is created.
 
-            if param.lower() in DEFAULT_PARAMS:
-                _dictionary[param.lower()] = value
-            else:
-                raise ValueError(f'Parameter {param.lower()} '
-                                 f'is not part of the kgrn input')
+        :param overrides: parameters of every node that differ from the
+            defaults
+        :param defaults: stored defaults node, if given overlay nodes are
+            created
+        :return: unstored nodes in the order of the overrides
+        """
+        # overlay nodes only store the given parameters
+        validator = get_params_validator()
+        validate = validator if defaults is None else validator.convert
 
-        return _dictionary
+        dictionaries = []
+        for index, dictionary in enumerate(overrides):
+            try:
+                dictionaries.append(validate(dictionary))
+            except ValueError as exc:
+                raise ValueError(f'Parameter set {index}: {exc}') from exc
+
+        if defaults is not None:
+            # the overrides are converted already
+            return [
+                cls(dict=cls._get_overlay(dictionary, defaults))
+                for dictionary in dictionaries
+            ]
+
+        return [cls(dict=dictionary) for dictionary in dictionaries]
 
 
 
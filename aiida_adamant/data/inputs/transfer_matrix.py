@@ -0,0 +1,159 @@
+"""
+Datatype for the transfer matrix (structure constants) of KGRN
+
+KSTR writes the slope and Madelung matrices into a Fortran unformatted
+sequential file (FOR001). Every record is enclosed by two 4 byte little
+endian markers holding its length in bytes; the first record is a text
+header, e.g. ``Slope & Madelung matrices, Lat=  sc, Job=fcc ...``.
+
+The file is stored verbatim in the file repository of the node and
+streamed unchanged into the calculation folder, KGRN reads it as written
+by KSTR. Only the size, the number of records and the header are stored
+in the database; the records are read lazily one by one.
+"""
+import contextlib
+import os
+import shutil
+import struct
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+
+from aiida.orm import Data
+
+_MARKER = struct.Struct('<i')
+
+
+def iter_records(handle: BinaryIO) -> Iterator[bytes]:
+    """
+    Iterate over the records of a Fortran unformatted sequential file
+
+    :param handle: binary handle of the file
+    :return: iterator over the payloads of the records
+    """
+    while True:
+        head = handle.read(_MARKER.size)
+        if not head:
+            return
+        if len(head) != _MARKER.size:
+            raise ValueError("Truncated record marker")
+
+        length, = _MARKER.unpack(head)
+        if length < 0:
+            raise ValueError("Records split into subrecords are not "
+                             "supported")
+
+        payload = handle.read(length)
+        tail = handle.read(_MARKER.size)
+        if len(payload) != length or len(tail) != _MARKER.size or \
+                _MARKER.unpack(tail)[0] != length:
+            raise ValueError(f"Record of {length} bytes is not terminated "
+                             f"by a matching marker")
+
+        yield payload
+
+
+def write_records(handle: BinaryIO, records: Iterable[bytes]) -> None:
+    """
+    Write records of a Fortran unformatted sequential file
+
+    :param handle: binary handle
+    :param records: payloads of the records
+    """
+    for payload in records:
+        marker = _MARKER.pack(len(payload))
+        handle.write(marker)
+        handle.write(payload)
+        handle.write(marker)
+
+
+class TransferMatrixData(Data):
+    """
+    TransferMatrixData(file=None)
+
+    AiiDA compatible node representing the structure constants of a
+    structure as the .tfm file written by KSTR.
+    """
+    FILENAME = 'transfer_matrix.tfm'
+
+    def __init__(self,
+                 file: Optional[Union[str, os.PathLike, BinaryIO]] = None,
+                 **kwargs):
+        super().__init__(**kwargs)
+
+        if file is not None:
+            self.set_file(file)
+
+    def set_file(self, file: Union[str, os.PathLike, BinaryIO]) -> None:
+        """
+        Store a .tfm file in the repository of the node
+
+        The record structure is checked before the file is stored.
+
+        :param file: path or binary handle of the file
+        """
+        with contextlib.ExitStack() as stack:
+            if isinstance(file, (str, os.PathLike)):
+                file = stack.enter_context(open(file, 'rb'))
+
+            start = file.tell()
+
+            header = None
+            num_records = 0
+            for payload in iter_records(file):
+                if header is None:
+                    header = payload.decode('ascii', 'replace').strip()
+                num_records += 1
+
+            if header is None:
+                raise ValueError("The transfer matrix file is empty")
+
+            size = file.tell() - start
+            file.seek(start)
+            self.put_object_from_filelike(file,
+                                          self.FILENAME,
+                                          mode='wb',
+                                          encoding=None)
+
+        self.set_attribute('header', header)
+        self.set_attribute('num_records', num_records)
+        self.set_attribute('size', size)
+
+    @property
+    def header(self) -> str:
+        return self.get_attribute('header')
+
+    @property
+    def num_records(self) -> int:
+        return self.get_attribute('num_records')
+
+    @property
+    def size(self) -> int:
+        return self.get_attribute('size')
+
+    def iter_records(self) -> Iterator[bytes]:
+        """
+        Iterate lazily over the records
+
+        The repository file stays open while the iterator is consumed, only
+        one record is held in memory at a time.
+
+        :return: iterator over the payloads of the records
+        """
+        with self.open(self.FILENAME, mode='rb') as handle:
+            yield from iter_records(handle)
+
+    def get_records(self) -> List[bytes]:
+        """
+
+        :return: payloads of all records
+        """
+        return list(self.iter_records())
+
+    def write(self, handle: BinaryIO, chunk_size: int = 1 << 20) -> None:
+        """
+        Write the file unchanged
+
+        :param handle: binary handle
+        :param chunk_size: number of bytes copied at once
+        """
+        with self.open(self.FILENAME, mode='rb') as source:
+            shutil.copyfileobj(source, handle, chunk_size)
@@ -0,0 +1,136 @@
+"""
+Datatype for output files stored gzip compressed in the repository
+
+Restart data of KGRN (potentials, full charge densities) compresses well,
+storing it compressed saves most of the repository space. The files are
+decompressed while they are read, they are never unpacked on disk.
+"""
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Dict, Iterator, List, Union
+
+from aiida.orm import Data
+
+SUFFIX = '.gz'
+
+
+class CompressedFolderData(Data):
+    """
+    CompressedFolderData(compresslevel=6)
+
+    AiiDA compatible node representing a folder of files which are stored
+    gzip compressed. The names and sizes of the files are stored as
+    attributes, so they can be queried without opening the repository.
+    """
+    def __init__(self, compresslevel: int = 6, **kwargs):
+        super().__init__(**kwargs)
+
+        self._compresslevel = compresslevel
+        self.set_attribute('files', {})
+
+    @property
+    def files(self) -> Dict[str, Dict[str, int]]:
+        """
+
+        :return: uncompressed and compressed size of every file
+        """
+        return self.get_attribute('files')
+
+    def list_file_names(self) -> List[str]:
+        """
+
+        :return: relative paths of the files
+        """
+        return sorted(self.files)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.files
+
+    def add_file(self, source: Union[str, os.PathLike, BinaryIO],
+                 name: str) -> None:
+        """
+        Compress a file into the repository of the node
+
+        The file is streamed through the compressor, so arbitrarily large
+        files can be added.
+
+        :param source: path or binary handle of the file
+        :param name: relative path of the file in the node
+        """
+        with contextlib.ExitStack() as stack:
+            if isinstance(source, (str, os.PathLike)):
+                source = stack.enter_context(open(source, 'rb'))
+
+            compressed = stack.enter_context(
+                tempfile.NamedTemporaryFile(suffix=SUFFIX))
+
+            size = 0
+            with gzip.GzipFile(fileobj=compressed,
+                               mode='wb',
+                               compresslevel=self._compresslevel,
+                               mtime=0) as handle:
+                for chunk in iter(lambda: source.read(1 << 20), b''):
+                    handle.write(chunk)
+                    size += len(chunk)
+
+            compressed.flush()
+            self.put_object_from_file(compressed.name, name + SUFFIX)
+
+            files = self.files
+            files[name] = {
+                'size': size,
+                'compressed_size': os.path.getsize(compressed.name)
+            }
+            self.set_attribute('files', files)
+
+    def add_directory(self, directory: Union[str, os.PathLike],
+                      prefix: str = '') -> None:
+        """
+        Compress all files of a directory tree
+
+        :param directory: path of the directory
+        :param prefix: relative path of the directory in the node
+        """
+        for root, _, filenames in os.walk(directory):
+            for filename in sorted(filenames):
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, directory)
+                self.add_file(path, os.path.join(prefix, name))
+
+    @contextlib.contextmanager
+    def open_file(self, name: str, mode: str = 'r') -> Iterator[io.IOBase]:
+        """
+        Open a file, it is decompressed while it is read
+
+        :param name: relative path of the file
+        :param mode: 'r' for text or 'rb' for binary mode
+        :return: handle of the uncompressed content
+        """
+        if mode not in ('r', 'rb'):
+            raise ValueError(f"Invalid mode {mode!r}, use 'r' or 'rb'")
+        if name not in self.files:
+            raise FileNotFoundError(f'{name} is not part of the folder')
+
+        with self.open(name + SUFFIX, 'rb') as compressed, \
+                gzip.GzipFile(fileobj=compressed, mode='rb') as handle:
+            if mode == 'rb':
+                yield handle
+            else:
+                yield io.TextIOWrapper(handle, encoding='utf8')
+
+    def extract(self, directory: Union[str, os.PathLike]) -> None:
+        """
+        Write the uncompressed files into a directory
+
+        :param directory: target directory, created if it does not exist
+        """
+        for name in self.files:
+            path = os.path.join(directory, name)
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with self.open_file(name, 'rb') as source, \
+                    open(path, 'wb') as target:
+                shutil.copyfileobj(source, target, 1 << 20)
@@ -0,0 +1,8 @@
+"""
+Parsers provided by aiida_adamant.
+
+Register parsers via the "aiida.parsers" entry point in setup.json.
+"""
+from .kgrn_parser import KgrnParser
+
+__all__ = ['KgrnParser']
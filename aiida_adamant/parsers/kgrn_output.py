@@ -0,0 +1,192 @@
+"""
+Single pass reader of the KGRN output file
+
+The output of runs with a verbose NPRN can reach several hundred MB. The file
+is therefore memory-mapped and scanned line by line; only the lines carrying
+the quantities of interest are matched against the regular expressions below.
+
+Recognized lines::
+
+    Iteration no.   3  Etot =   -2541.25637803 erren =   0.13280493
+    IT =   1 ITA =   2 ...
+    Magn. mom. =      2.1990
+    TOT-PBE     -2541.29506012 ...
+    Converged in  12 iterations
+"""
+from __future__ import annotations
+
+import mmap
+import re
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+ENERGY_UNIT = 'Ry'
+
+_FLOAT = rb'([-+]?\d+\.\d*(?:[EeDd][-+]?\d+)?)'
+
+ITERATION = re.compile(rb'Iteration no\.\s*(\d+)\s+Etot\s*=\s*' + _FLOAT +
+                       rb'\s+erren\s*=\s*' + _FLOAT)
+COMPONENT = re.compile(rb'\bI[TQ]\s*=\s*(\d+)\s+ITA\s*=\s*(\d+)')
+MOMENT = re.compile(rb'Magn\.\s*mom\.\s*=\s*' + _FLOAT)
+TOTAL_ENERGY = re.compile(rb'TOT-(\w+)\s*[=:]?\s*' + _FLOAT)
+CONVERGED = re.compile(rb'Converged in\s+(\d+)\s+iterations')
+
+#: Name of the total energy (TOT-<name>) of the exchange-correlation
+#: functional selected by IEX
+XC_FUNCTIONALS = {4: 'LDA', 7: 'PBE'}
+
+
+def _to_float(value: bytes) -> float:
+    return float(value.replace(b'D', b'E').replace(b'd', b'e'))
+
+
+def _iter_lines(handle: BinaryIO) -> Iterator[bytes]:
+    """
+    Iterate over the lines of a file without reading it into memory
+
+    :param handle: binary file handle
+    :return: iterator over the lines
+    """
+    try:
+        fileno = handle.fileno()
+    except (AttributeError, OSError, ValueError):
+        fileno = None
+
+    if fileno is None:
+        yield from handle
+        return
+
+    try:
+        data = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # empty files can not be mapped
+        return
+
+    with data:
+        yield from iter(data.readline, b'')
+
+
+def parse_kgrn_output(handle: BinaryIO,
+                      functional: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract energies, moments and the SCF history from a KGRN output
+
+    Magnetic moments are reported per component type (IT, ITA); only the
+    values of the last iteration are kept.
+
+    :param handle: binary handle of the output file
+    :param functional: exchange-correlation functional of the total
+        energy, e.g. 'PBE', see XC_FUNCTIONALS. If not given or not
+        reported, the last reported total energy is used.
+    :return: dict with the parsed quantities
+    """
+    iterations = []
+    etot = []
+    erren = []
+    energies: Dict[str, float] = {}
+    moments: Dict[tuple, float] = {}
+    component = None
+    converged = False
+
+    for line in _iter_lines(handle):
+
+        if b'Iteration' in line:
+            match = ITERATION.search(line)
+            if match:
+                iterations.append(int(match.group(1)))
+                etot.append(_to_float(match.group(2)))
+                erren.append(_to_float(match.group(3)))
+                continue
+
+        if b'ITA' in line:
+            match = COMPONENT.search(line)
+            if match:
+                component = (int(match.group(1)), int(match.group(2)))
+
+        if b'Magn' in line:
+            match = MOMENT.search(line)
+            if match and component is not None:
+                moments[component] = _to_float(match.group(1))
+                continue
+
+        if b'TOT-' in line:
+            match = TOTAL_ENERGY.search(line)
+            if match:
+                energies[match.group(1).decode()] = _to_float(match.group(2))
+                continue
+
+        if b'Converged' in line and CONVERGED.search(line):
+            converged = True
+
+    if functional is not None and functional.upper() in energies:
+        functional = functional.upper()
+        total_energy = energies[functional]
+    elif energies:
+        functional, total_energy = list(energies.items())[-1]
+    else:
+        functional = None
+        total_energy = etot[-1] if etot else None
+
+    return {
+        'total_energy': total_energy,
+        'functional': functional,
+        'energy_unit': ENERGY_UNIT,
+        'energies': energies,
+        'converged': converged,
+        'num_iterations': len(iterations),
+        'scf_history': {
+            'iteration': iterations,
+            'etot': etot,
+            'erren': erren,
+        },
+        'magnetic_moments': moments,
+    }
+
+
+def get_alloy_entries(structure, results: Dict[str, Any]):
+    """
+    Assign the parsed quantities to the sites of an alloy structure
+
+    KGRN labels the components by the inequivalent site (IT) and the running
+    component index on this site (ITA). Paramagnetic (DLM) components occupy
+    two ITA and therefore get two magnetic moments.
+
+    :param structure: alloy structure of the calculation
+    :param results: dict returned by parse_kgrn_output
+    :return: alloy entries of the structure
+    """
+    from pymatgen.core.units import Energy
+
+    from aiida_adamant.alloy.alloy_entries import (AlloyEntries,
+                                                   ComponentEntry,
+                                                   StructureEntries)
+
+    if results['total_energy'] is None:
+        raise ValueError("No total energy was found in the output")
+
+    moments = results['magnetic_moments']
+
+    site_entries = []
+    for site, neq_site_index in zip(structure, structure.neq_site_index):
+        species = site.species
+
+        entries = []
+        ita = 0
+        for comp in species:
+            count = 2 if species.magnetic_params[comp].is_paramagnetic else 1
+
+            values = []
+            for ita in range(ita + 1, ita + count + 1):
+                try:
+                    values.append(moments[(neq_site_index, ita)])
+                except KeyError:
+                    raise ValueError(f"No magnetic moment was found for "
+                                     f"IT={neq_site_index} ITA={ita}")
+
+            entries.append(ComponentEntry(values))
+        site_entries.append(entries)
+
+    return AlloyEntries(
+        structure,
+        StructureEntries(Energy(results['total_energy'],
+                                results['energy_unit'])),
+        site_entries)
@@ -0,0 +1,152 @@
+"""
+Parser of the KGRN calculation
+"""
+import glob
+import json
+import os
+from typing import Optional
+
+from aiida.common import exceptions
+from aiida.engine import ExitCode
+from aiida.orm import Dict
+from aiida.parsers.parser import Parser
+
+from aiida_adamant.data.inputs.kgrn_params import KgrnParams
+from aiida_adamant.data.outputs.compressed_folder import CompressedFolderData
+from aiida_adamant.parsers.kgrn_output import (XC_FUNCTIONALS,
+                                               get_alloy_entries,
+                                               parse_kgrn_output)
+from aiida_adamant.utils.defaults import KgrnDefaults
+
+
+class KgrnParser(Parser):
+    """
+    Parse the output file of a KgrnCalculation
+
+    The output file is scanned in a single pass without reading it into
+    memory. The energies and the SCF history are stored in the
+    `output_parameters`, the per-component magnetic moments as serialized
+    AlloyEntries in `alloy_entries`.
+
+    The output file is read from the retrieved folder, or from the
+    temporary retrieved folder if it is not kept. The files of the other
+    kept output categories are compressed into `output_files`.
+    """
+    def parse(self, **kwargs):
+        """
+        Parse the retrieved output file
+
+        :param retrieved_temporary_folder: absolute path of the temporary
+            retrieved folder
+        :return: non-zero exit code, if parsing fails
+        """
+        output_filename = self.node.get_option('output_filename')
+        temporary_folder = kwargs.get('retrieved_temporary_folder')
+
+        try:
+            retrieved = self.retrieved
+        except exceptions.NotExistent:
+            return self.exit_codes.ERROR_NO_RETRIEVED_FOLDER
+
+        output_path = None
+        if temporary_folder is not None:
+            output_path = os.path.join(temporary_folder, output_filename)
+            if not os.path.isfile(output_path):
+                output_path = None
+
+        if output_path is None and \
+                output_filename not in retrieved.list_object_names():
+            return self.exit_codes.ERROR_MISSING_OUTPUT_FILES
+
+        if temporary_folder is not None:
+            output_files = self._get_output_files(temporary_folder)
+            if output_files is not None:
+                self.out('output_files', output_files)
+
+        # FUNC is the shape approximation, the functional is selected by IEX
+        iex = KgrnParams(self.node.inputs.kgrn.params.get_dict())['IEX']
+        functional = XC_FUNCTIONALS.get(iex)
+
+        try:
+            if output_path is not None:
+                # a file on disk is memory mapped instead of read
+                handle = open(output_path, 'rb')
+            else:
+                handle = retrieved.open(output_filename, 'rb')
+
+            with handle:
+                results = parse_kgrn_output(handle, functional=functional)
+        except (OSError, ValueError):
+            return self.exit_codes.ERROR_READING_OUTPUT_FILE
+
+        if results['total_energy'] is None:
+            return self.exit_codes.ERROR_INVALID_OUTPUT
+
+        if functional is not None and results['functional'] != functional:
+            self.logger.warning(
+                f"No total energy of {functional} (IEX={iex}) was reported, "
+                f"the total energy of {results['functional']} is used")
+
+        moments = results.pop('magnetic_moments')
+
+        self.out('output_parameters', Dict(dict=results))
+
+        if moments:
+            # pymatgen is only imported for outputs with magnetic moments
+            from monty.json import MontyEncoder
+
+            from aiida_adamant.utils.structure import get_alloy_structure
+
+            structure = get_alloy_structure(self.node.inputs.kgrn.structure)
+            results['magnetic_moments'] = moments
+
+            try:
+                entries = get_alloy_entries(structure, results)
+            except ValueError:
+                return self.exit_codes.ERROR_INVALID_OUTPUT
+
+            self.out('alloy_entries',
+                     Dict(dict=json.loads(json.dumps(entries,
+                                                     cls=MontyEncoder))))
+
+        if not results['converged']:
+            return self.exit_codes.ERROR_SCF_NOT_CONVERGED
+
+        return ExitCode(0)
+
+    def _get_output_files(self,
+                          temporary_folder: str
+                          ) -> Optional[CompressedFolderData]:
+        """
+        Compress the files of the kept output categories
+
+        :param temporary_folder: absolute path of the temporary retrieved
+            folder
+        :return: the compressed files, None if no files are kept
+        """
+        if not self.node.get_option('compress_retrieved'):
+            return None
+
+        output_categories = KgrnDefaults.OUTPUT_CATEGORIES
+
+        output_files = CompressedFolderData()
+
+        for category in self.node.get_option('retrieve_categories'):
+            entry = getattr(output_categories, category)
+            if entry is None:
+                # the output file is kept uncompressed in the retrieved folder
+                continue
+
+            # files matching a pattern are retrieved into the top level
+            for path in sorted(
+                    glob.glob(os.path.join(temporary_folder, entry))):
+                name = os.path.relpath(path, temporary_folder)
+                if os.path.isdir(path):
+                    output_files.add_directory(path, prefix=name)
+                else:
+                    output_files.add_file(path, name)
+
+        if not output_files.files:
+            return None
+
+        return output_files
@@ -1,4 +1,67 @@
+from __future__ import annotations
+
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from pymatgen.util.typing import PathLike
+
+
+class KgrnFile(NamedTuple):
+    """
+    File or directory referenced by the KGRN input file
+    """
+    name: str
+
+    def get_string(self, rel_path: PathLike = None,
+                   is_dir: bool = False) -> str:
+        """
+
+        :param rel_path: directory the file is referenced from
+        :param is_dir: if True, a trailing slash is appended
+        :return: path as written into the input file
+        """
+        path = PurePosixPath(self.name)
+        if rel_path is not None:
+            path = PurePosixPath(rel_path) / path
+
+        string = path.as_posix()
+        return string + "/" if is_dir else string
+
+
+class KgrnConfigFiles(NamedTuple):
+    transfer_matrix: KgrnFile = KgrnFile('kgrn.tfm')
+    madelung_matrix: KgrnFile = KgrnFile('kgrn.mdl')
+    shape_matrix: KgrnFile = KgrnFile('kgrn.shp')
+    atom_config: KgrnFile = KgrnFile('ATOM.cfg')
+
+
+class KgrnOutputDirs(NamedTuple):
+    ctrl_dir: KgrnFile = KgrnFile('pot')
+    output_dir: KgrnFile = KgrnFile('.')
+    full_chd_dir: KgrnFile = KgrnFile('chd')
+
+
+class KgrnOutputCategories(NamedTuple):
+    """
+    Groups of output files which can be retrieved
+
+    The values are the retrieve entries relative to the working directory,
+    None stands for the output file of the calculation.
+    """
+    output: Optional[str] = None
+    prints: str = '*.prn'
+    control: str = KgrnOutputDirs().ctrl_dir.name
+    charge_density: str = KgrnOutputDirs().full_chd_dir.name
+
+
 class KgrnDefaults:
     INPUT_FILENAME = 'emtocalc.dat'
     OUTPUT_FILENAME = 'emtocalc.out'
     JOB_NAME = 'emtocalc'
+    PARSER_NAME = 'adamant.kgrn_parser'
+    RESTART_STRT = 'B'
+    CONFIG_FILES = KgrnConfigFiles()
+    OUTPUT_DIRS = KgrnOutputDirs()
+    OUTPUT_CATEGORIES = KgrnOutputCategories()
+    RETRIEVE_CATEGORIES = ('output',)
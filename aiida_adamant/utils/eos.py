@@ -0,0 +1,149 @@
+"""
+Birch-Murnaghan equation of state in terms of the Wigner-Seitz radius
+
+The third order Birch-Murnaghan equation of state is a cubic polynomial in
+x = V^(-2/3). With V = 4/3 pi w^3 per site, x is proportional to w^(-2), so
+the fit is a linear least squares problem in w^(-2).
+"""
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+#: Conversion of Ry/bohr^3 to GPa
+RY_BOHR3_TO_GPA = 14710.507848260711
+
+
+class EosFit(NamedTuple):
+    """
+    Result of an equation of state fit
+
+    The energies are per site, the Wigner-Seitz radii in bohr.
+    """
+    sws: float
+    energy: float
+    bulk_modulus: float
+    coefficients: List[float]
+    residual: float
+
+
+def _get_volume(sws):
+    return 4 / 3 * np.pi * np.asarray(sws, dtype=float) ** 3
+
+
+def fit_birch_murnaghan(sws: Sequence[float],
+                        energies: Sequence[float]) -> Optional[EosFit]:
+    """
+    Fit the third order Birch-Murnaghan equation of state
+
+    :param sws: Wigner-Seitz radii in bohr
+    :param energies: total energies per site in Ry
+    :return: the fit, None if there are less than four points or the
+        fitted curve has no minimum
+    """
+    sws = np.asarray(sws, dtype=float)
+    energies = np.asarray(energies, dtype=float)
+
+    if len(sws) < 4:
+        return None
+
+    x = _get_volume(sws) ** (-2 / 3)
+
+    polynomial = np.polynomial.Polynomial.fit(x, energies, 3)
+    derivative = polynomial.deriv()
+    curvature = derivative.deriv()
+
+    extrema = [
+        root.real for root in derivative.roots()
+        if abs(root.imag) < 1e-12 and curvature(root.real) > 0
+        and root.real > 0
+    ]
+    if not extrema:
+        return None
+
+    # the minimum closest to the sampled points
+    x0 = min(extrema, key=lambda root: abs(root - x.mean()))
+
+    volume = x0 ** (-3 / 2)
+    bulk_modulus = 4 / 9 * volume ** (-7 / 3) * curvature(x0)
+
+    residual = float(np.sqrt(np.mean((polynomial(x) - energies) ** 2)))
+
+    return EosFit(sws=float(np.cbrt(volume * 3 / (4 * np.pi))),
+                  energy=float(polynomial(x0)),
+                  bulk_modulus=float(bulk_modulus * RY_BOHR3_TO_GPA),
+                  coefficients=polynomial.convert().coef.tolist(),
+                  residual=residual)
+
+
+def get_sws_uncertainty(sws: Sequence[float],
+                        energies: Sequence[float]) -> float:
+    """
+    Jackknife estimate of the uncertainty of the equilibrium radius
+
+    The equation of state is refitted leaving out one point at a time; the
+    largest deviation of the equilibrium radius is the uncertainty.
+
+    :param sws: Wigner-Seitz radii in bohr
+    :param energies: total energies per site in Ry
+    :return: uncertainty in bohr, inf if it can not be estimated
+    """
+    fit = fit_birch_murnaghan(sws, energies)
+
+    if fit is None or len(sws) < 5:
+        return np.inf
+
+    deviation = 0.0
+    for i in range(len(sws)):
+        subset = fit_birch_murnaghan(np.delete(sws, i), np.delete(energies, i))
+        if subset is None:
+            return np.inf
+        deviation = max(deviation, abs(subset.sws - fit.sws))
+
+    return deviation
+
+
+def suggest_sws(sws: Sequence[float],
+                energies: Sequence[float],
+                tolerance: float) -> List[float]:
+    """
+    Radii at which new points reduce the uncertainty of the fit the most
+
+    If the minimum lies outside of the sampled range, the range is extended
+    towards it. Otherwise new points are placed at the fitted minimum and in
+    the middle of the intervals enclosing it.
+
+    :param sws: Wigner-Seitz radii in bohr
+    :param energies: total energies per site in Ry
+    :param tolerance: required uncertainty of the equilibrium radius in bohr
+    :return: new radii, empty if the fit is converged
+    """
+    order = np.argsort(sws)
+    sws = np.asarray(sws, dtype=float)[order]
+    energies = np.asarray(energies, dtype=float)[order]
+
+    step = float(np.mean(np.diff(sws))) if len(sws) > 1 else tolerance
+    fit = fit_birch_murnaghan(sws, energies)
+
+    if fit is None or fit.sws < sws[0] or fit.sws > sws[-1]:
+        # extend towards the lowest energy
+        if np.argmin(energies) < len(energies) / 2:
+            return [float(sws[0] - step)]
+        return [float(sws[-1] + step)]
+
+    if get_sws_uncertainty(sws, energies) <= tolerance:
+        return []
+
+    upper = int(np.searchsorted(sws, fit.sws))
+    candidates = [fit.sws]
+    if upper > 0:
+        candidates.append((sws[upper - 1] + fit.sws) / 2)
+    if upper < len(sws):
+        candidates.append((sws[upper] + fit.sws) / 2)
+
+    points: List[float] = []
+    for candidate in candidates:
+        if all(abs(candidate - point) > tolerance / 2
+               for point in list(sws) + points):
+            points.append(float(candidate))
+
+    return points
@@ -0,0 +1,200 @@
+"""
+Bulk export of the KGRN input files of many calculations
+
+The inputs are fetched from the database in batches by the main process,
+only the plain attributes of the structures and parameters are handed to a
+pool of worker processes which render the input files. The workers never
+access the database.
+"""
+import io
+import os
+import tarfile
+import time
+from pathlib import Path
+from typing import (BinaryIO, Iterable, Iterator, Mapping, Optional, Tuple,
+                    Union)
+
+from aiida_adamant.calculations.kgrn_input_deck import KgrnInputDeck
+from aiida_adamant.data.inputs.kgrn_params import KgrnParams, resolve_params
+from aiida_adamant.utils.defaults import KgrnDefaults
+from aiida_adamant.utils.pool import imap_batched
+from aiida_adamant.utils.structure import get_alloy_structure_from_attributes
+
+#: Input of a worker: pk, structure attributes and complete parameters
+ExportItem = Tuple[int, Mapping, Mapping]
+
+_STRUCTURE_ATTRIBUTES = ['cell', 'kinds', 'sites']
+
+
+def append_kgrn_calculations(builder, group=None, filters=None):
+    """
+    Append the KgrnCalculation nodes to a query
+
+    :param builder: QueryBuilder
+    :param group: only calculations in this group
+    :param filters: QueryBuilder filters of the calculations
+    """
+    from aiida.orm import Group
+    from aiida.plugins import CalculationFactory
+
+    KgrnCalculation = CalculationFactory('adamant.kgrn_calculation')
+
+    if group is not None:
+        builder.append(Group, filters={'id': group.pk}, tag='group')
+        builder.append(KgrnCalculation,
+                       with_group='group',
+                       filters=filters or {},
+                       tag='calculation')
+    else:
+        builder.append(KgrnCalculation,
+                       filters=filters or {},
+                       tag='calculation')
+
+
+def get_export_query(group=None, filters=None):
+    """
+    Query of the inputs of KgrnCalculations
+
+    :param group: only calculations in this group
+    :param filters: QueryBuilder filters of the calculations
+    :return: QueryBuilder projecting the pk of the calculation, the
+        structure attributes and the parameter attributes
+    """
+    from aiida.orm import QueryBuilder, StructureData
+    from aiida.plugins import DataFactory
+
+    KgrnParamsData = DataFactory('adamant.kgrn_data')
+
+    builder = QueryBuilder()
+    append_kgrn_calculations(builder, group, filters)
+    builder.add_projection('calculation', 'id')
+
+    builder.append(StructureData,
+                   with_outgoing='calculation',
+                   edge_filters={'label': 'kgrn__structure'},
+                   project=[
+                       f'attributes.{attribute}'
+                       for attribute in _STRUCTURE_ATTRIBUTES
+                   ])
+    builder.append(KgrnParamsData,
+                   with_outgoing='calculation',
+                   edge_filters={'label': 'kgrn__params'},
+                   project='attributes')
+    builder.order_by({'calculation': {'id': 'asc'}})
+
+    return builder
+
+
+def get_restarted_calculations(group=None, filters=None) -> set:
+    """
+
+    :param group: only calculations in this group
+    :param filters: QueryBuilder filters of the calculations
+    :return: pks of the calculations with a parent folder
+    """
+    from aiida.orm import QueryBuilder, RemoteData
+
+    builder = QueryBuilder()
+    append_kgrn_calculations(builder, group, filters)
+    builder.add_projection('calculation', 'id')
+    builder.append(RemoteData,
+                   with_outgoing='calculation',
+                   edge_filters={'label': 'parent_folder'})
+
+    return {pk for pk, in builder.iterall()}
+
+
+def iter_export_items(group=None,
+                      filters=None,
+                      batch_size: int = 100) -> Iterator[ExportItem]:
+    """
+    Iterate over the inputs of KgrnCalculations
+
+    Overlay parameters are resolved and STRT is switched to a restart for
+    calculations with a parent folder, as in prepare_for_submission.
+
+    :param group: only calculations in this group
+    :param filters: QueryBuilder filters of the calculations
+    :param batch_size: number of rows fetched from the database at once
+    :return: iterator over the inputs of the workers
+    """
+    restarted = get_restarted_calculations(group, filters)
+
+    for pk, *structure, attributes in get_export_query(
+            group, filters).iterall(batch_size=batch_size):
+
+        params = resolve_params(attributes)
+        if pk in restarted:
+            params['strt'] = KgrnDefaults.RESTART_STRT
+
+        yield pk, dict(zip(_STRUCTURE_ATTRIBUTES, structure)), params
+
+
+def render_export_item(item: ExportItem) -> Tuple[int, bytes]:
+    """
+    Render the input file of a calculation
+
+    :param item: pk, structure attributes and complete parameters
+    :return: pk and the encoded input file
+    """
+    pk, structure, params = item
+
+    deck = KgrnInputDeck(get_alloy_structure_from_attributes(structure),
+                         KgrnParams(params))
+
+    return pk, deck.render().encode('utf8')
+
+
+def export_input_files(items: Iterable[ExportItem],
+                       output: Union[str, os.PathLike, BinaryIO],
+                       filename: str = KgrnDefaults.INPUT_FILENAME,
+                       tar: bool = False,
+                       compression: str = '',
+                       processes: Optional[int] = None,
+                       batch_size: int = 100) -> int:
+    """
+    Write the input files of many calculations
+
+    Every input file is written to ``<pk>/<filename>``, either below the
+    output directory or into a tar archive, which is streamed and can be
+    written to a pipe.
+
+    :param items: inputs of the workers, see iter_export_items
+    :param output: directory, or path or binary handle of the tar archive
+    :param filename: name of the input files
+    :param tar: if True, a tar archive is written
+    :param compression: compression of the tar archive, '', 'gz', 'bz2'
+        or 'xz'
+    :param processes: number of worker processes, all cores if None
+    :param batch_size: number of items handed to the pool at once
+    :return: number of written input files
+    """
+    rendered = imap_batched(render_export_item, items, processes,
+                            batch_size)
+    count = 0
+
+    if not tar:
+        directory = Path(output)
+        for pk, content in rendered:
+            path = directory / str(pk) / filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+            count += 1
+        return count
+
+    mode = f'w|{compression}'
+    if isinstance(output, (str, os.PathLike)):
+        archive = tarfile.open(os.fspath(output), mode)
+    else:
+        archive = tarfile.open(fileobj=output, mode=mode)
+
+    mtime = time.time()
+    with archive:
+        for pk, content in rendered:
+            info = tarfile.TarInfo(f'{pk}/{filename}')
+            info.size = len(content)
+            info.mtime = mtime
+            archive.addfile(info, io.BytesIO(content))
+            count += 1
+
+    return count
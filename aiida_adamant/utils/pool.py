@@ -0,0 +1,44 @@
+"""
+Process pool for CPU bound work on long streams of items
+"""
+import itertools
+import multiprocessing
+import os
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def imap_batched(func: Callable[[T], R],
+                 items: Iterable[T],
+                 processes: Optional[int] = None,
+                 batch_size: int = 100) -> Iterator[R]:
+    """
+    Map a function over items in a pool of worker processes
+
+    The items are consumed batch by batch, so a lazy iterable, e.g. a
+    database query, is never materialized and at most one batch of items
+    and results is held in memory.
+
+    :param func: picklable, module level function
+    :param items: items to map over
+    :param processes: number of worker processes, all cores if None and no
+        pool if 1
+    :param batch_size: number of items handed to the pool at once
+    :return: iterator over the results in the order of the items
+    """
+    items = iter(items)
+
+    if processes == 1:
+        yield from map(func, items)
+        return
+
+    chunksize = max(1, batch_size // (4 * (processes or os.cpu_count())))
+
+    with multiprocessing.Pool(processes) as pool:
+        while True:
+            batch = list(itertools.islice(items, batch_size))
+            if not batch:
+                break
+            yield from pool.imap(func, batch, chunksize)
@@ -0,0 +1,120 @@
+"""
+Content-addressed cache of static input files on a remote computer
+
+The shape function, the Madelung matrix and the atomic configurations only
+depend on the geometry and are the same for all calculations of a lattice.
+They are uploaded once into a cache directory on the computer, named by the
+SHA-256 of their content, and linked into the working directory of every
+calculation.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from typing import Iterable, Optional
+
+from aiida.orm import Computer, RemoteData, SinglefileData
+
+CACHE_DIRNAME = 'adamant_cache'
+
+#: Static input ports of the kgrn namespace and their entry in config_files
+STATIC_INPUTS = {
+    'shape_function': 'shape_matrix',
+    'madelung_matrix': 'madelung_matrix',
+    'atom_cfg': 'atom_config',
+}
+
+#: Extra of a stored file node with the SHA-256 of its content
+HASH_EXTRA = 'adamant_sha256'
+
+_CHUNK_SIZE = 1 << 20
+
+
+def get_file_hash(node: SinglefileData) -> str:
+    """
+    The hash of a stored node is kept as extra, the immutable content is
+    only read once.
+
+    :param node: file node
+    :return: SHA-256 of the file content
+    """
+    if node.is_stored:
+        file_hash = node.get_extra(HASH_EXTRA, None)
+        if file_hash is not None:
+            return file_hash
+
+    sha256 = hashlib.sha256()
+    with node.open(mode='rb') as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    file_hash = sha256.hexdigest()
+
+    if node.is_stored:
+        node.set_extra(HASH_EXTRA, file_hash)
+
+    return file_hash
+
+
+def stage_static_inputs(computer: Computer,
+                        nodes: Iterable[SinglefileData],
+                        cache_dir: Optional[str] = None) -> RemoteData:
+    """
+    Upload files into the cache directory of a computer
+
+    Files already present in the cache are not transferred again. Uploads
+    go to a temporary name unique to the staging first and are renamed
+    into place, so concurrent stagings never expose partially written
+    files.
+
+    :param computer: computer of the calculations
+    :param nodes: file nodes to stage
+    :param cache_dir: absolute path of the cache directory. Defaults to
+        `adamant_cache` in the working directory of the computer.
+    :return: stored folder of the cache with the staged hashes as attribute
+    """
+    hashes = {get_file_hash(node): node for node in nodes}
+
+    with computer.get_transport() as transport:
+        if cache_dir is None:
+            workdir = computer.get_workdir().format(
+                username=transport.whoami())
+            cache_dir = os.path.join(workdir, CACHE_DIRNAME)
+
+        transport.makedirs(cache_dir, ignore_existing=True)
+        existing = set(transport.listdir(cache_dir))
+
+        for file_hash, node in hashes.items():
+            if file_hash in existing:
+                continue
+
+            remote_path = os.path.join(cache_dir, file_hash)
+            partial_path = f'{remote_path}.{os.getpid()}.{uuid.uuid4().hex}' \
+                '.part'
+
+            with tempfile.NamedTemporaryFile() as local_file:
+                with node.open(mode='rb') as handle:
+                    shutil.copyfileobj(handle, local_file)
+                local_file.flush()
+
+                transport.putfile(local_file.name, partial_path)
+            transport.rename(partial_path, remote_path)
+
+    folder = RemoteData(computer=computer, remote_path=cache_dir)
+    folder.set_attribute('hashes', sorted(hashes))
+    return folder.store()
+
+
+def get_cached_path(folder: RemoteData, node: SinglefileData) -> Optional[str]:
+    """
+
+    :param folder: cache folder returned by stage_static_inputs
+    :param node: file node
+    :return: remote path of the file, None if it was not staged
+    """
+    file_hash = get_file_hash(node)
+
+    if file_hash not in folder.get_attribute('hashes', []):
+        return None
+
+    return os.path.join(folder.get_remote_path(), file_hash)
@@ -0,0 +1,105 @@
+"""
+Selection of converged calculations to restart from
+
+A calculation started from the potential and charge density of a converged
+neighbour in SWS and concentration space needs considerably fewer SCF
+iterations than a start from scratch.
+"""
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+
+def get_site_averaged_concentrations(structure) -> Dict[str, float]:
+    """
+
+    :param structure: aiida StructureData with alloy kinds
+    :return: concentration of every element averaged over all sites
+    """
+    kinds = {kind.name: kind for kind in structure.kinds}
+    sites = structure.sites
+
+    concentrations: Dict[str, float] = {}
+    for site in sites:
+        kind = kinds[site.kind_name]
+        for symbol, weight in zip(kind.symbols, kind.weights):
+            concentrations[symbol] = concentrations.get(symbol, 0.0) + weight
+
+    return {
+        symbol: weight / len(sites)
+        for symbol, weight in concentrations.items()
+    }
+
+
+def get_restart_distance(sws: float,
+                         concentrations: Mapping[str, float],
+                         other_sws: float,
+                         other_concentrations: Mapping[str, float],
+                         sws_scale: float = 0.05,
+                         concentration_scale: float = 0.05) -> float:
+    """
+    Scaled distance of two calculations in SWS and concentration space
+
+    :param sws: Wigner-Seitz radius of the new calculation
+    :param concentrations: concentrations of the new calculation
+    :param other_sws: Wigner-Seitz radius of the candidate
+    :param other_concentrations: concentrations of the candidate
+    :param sws_scale: difference of the radius counted as unit distance
+    :param concentration_scale: difference of a concentration counted as
+        unit distance
+    :return: distance, inf if the elements differ
+    """
+    if set(concentrations) != set(other_concentrations):
+        return np.inf
+
+    difference = [(sws - other_sws) / sws_scale]
+    difference += [(concentrations[symbol] - other_concentrations[symbol]) /
+                   concentration_scale for symbol in concentrations]
+
+    return float(np.linalg.norm(difference))
+
+
+def select_parent_calculation(candidates: Iterable,
+                              sws: float,
+                              structure,
+                              max_distance: float = np.inf,
+                              **kwargs):
+    """
+    Closest converged calculation to restart from
+
+    Only calculations which finished successfully, kept their remote folder
+    and have the same number of sites and elements are considered.
+
+    :param candidates: KgrnCalculation nodes
+    :param sws: Wigner-Seitz radius of the new calculation, candidates
+        without SWS parameter are considered to have the same radius
+    :param structure: StructureData of the new calculation
+    :param max_distance: candidates further away are ignored
+    :param kwargs: scales passed to get_restart_distance
+    :return: the closest calculation, None if there is none
+    """
+    concentrations = get_site_averaged_concentrations(structure)
+    num_sites = len(structure.sites)
+
+    best: Optional[object] = None
+    best_distance = max_distance
+
+    for candidate in candidates:
+        if not candidate.is_finished_ok or \
+                'remote_folder' not in candidate.outputs:
+            continue
+
+        other_structure = candidate.inputs.kgrn.structure
+        if len(other_structure.sites) != num_sites:
+            continue
+
+        other_sws = candidate.inputs.kgrn.params.get_dict().get('sws', sws)
+
+        distance = get_restart_distance(
+            sws, concentrations, other_sws,
+            get_site_averaged_concentrations(other_structure), **kwargs)
+
+        if distance <= best_distance:
+            best, best_distance = candidate, distance
+
+    return best
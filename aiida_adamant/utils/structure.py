@@ -0,0 +1,160 @@
+"""
+Conversion between AiiDA structures and alloy structures
+"""
+from typing import Dict, Mapping
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.alloy.alloy_symmetry import get_species_key, round_to_grid
+
+
+def get_alloy_structure(structure) -> AlloyStructure:
+    """
+    Convert a StructureData with alloy kinds into an AlloyStructure
+
+    The symbols and weights of every kind become the elements and
+    concentrations of an alloy composition with default magnetic and
+    screening params.
+
+    :param structure: aiida StructureData
+    :return: alloy structure
+    """
+    return get_alloy_structure_from_attributes(structure.attributes)
+
+
+def get_alloy_structure_from_attributes(attributes: Mapping) -> AlloyStructure:
+    """
+    Convert the attributes of a StructureData into an AlloyStructure
+
+    Works on the plain attributes, e.g. projected by a QueryBuilder, without
+    loading the node.
+
+    :param attributes: 'cell', 'kinds' and 'sites' attributes
+    :return: alloy structure
+    """
+    compositions = {
+        kind['name']: AlloyComposition.intern(list(kind['symbols']),
+                                              list(kind['weights']))
+        for kind in attributes['kinds']
+    }
+
+    sites = attributes['sites']
+
+    return AlloyStructure(attributes['cell'],
+                          [compositions[site['kind_name']] for site in sites],
+                          [site['position'] for site in sites],
+                          coords_are_cartesian=True)
+
+
+def get_structure_data(structure: AlloyStructure):
+    """
+    Convert an AlloyStructure into a StructureData with alloy kinds
+
+    Every distinct composition becomes one kind, named by its elements and
+    numbered if several compositions share the same elements. Magnetic and
+    screening params can not be represented and are dropped.
+
+    :param structure: alloy structure
+    :return: unstored aiida StructureData
+    """
+    from aiida.orm import StructureData
+    from aiida.orm.nodes.data.structure import Kind, Site
+
+    structure_data = StructureData(cell=structure.lattice.matrix.tolist())
+
+    kind_names: Dict[tuple, str] = {}
+
+    for site in structure:
+        species = site.species
+        symbols = tuple(str(element) for element in species)
+        weights = tuple(species[element] for element in species)
+
+        name = kind_names.get((symbols, weights))
+        if name is None:
+            name = base = "".join(symbols)
+            index = 1
+            while name in kind_names.values():
+                index += 1
+                name = f"{base}{index}"
+
+            kind_names[(symbols, weights)] = name
+            structure_data.append_kind(
+                Kind(symbols=symbols, weights=weights, name=name))
+
+        structure_data.append_site(
+            Site(kind_name=name, position=site.coords.tolist()))
+
+    return structure_data
+
+
+def get_concentration_variant(species: AlloyComposition,
+                              concentrations: Mapping[str, float]
+                              ) -> AlloyComposition:
+    """
+    Alloy composition with other concentrations
+
+    Elements of the template keep their magnetic and screening params, new
+    elements get the default params. Note that a StructureData can not
+    hold these params, they are lost by get_structure_data.
+
+    :param species: template composition
+    :param concentrations: concentration of every element of the variant
+    :return: interned alloy composition
+    """
+    params = {str(element): element for element in species}
+
+    magnetic_params = []
+    screening_params = []
+    for symbol in concentrations:
+        element = params.get(symbol)
+        if element is None:
+            magnetic_params.append({})
+            screening_params.append({})
+        else:
+            magnetic_params.append(species.magnetic_params[element])
+            screening_params.append(species.screening_params[element])
+
+    return AlloyComposition.intern(list(concentrations),
+                                   list(concentrations.values()),
+                                   magnetic_params=magnetic_params,
+                                   screening_params=screening_params)
+
+
+def get_canonical_structure(structure: AlloyStructure,
+                            tolerance: float = 1e-5) -> AlloyStructure:
+    """
+    Normalized copy of an alloy structure
+
+    Lattice and wrapped fractional coordinates are rounded to a grid with
+    the spacing tolerance, concentrations to the six decimals of the input
+    file, and the sites are sorted by composition and position. Equivalent
+    structures therefore give identical StructureData and hash identically.
+
+    :param structure: alloy structure
+    :param tolerance: spacing of the rounding grid
+    :return: canonical structure
+    """
+    matrix, coords = round_to_grid(structure.lattice, structure.frac_coords,
+                                   tolerance)
+
+    compositions: Dict[tuple, AlloyComposition] = {}
+    keys = []
+    for site in structure:
+        species = site.species
+        key = get_species_key(species)
+        if key not in compositions:
+            compositions[key] = get_concentration_variant(
+                species, {
+                    str(element): round(species[element], 6)
+                    for element in species
+                })
+        keys.append(key)
+
+    order = sorted(range(len(keys)),
+                   key=lambda i: (keys[i], tuple(coords[i])))
+
+    grid = int(round(1 / tolerance))
+
+    return AlloyStructure(matrix / grid,
+                          [compositions[keys[i]] for i in order],
+                          coords[order] / grid)
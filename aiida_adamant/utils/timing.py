@@ -0,0 +1,134 @@
+"""
+Wall time spent in the sections of a code path
+
+A SectionTimer accumulates the time spent in named sections. The disabled
+timer NULL_TIMER makes instrumented code cost only a function call per
+section, so the instrumentation can stay in place.
+
+Sections opened inside another section are recorded under the path of
+their parents, e.g. ``total/input_file/control_section``, so the time of a
+nested section is not mistaken for time spent next to its parent.
+"""
+import contextlib
+import time
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+#: Extra of a KgrnCalculation with the timings of prepare_for_submission
+TIMINGS_EXTRA = 'kgrn_timings'
+
+#: Separator of the names in the path of a nested section
+SEPARATOR = '/'
+
+
+class SectionTimer:
+    """
+    Accumulate the wall time of named sections
+    """
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._path: List[str] = []
+
+    @contextlib.contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """
+        Time a section, repeated sections with the same name are added up
+
+        A section inside another section is recorded under the path of
+        the open sections joined by SEPARATOR.
+
+        :param name: name of the section
+        """
+        self._path.append(name)
+        key = SEPARATOR.join(self._path)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[key] = self.timings.get(key, 0.0) + \
+                time.perf_counter() - start
+            self._path.pop()
+
+
+class _NullTimer(SectionTimer):
+    """
+    Timer which does not time anything
+    """
+    def section(self, name: str):
+        return contextlib.nullcontext()
+
+
+NULL_TIMER = _NullTimer()
+
+
+def summarize_timings(timings: Iterable[Mapping[str, float]]
+                      ) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate the timings of many runs
+
+    The timings are consumed one by one, so they can be streamed from a
+    database query.
+
+    :param timings: seconds spent in every section of a run
+    :return: count, total, mean, min and max of every section
+    """
+    summary: Dict[str, Dict[str, float]] = {}
+
+    for run in timings:
+        for name, seconds in run.items():
+            entry = summary.get(name)
+            if entry is None:
+                summary[name] = {
+                    'count': 1,
+                    'total': seconds,
+                    'min': seconds,
+                    'max': seconds
+                }
+                continue
+
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['min'] = min(entry['min'], seconds)
+            entry['max'] = max(entry['max'], seconds)
+
+    for entry in summary.values():
+        entry['mean'] = entry['total'] / entry['count']
+
+    return summary
+
+
+def get_parent_section(name: str) -> Optional[str]:
+    """
+    Get the path of the section enclosing a nested section
+
+    :param name: path of the section
+    :return: path of the parent section, None for a top level section
+    """
+    parent, separator, _ = name.rpartition(SEPARATOR)
+    return parent if separator else None
+
+
+def iter_section_tree(summary: Mapping[str, Mapping[str, float]]
+                      ) -> Iterator[Tuple[str, int]]:
+    """
+    Iterate depth first over the sections of a summary
+
+    The sections below the same parent are ordered by descending total
+    time. A section whose parent is missing is treated as top level.
+
+    :param summary: summary of the sections, see summarize_timings
+    :return: iterator over the paths and nesting depths of the sections
+    """
+    children: Dict[Optional[str], List[str]] = {}
+    for name in summary:
+        parent = get_parent_section(name)
+        if parent not in summary:
+            parent = None
+        children.setdefault(parent, []).append(name)
+
+    def _iter(parent, depth):
+        for name in sorted(children.get(parent, ()),
+                           key=lambda name: -summary[name]['total']):
+            yield name, depth
+            yield from _iter(name, depth + 1)
+
+    return _iter(None, 0)
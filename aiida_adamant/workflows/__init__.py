@@ -0,0 +1,9 @@
+"""
+Workflows provided by aiida_adamant.
+
+Register workflows via the "aiida.workflows" entry point in setup.json.
+"""
+from .concentration_sweep import ConcentrationSweepWorkChain
+from .equation_of_state import EquationOfStateWorkChain
+
+__all__ = ['ConcentrationSweepWorkChain', 'EquationOfStateWorkChain']
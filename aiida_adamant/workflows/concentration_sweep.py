@@ -0,0 +1,252 @@
+"""
+Workflow running a KgrnCalculation for every point of a concentration grid
+"""
+from aiida.engine import WorkChain, ToContext, calcfunction, while_
+from aiida.orm import Bool, Dict, Int, List, Str, StructureData
+
+from aiida_adamant.calculations.kgrn_calculation import KgrnCalculation
+from aiida_adamant.utils.restart import select_parent_calculation
+
+
+@calcfunction
+def create_concentration_variant(structure: StructureData, kind_name: Str,
+                                 concentrations: Dict) -> StructureData:
+    """
+    Replace the composition of all sites of a kind
+
+    A StructureData only holds the elements and weights of a kind, all
+    components of the variant are calculated with the default magnetic and
+    screening params, like every KgrnCalculation.
+
+    :param structure: template structure
+    :param kind_name: kind whose composition is replaced
+    :param concentrations: concentration of every element of the variant
+    :return: structure with the new composition
+    """
+    from aiida_adamant.alloy.alloy_structure import AlloyStructure
+    from aiida_adamant.utils.structure import (get_alloy_structure,
+                                               get_canonical_structure,
+                                               get_concentration_variant,
+                                               get_structure_data)
+
+    alloy_structure = get_alloy_structure(structure)
+
+    kind_names = [site.kind_name for site in structure.sites]
+    template = alloy_structure[kind_names.index(kind_name.value)].species
+
+    variant = get_concentration_variant(template, concentrations.get_dict())
+
+    species = [
+        variant if name == kind_name.value else site.species
+        for name, site in zip(kind_names, alloy_structure)
+    ]
+
+    return get_structure_data(
+        get_canonical_structure(
+            AlloyStructure(alloy_structure.lattice, species,
+                           alloy_structure.frac_coords)))
+
+
+@calcfunction
+def collect_alloy_entries(concentrations: List, **results) -> Dict:
+    """
+    Collect the results of the calculations of a sweep
+
+    :param concentrations: concentrations of the sweep
+    :param results: `output_parameters_<index>` and `alloy_entries_<index>`
+        outputs of the successful calculations
+    :return: concentrations, total energies and serialized AlloyEntries,
+        None for failed calculations
+    """
+    concentrations = concentrations.get_list()
+
+    total_energies = [None] * len(concentrations)
+    entries = [None] * len(concentrations)
+
+    for key, node in results.items():
+        name, index = key.rsplit('_', 1)
+        if name == 'output_parameters':
+            total_energies[int(index)] = node.get_dict()['total_energy']
+        else:
+            entries[int(index)] = node.get_dict()
+
+    return Dict(dict={
+        'concentrations': concentrations,
+        'total_energies': total_energies,
+        'alloy_entries': entries,
+    })
+
+
+class ConcentrationSweepWorkChain(WorkChain):
+    """
+    Run a KgrnCalculation for every concentration of one alloy kind
+
+    The calculations are submitted in batches of at most `max_concurrent`
+    calculations; the next batch is submitted once the previous one
+    terminated. The AlloyEntries of all calculations are collected into a
+    single output.
+
+    The batches are a deliberate barrier: a WorkChain step only resumes
+    after all processes it waits for terminated, it can not be woken up by
+    the first one. A slow calculation therefore delays the next batch, the
+    number of running calculations never exceeds `max_concurrent` but can
+    drop below it towards the end of a batch. Warm starts profit from the
+    barrier, every batch can start from all calculations of the previous
+    batches.
+    """
+    @classmethod
+    def define(cls, spec):
+        """Define inputs, outputs and outline of the workflow."""
+        super().define(spec)
+
+        spec.expose_inputs(KgrnCalculation,
+                           namespace='calculation',
+                           namespace_options={
+                               'help': 'Inputs of the calculations, the '
+                               'kgrn.structure is the template of the sweep'
+                           })
+
+        spec.input('concentrations',
+                   valid_type=List,
+                   help='List of dicts with the concentration of every '
+                   'element of the swept kind')
+
+        spec.input('kind_name',
+                   valid_type=Str,
+                   required=False,
+                   help='Kind whose composition is swept. Defaults to the '
+                   'only kind with more than one element.')
+
+        spec.input('warm_start',
+                   valid_type=Bool,
+                   default=lambda: Bool(False),
+                   help='Start calculations from the closest finished '
+                   'calculation of the workflow')
+
+        spec.input('max_concurrent',
+                   valid_type=Int,
+                   default=lambda: Int(10),
+                   help='Number of calculations of a batch, the next batch '
+                   'is submitted once all calculations of the batch '
+                   'terminated')
+
+        spec.outline(
+            cls.setup,
+            while_(cls.should_submit)(
+                cls.submit_batch,
+                cls.inspect_batch,
+            ),
+            cls.results,
+        )
+
+        spec.output('alloy_entries',
+                    valid_type=Dict,
+                    help='Concentrations, total energies and serialized '
+                    'AlloyEntries of all calculations')
+
+        spec.exit_code(401,
+                       'ERROR_INVALID_KIND',
+                       message='The kind to sweep is not unique or does not '
+                       'exist.')
+
+        spec.exit_code(402,
+                       'ERROR_ALL_CALCULATIONS_FAILED',
+                       message='None of the calculations finished '
+                       'successfully.')
+
+    def setup(self):
+        """
+        Determine the swept kind and initialize the context
+        """
+        structure = self.inputs.calculation.kgrn.structure
+
+        if 'kind_name' in self.inputs:
+            kind_name = self.inputs.kind_name.value
+            if kind_name not in structure.get_kind_names():
+                return self.exit_codes.ERROR_INVALID_KIND
+        else:
+            alloy_kinds = [
+                kind.name for kind in structure.kinds if len(kind.symbols) > 1
+            ]
+            if len(alloy_kinds) != 1:
+                return self.exit_codes.ERROR_INVALID_KIND
+            kind_name = alloy_kinds[0]
+
+        self.ctx.kind_name = kind_name
+        self.ctx.concentrations = self.inputs.concentrations.get_list()
+        self.ctx.index = 0
+        self.ctx.calculations = []
+
+        return None
+
+    def should_submit(self):
+        return self.ctx.index < len(self.ctx.concentrations)
+
+    def submit_batch(self):
+        """
+        Submit the next batch of calculations
+        """
+        start = self.ctx.index
+        stop = min(start + self.inputs.max_concurrent.value,
+                   len(self.ctx.concentrations))
+
+        calculations = {}
+        for index in range(start, stop):
+            structure = create_concentration_variant(
+                self.inputs.calculation.kgrn.structure,
+                Str(self.ctx.kind_name),
+                Dict(dict=self.ctx.concentrations[index]))
+
+            inputs = self.exposed_inputs(KgrnCalculation, 'calculation')
+            inputs['kgrn']['structure'] = structure
+
+            if self.inputs.warm_start.value:
+                parent = select_parent_calculation(
+                    self.ctx.calculations,
+                    inputs['kgrn']['params'].get_dict().get('sws', 0.0),
+                    structure)
+                if parent is not None:
+                    inputs['parent_folder'] = parent.outputs.remote_folder
+
+            calculations[f'calculation_{index}'] = self.submit(
+                KgrnCalculation, **inputs)
+
+        self.ctx.index = stop
+        self.ctx.batch = list(calculations)
+
+        self.report(f'submitted calculations {start} to {stop - 1}')
+
+        return ToContext(**calculations)
+
+    def inspect_batch(self):
+        """
+        Move the finished batch into the list of calculations
+        """
+        for key in self.ctx.batch:
+            self.ctx.calculations.append(self.ctx[key])
+
+    def results(self):
+        """
+        Collect the AlloyEntries of all calculations
+        """
+        results = {}
+
+        for index, calculation in enumerate(self.ctx.calculations):
+            if not calculation.is_finished_ok:
+                self.report(f'{calculation.process_label}<{calculation.pk}> '
+                            f'failed with exit status '
+                            f'{calculation.exit_status}')
+                continue
+
+            outputs = calculation.outputs
+            results[f'output_parameters_{index}'] = outputs.output_parameters
+            if 'alloy_entries' in outputs:
+                results[f'alloy_entries_{index}'] = outputs.alloy_entries
+
+        if not results:
+            return self.exit_codes.ERROR_ALL_CALCULATIONS_FAILED
+
+        self.out('alloy_entries',
+                 collect_alloy_entries(self.inputs.concentrations, **results))
+
+        return None
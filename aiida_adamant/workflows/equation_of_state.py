@@ -0,0 +1,258 @@
+"""
+Workflow fitting the equation of state of an alloy
+"""
+import numpy as np
+from aiida.engine import WorkChain, ToContext, calcfunction, while_
+from aiida.orm import Bool, Dict, Float, Int, List, load_node
+
+from aiida_adamant.calculations.kgrn_calculation import KgrnCalculation
+from aiida_adamant.data.inputs.kgrn_params import KgrnParamsData
+from aiida_adamant.utils.eos import (fit_birch_murnaghan, get_sws_uncertainty,
+                                     suggest_sws)
+from aiida_adamant.utils.restart import select_parent_calculation
+
+
+@calcfunction
+def set_wigner_seitz_radius(params: KgrnParamsData, sws: Float):
+    """
+    Parameters with another Wigner-Seitz radius
+
+    :param params: parameters of the calculation
+    :param sws: Wigner-Seitz radius in bohr
+    :return: overlay of the parameters with the new SWS
+    """
+    if params.is_overlay:
+        defaults = load_node(params.defaults_uuid)
+        overrides = params.get_overrides()
+    else:
+        defaults = params
+        overrides = {}
+
+    overrides['sws'] = sws.value
+
+    return KgrnParamsData(kgrn=overrides, defaults=defaults)
+
+
+@calcfunction
+def fit_equation_of_state(num_sites: Int, **results) -> Dict:
+    """
+    Fit the Birch-Murnaghan equation of state
+
+    :param num_sites: number of sites of the structure
+    :param results: `params_<index>` and `output_parameters_<index>` of
+        every successful calculation
+    :return: equilibrium radius, energy and bulk modulus and the points of
+        the fit
+    """
+    points = []
+    for key, node in results.items():
+        if key.startswith('params_'):
+            index = key[len('params_'):]
+            energy = results[f'output_parameters_{index}']['total_energy']
+            points.append((node['sws'], energy / num_sites.value))
+
+    sws, energies = (list(values) for values in zip(*sorted(points)))
+
+    fit = fit_birch_murnaghan(sws, energies)
+    uncertainty = get_sws_uncertainty(sws, energies)
+
+    return Dict(
+        dict={
+            'sws': sws,
+            'energies': energies,
+            'equilibrium_sws': fit.sws if fit else None,
+            'equilibrium_energy': fit.energy if fit else None,
+            'bulk_modulus': fit.bulk_modulus if fit else None,
+            'sws_uncertainty': None if np.isinf(uncertainty) else uncertainty,
+            'coefficients': fit.coefficients if fit else None,
+            'residual': fit.residual if fit else None,
+            'energy_unit': 'Ry',
+            'sws_unit': 'bohr',
+            'bulk_modulus_unit': 'GPa',
+        })
+
+
+class EquationOfStateWorkChain(WorkChain):
+    """
+    Fit the equation of state with adaptively placed volume points
+
+    The initial points are calculated in parallel. Further points are only
+    added where the equilibrium radius of the Birch-Murnaghan fit is
+    uncertain, until the jackknife uncertainty drops below the tolerance or
+    `max_points` are calculated.
+    """
+    @classmethod
+    def define(cls, spec):
+        """Define inputs, outputs and outline of the workflow."""
+        super().define(spec)
+
+        spec.expose_inputs(KgrnCalculation,
+                           namespace='calculation',
+                           namespace_options={
+                               'help': 'Inputs of the calculations, the SWS '
+                               'of the kgrn.params is replaced'
+                           })
+
+        spec.input('sws',
+                   valid_type=List,
+                   required=False,
+                   help='Initial Wigner-Seitz radii in bohr. By default '
+                   '`num_points` radii around the radius of the structure.')
+
+        spec.input('num_points',
+                   valid_type=Int,
+                   default=lambda: Int(5),
+                   help='Number of initial points')
+
+        spec.input('step',
+                   valid_type=Float,
+                   default=lambda: Float(0.05),
+                   help='Spacing of the initial points in bohr')
+
+        spec.input('tolerance',
+                   valid_type=Float,
+                   default=lambda: Float(0.002),
+                   help='Required uncertainty of the equilibrium radius in '
+                   'bohr')
+
+        spec.input('warm_start',
+                   valid_type=Bool,
+                   default=lambda: Bool(False),
+                   help='Start calculations from the closest finished '
+                   'calculation of the workflow')
+
+        spec.input('max_points',
+                   valid_type=Int,
+                   default=lambda: Int(12),
+                   help='Maximum number of calculated points')
+
+        spec.outline(
+            cls.setup,
+            cls.run_points,
+            cls.inspect_points,
+            while_(cls.should_refine)(
+                cls.run_points,
+                cls.inspect_points,
+            ),
+            cls.results,
+        )
+
+        spec.output('eos',
+                    valid_type=Dict,
+                    help='Points and parameters of the equation of state')
+
+        spec.exit_code(401,
+                       'ERROR_NOT_ENOUGH_POINTS',
+                       message='Less than four calculations finished '
+                       'successfully.')
+
+        spec.exit_code(402,
+                       'ERROR_FIT_FAILED',
+                       message='The fitted equation of state has no '
+                       'minimum.')
+
+    def setup(self):
+        """
+        Determine the initial points
+        """
+        if 'sws' in self.inputs:
+            sws = self.inputs.sws.get_list()
+        else:
+            from aiida_adamant.utils.structure import get_alloy_structure
+
+            structure = self.inputs.calculation.kgrn.structure
+            center = get_alloy_structure(structure).wigner_seitz_radius
+
+            num_points = self.inputs.num_points.value
+            offsets = np.arange(num_points) - (num_points - 1) / 2
+            sws = (center + offsets * self.inputs.step.value).tolist()
+
+        self.ctx.pending = sws
+        self.ctx.points = []
+
+    def run_points(self):
+        """
+        Submit the pending points in parallel
+        """
+        params = self.inputs.calculation.kgrn.params
+
+        structure = self.inputs.calculation.kgrn.structure
+        finished = [self.ctx[key] for _, key in self.ctx.points]
+
+        calculations = {}
+        for sws in self.ctx.pending:
+            index = len(self.ctx.points)
+
+            inputs = self.exposed_inputs(KgrnCalculation, 'calculation')
+            inputs['kgrn']['params'] = set_wigner_seitz_radius(
+                params, Float(sws))
+
+            if self.inputs.warm_start.value:
+                parent = select_parent_calculation(finished, sws, structure)
+                if parent is not None:
+                    inputs['parent_folder'] = parent.outputs.remote_folder
+
+            calculations[f'point_{index}'] = self.submit(
+                KgrnCalculation, **inputs)
+            self.ctx.points.append((sws, f'point_{index}'))
+
+        self.report(f'submitted {len(calculations)} points')
+        self.ctx.pending = []
+
+        return ToContext(**calculations)
+
+    def _get_energies(self):
+        sws = []
+        energies = []
+        num_sites = len(self.inputs.calculation.kgrn.structure.sites)
+
+        for value, key in self.ctx.points:
+            calculation = self.ctx[key]
+            if calculation.is_finished_ok:
+                parameters = calculation.outputs.output_parameters
+                sws.append(value)
+                energies.append(parameters['total_energy'] / num_sites)
+
+        return sws, energies
+
+    def inspect_points(self):
+        """
+        Propose new points where the fit is uncertain
+        """
+        sws, energies = self._get_energies()
+
+        remaining = self.inputs.max_points.value - len(self.ctx.points)
+        if remaining <= 0 or len(sws) < 4:
+            return
+
+        self.ctx.pending = suggest_sws(sws, energies,
+                                       self.inputs.tolerance.value)[:remaining]
+
+    def should_refine(self):
+        return bool(self.ctx.pending)
+
+    def results(self):
+        """
+        Fit the equation of state to all successful points
+        """
+        results = {}
+        num_points = 0
+        for index, (_, key) in enumerate(self.ctx.points):
+            calculation = self.ctx[key]
+            if calculation.is_finished_ok:
+                results[f'params_{index}'] = calculation.inputs.kgrn.params
+                results[f'output_parameters_{index}'] = \
+                    calculation.outputs.output_parameters
+                num_points += 1
+
+        if num_points < 4:
+            return self.exit_codes.ERROR_NOT_ENOUGH_POINTS
+
+        eos = fit_equation_of_state(
+            Int(len(self.inputs.calculation.kgrn.structure.sites)), **results)
+        self.out('eos', eos)
+
+        if eos['equilibrium_sws'] is None:
+            return self.exit_codes.ERROR_FIT_FAILED
+
+        return None
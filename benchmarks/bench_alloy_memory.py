@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Memory held per site by the alloy compositions of a supercell
+
+Compares one AlloyComposition per site with interned compositions which are
+shared by all sites with the same composition.
+
+Usage: python benchmarks/bench_alloy_memory.py [--sites 1000 10000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+
+from common import SITE_COUNTS
+
+COMPOSITIONS = (
+    (['Fe', 'Al'], [0.4, 0.6]),
+    (['Fe', 'Cr', 'Ni'], [0.7, 0.2, 0.1]),
+    (['Co', 'Cr', 'Fe', 'Mn', 'Ni'], [0.2] * 5),
+)
+
+
+def measure(factory, num_sites):
+    """
+
+    :param factory: callable creating a composition
+    :param num_sites: number of sites
+    :return: bytes allocated per site
+    """
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+
+    species = [factory(*COMPOSITIONS[i % len(COMPOSITIONS)])
+               for i in range(num_sites)]
+
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del species
+    return (current - start) / num_sites
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sites', type=int, nargs='+', default=SITE_COUNTS)
+    args = parser.parse_args()
+
+    print(f"{'sites':>8s} {'per site [B]':>13s} {'interned [B]':>13s}")
+
+    for num_sites in args.sites:
+        fresh = measure(AlloyComposition, num_sites)
+        interned = measure(AlloyComposition.intern, num_sites)
+
+        print(f"{num_sites:8d} {fresh:13.1f} {interned:13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Import time of the modules registered as entry points in setup.json
+
+Every module is imported in a fresh interpreter with ``-X importtime``
+after aiida itself, so only the time added by the plugin is measured.
+The check fails if a module exceeds the budget or imports one of the
+modules which should only be loaded on first use.
+
+Usage: python benchmarks/bench_import_time.py [--budget 100] [--repeat 3]
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+SETUP_JSON = Path(__file__).resolve().parent.parent / 'setup.json'
+
+#: Imported first, they are paid by every daemon worker anyway
+PRELOAD = ('aiida.orm', 'aiida.engine', 'aiida.parsers', 'aiida.plugins',
+           'aiida.cmdline.commands.cmd_data')
+
+#: Heavy modules which must not be imported by loading an entry point
+LAZY_MODULES = ('pymatgen', 'spglib', 'monty.json')
+
+#: Budgets in ms of modules which legitimately need more time
+BUDGETS = {}
+
+_MARKER = '--- preloaded'
+
+_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+
+def get_entry_point_modules():
+    """
+
+    :return: modules of all entry points in setup.json
+    """
+    with open(SETUP_JSON) as handle:
+        entry_points = json.load(handle)['entry_points']
+
+    modules = []
+    for values in entry_points.values():
+        for value in values:
+            module = value.split('=', 1)[1].split(':')[0].strip()
+            if module not in modules:
+                modules.append(module)
+
+    return modules
+
+
+def measure(module):
+    """
+    Import a module in a fresh interpreter
+
+    :param module: name of the module
+    :return: import time of the plugin modules in ms and the imported
+        modules
+    """
+    code = (f"import sys, {', '.join(PRELOAD)}; "
+            f"sys.stderr.write({_MARKER!r} + '\\n'); import {module}")
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True)
+
+    lines = result.stderr.splitlines()
+    lines = lines[lines.index(_MARKER) + 1:]
+
+    cumulative = 0
+    imported = []
+
+    for line in lines:
+        match = _LINE.match(line)
+        if match is None:
+            continue
+
+        imported.append(match.group(4))
+        # the top-level imports contain the time of their children
+        if not match.group(3):
+            cumulative += int(match.group(2))
+
+    return cumulative / 1000, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budget', type=float, default=100.,
+                        help='Default budget per module in ms')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'module':<50s} {'time [ms]':>10s} {'budget':>8s}  lazy "
+          "modules imported")
+
+    failed = False
+    for module in get_entry_point_modules():
+        best = float('inf')
+        for _ in range(args.repeat):
+            time_ms, imported = measure(module)
+            best = min(best, time_ms)
+
+        eager = sorted({
+            name
+            for name in imported for lazy in LAZY_MODULES
+            if name == lazy or name.startswith(lazy + '.')
+        })
+
+        budget = BUDGETS.get(module, args.budget)
+        failed |= best > budget or bool(eager)
+
+        print(f"{module:<50s} {best:10.1f} {budget:8.1f}  "
+              f"{', '.join(eager) or '-'}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Scaling of the KGRN input file writers with the number of sites
+
+Usage: python benchmarks/bench_kgrn_renderer.py [--sites 1 100 10000]
+"""
+import argparse
+import io
+
+from aiida_adamant.calculations.kgrn_renderer import KgrnInputRenderer
+
+from common import SITE_COUNTS, best_of, get_input_deck, get_supercell
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sites', type=int, nargs='+', default=SITE_COUNTS)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'sites':>8s} {'string [ms]':>12s} {'stream [ms]':>12s} "
+          f"{'speedup':>8s}")
+
+    for num_sites in args.sites:
+        source = get_input_deck(get_supercell(num_sites))
+
+        legacy, expected = best_of(source.create_input_file_string,
+                                   args.repeat)
+
+        def stream(source=source):
+            handle = io.StringIO()
+            KgrnInputRenderer(source).write(handle)
+            return handle.getvalue()
+
+        streamed, result = best_of(stream, args.repeat)
+
+        if result != expected:
+            raise RuntimeError(f"Rendered input differs for {num_sites} sites")
+
+        print(f"{num_sites:8d} {legacy * 1e3:12.3f} {streamed * 1e3:12.3f} "
+              f"{legacy / streamed:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+"""
+Benchmark suite of the hot paths of the plugin
+
+Times the KGRN input file, the construction and dict round trip of alloy
+structures, alloy compositions, the parameter validation and the analysis
+of serialized alloy entries on synthetic
+supercells and reports throughput and peak memory. Neither a profile nor
+a daemon is needed.
+
+The results can be stored as baseline and later runs compared against it;
+the run fails if a case got slower or needs more memory than the
+tolerance allows. Baselines are machine specific, record them on the
+machine the comparison runs on.
+
+Usage: python benchmarks/bench_suite.py [--sites 1 100 1000 10000]
+           [--save baseline.json] [--baseline baseline.json]
+"""
+import argparse
+import json
+import platform
+import sys
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_entries import (AlloyEntries,
+                                               AlloyEntriesColumns,
+                                               ComponentEntry,
+                                               StructureEntries)
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.data.inputs.kgrn_params import KgrnParamsData
+
+from common import (best_of, get_compositions, get_input_deck, get_supercell,
+                    peak_memory)
+
+SITE_COUNTS = (1, 100, 1000, 10000)
+
+
+def get_cases(num_sites):
+    """
+    Benchmark cases of a supercell
+
+    :param num_sites: number of sites of the supercell
+    :return: dict of the name and the callable of every case
+    """
+    structure = get_supercell(num_sites)
+    lattice, coords = structure.lattice, structure.frac_coords
+    species = [site.species for site in structure]
+
+    source = get_input_deck(structure)
+    structure_dict = structure.as_dict()
+
+    arguments = [(list(map(str, composition)), composition.concentrations)
+                 for composition in get_compositions()]
+    arguments = [arguments[i % len(arguments)] for i in range(num_sites)]
+    compositions = [AlloyComposition(*args) for args in arguments]
+
+    params = [{'sws': 2.6 + 1e-5 * i, 'niter': '80', 'tole': '1d-7'}
+              for i in range(num_sites)]
+
+    entries_dict = AlloyEntries(structure, StructureEntries(0.0), [[
+        ComponentEntry([1.0, -1.0] if paramagnetic else 1.0)
+        for paramagnetic in site.species.is_paramagnetic.values()
+    ] for site in structure]).as_dict()
+
+    def entries_analysis():
+        columns = AlloyEntriesColumns.from_dict(entries_dict)
+        return (columns.total_magnetic_moment, columns.magnetic_splitting,
+                columns.get_element_averages())
+
+    def composition_equality():
+        return sum(first == second for first, second in
+                   zip(compositions, compositions[1:] + compositions[:1]))
+
+    return {
+        'create_input_file_string': source.create_input_file_string,
+        'structure': lambda: AlloyStructure(lattice, species, coords,
+                                            analyze_symmetry=False),
+        'as_dict': structure.as_dict,
+        'from_dict': lambda: AlloyStructure.from_dict(structure_dict),
+        'composition': lambda: [AlloyComposition(*args)
+                                for args in arguments],
+        'composition_equality': composition_equality,
+        # pylint: disable=protected-access
+        'params_validation': lambda: [KgrnParamsData._check_params(p)
+                                      for p in params],
+        'entries_analysis': entries_analysis,
+    }
+
+
+def run(site_counts, repeat):
+    """
+
+    :param site_counts: numbers of sites of the supercells
+    :param repeat: repetitions of every timing
+    :return: results keyed by '<case>/<sites>'
+    """
+    results = {}
+
+    print(f"{'case':<28s} {'sites':>6s} {'time [ms]':>10s} "
+          f"{'sites/s':>11s} {'peak [kB]':>10s}")
+
+    for num_sites in site_counts:
+        for name, func in get_cases(num_sites).items():
+            # lazily loaded defaults and caches are not part of the timing
+            func()
+
+            seconds, _ = best_of(func, repeat)
+            peak = peak_memory(func)
+
+            results[f'{name}/{num_sites}'] = {
+                'seconds': seconds,
+                'throughput': num_sites / seconds if seconds else None,
+                'peak_memory': peak,
+            }
+
+            print(f"{name:<28s} {num_sites:6d} {seconds * 1e3:10.3f} "
+                  f"{num_sites / max(seconds, 1e-12):11.0f} "
+                  f"{peak / 1024:10.1f}")
+
+    return results
+
+
+def compare(results, baseline, tolerance, memory_tolerance, min_time=1e-3):
+    """
+    Compare the results against a baseline
+
+    :param results: results of this run
+    :param baseline: results of the baseline run
+    :param tolerance: allowed relative increase of the time
+    :param memory_tolerance: allowed relative increase of the peak memory
+    :param min_time: increases of the time below this many seconds are
+        considered noise
+    :return: names of the regressed cases
+    """
+    regressions = []
+
+    print(f"\n{'case':<36s} {'time':>8s} {'memory':>8s}")
+
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+
+        time_ratio = result['seconds'] / reference['seconds']
+        memory_ratio = result['peak_memory'] / max(reference['peak_memory'],
+                                                   1)
+
+        slower = time_ratio > 1 + tolerance and \
+            result['seconds'] - reference['seconds'] > min_time
+        regressed = slower or memory_ratio > 1 + memory_tolerance
+        if regressed:
+            regressions.append(key)
+
+        print(f"{key:<36s} {time_ratio:8.2f} {memory_ratio:8.2f}"
+              f"{'  REGRESSION' if regressed else ''}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sites', type=int, nargs='+', default=SITE_COUNTS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help='Store the results as baseline')
+    parser.add_argument('--baseline', help='Compare against this baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative increase of the time')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10,
+                        help='Allowed relative increase of the peak memory')
+    parser.add_argument('--min-time', type=float, default=1e-3,
+                        help='Increases of the time below this many seconds '
+                        'are considered noise')
+    args = parser.parse_args()
+
+    results = run(args.sites, args.repeat)
+
+    if args.save:
+        with open(args.save, 'w') as handle:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+            }, handle, indent=1, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)['results']
+
+        regressions = compare(results, baseline, args.tolerance,
+                              args.memory_tolerance, args.min_time)
+        if regressions:
+            print(f"\n{len(regressions)} regressions")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Synthetic inputs shared by the benchmark scripts
+"""
+import gc
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.calculations.kgrn_input_deck import KgrnInputDeck
+
+SITE_COUNTS = (1, 10, 100, 1000, 10000)
+
+
+def get_compositions() -> List[AlloyComposition]:
+    """
+
+    :return: a handful of distinct compositions as found in SQS supercells
+    """
+    return [
+        AlloyComposition(['Fe', 'Al'], [0.4, 0.6]),
+        AlloyComposition(['Fe', 'Cr', 'Ni'], [0.7, 0.2, 0.1]),
+        AlloyComposition(['Ti', 'Al'], [0.5, 0.5],
+                         magnetic_params=[{'is_paramagnetic': False}] * 2),
+        AlloyComposition(['Co', 'Cr', 'Fe', 'Mn', 'Ni'], [0.2] * 5),
+    ]
+
+
+def get_supercell(num_sites: int,
+                  alat: float = 2.87,
+                  analyze_symmetry: bool = False) -> AlloyStructure:
+    """
+    Simple cubic supercell with compositions cycled over the sites
+
+    :param num_sites: number of sites of the supercell
+    :param alat: lattice constant of the primitive cell
+    :param analyze_symmetry: if False, every site is nonequivalent and
+        the timings don't include the symmetry analysis
+    :return: alloy structure with num_sites sites
+    """
+    size = int(np.ceil(num_sites ** (1 / 3)))
+
+    grid = np.indices((size, size, size)).reshape(3, -1).T[:num_sites]
+    coords = grid / size
+
+    compositions = get_compositions()
+    species = [compositions[i % len(compositions)] for i in range(num_sites)]
+
+    return AlloyStructure(np.eye(3) * alat * size, species, coords,
+                          analyze_symmetry=analyze_symmetry)
+
+
+def get_input_deck(structure: AlloyStructure) -> KgrnInputDeck:
+    """
+
+    :param structure: alloy structure
+    :return: input deck of the structure with the default parameters
+    """
+    return KgrnInputDeck(structure, {'sws': 2.65, 'comment': 'benchmark'},
+                         job_name='bench')
+
+
+def best_of(func: Callable, repeat: int = 5) -> Tuple[float, object]:
+    """
+    Time a callable
+
+    :param func: callable without arguments
+    :param repeat: number of repetitions
+    :return: best wall time in seconds and the last result
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(func: Callable) -> int:
+    """
+    Peak memory allocated by a callable
+
+    :param func: callable without arguments
+    :return: peak of the memory traced during the call in bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
@@ -1,7 +1,7 @@
 """ Tests for the plugin.
 
-Includes both tests written in unittest style (test_cli.py) and tests written
-in pytest style (test_calculations.py).
+The tests are written in pytest style, the fixtures of aiida are loaded in
+conftest.py.
 """
 import os
 
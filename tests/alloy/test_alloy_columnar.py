@@ -0,0 +1,44 @@
+""" Tests for the columnar alloy structure representation
+
+"""
+from aiida_adamant.alloy.alloy_columnar import AlloyStructureColumns, \
+    dumps_structure, loads_structure
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.alloy.alloy_symmetry import symmetry_cache
+
+CELL = [[3., 0., 0.], [0., 3., 0.], [0., 0., 3.]]
+
+
+def _get_structure():
+    fe_al = AlloyComposition(['Fe', 'Al'], [0.5, 0.5])
+    ti_al = AlloyComposition(['Ti', 'Al'], [0.3, 0.7],
+                             screening_params=[{'alpha': 0.6}] * 2)
+    return AlloyStructure(CELL, [fe_al, ti_al, fe_al,
+                                 AlloyComposition(['Fe', 'Al'], [0.5, 0.5])],
+                          [[0., 0., 0.], [0.5, 0.5, 0.5],
+                           [0.5, 0., 0.], [0., 0.5, 0.]],
+                          properties={'label': 'columnar'})
+
+
+def test_unique_compositions():
+    columns = AlloyStructureColumns.from_structure(_get_structure())
+
+    assert len(columns) == 4
+    assert len(columns.compositions) == 2
+    assert columns.species_index.tolist() == [0, 1, 0, 0]
+
+
+def test_binary_round_trip():
+    structure = _get_structure()
+    site_index = structure.site_index
+
+    symmetry_cache.cache_clear()
+
+    loaded = loads_structure(dumps_structure(structure))
+
+    assert loaded == structure
+    assert loaded.properties == {'label': 'columnar'}
+    assert loaded.site_index == site_index
+    assert loaded[0].species is loaded[2].species
+    assert symmetry_cache.cache_info().misses == 0
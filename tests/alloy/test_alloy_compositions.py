@@ -1,5 +1,49 @@
+import gc
+import pickle
+import weakref
+
+import pytest
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition, \
+    MagneticParams, ScreeningParams
+
 
 def test_alloy_composition():
 
     alloy_composition = AlloyComposition(['Fe','Al'],[0.5,0.5])
 
+
+def test_params_are_frozen_and_slotted():
+    params = MagneticParams(init_mag_mom=2.2)
+
+    with pytest.raises(AttributeError):
+        params.init_mag_mom = 1.0
+
+    assert not hasattr(params, '__dict__')
+    assert params == MagneticParams.from_dict(params.as_dict())
+    assert pickle.loads(pickle.dumps(params)) == params
+    assert ScreeningParams.intern() is ScreeningParams.intern(0.70, 1.2)
+
+
+def test_interned_params_are_released():
+    params = weakref.ref(MagneticParams.intern(init_mag_mom=3.3))
+    gc.collect()
+
+    assert params() is None
+
+
+def test_interned_compositions_are_shared():
+    alloy = AlloyComposition.intern(['Fe', 'Al'], [0.5, 0.5])
+    same = AlloyComposition.intern(['Fe', 'Al'], [0.5, 0.5],
+                                   magnetic_params=[MagneticParams()] * 2,
+                                   screening_params=[{'alpha': 0.7}] * 2)
+    other = AlloyComposition.intern(['Fe', 'Al'], [0.4, 0.6])
+
+    assert alloy is same
+    assert alloy is not other
+    assert alloy == AlloyComposition(['Fe', 'Al'], [0.5, 0.5])
+    assert AlloyComposition.from_dict(alloy.as_dict()) is alloy
+
+    # components with the same params share one params object
+    assert alloy.magnetic_params[alloy.elements[0]] is \
+        other.magnetic_params[other.elements[1]]
@@ -0,0 +1,91 @@
+""" Tests for the alloy entries and their columnar representation
+
+"""
+import json
+
+import numpy as np
+import pytest
+from monty.json import MontyEncoder
+from pymatgen.core import Lattice
+from pymatgen.core.units import Energy
+
+from aiida_adamant.alloy.alloy_composition import (AlloyComposition,
+                                                   MagneticParams)
+from aiida_adamant.alloy.alloy_entries import (AlloyEntries,
+                                               AlloyEntriesColumns,
+                                               ComponentEntry,
+                                               StructureEntries)
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+
+
+@pytest.fixture
+def entries():
+    fe_al = AlloyComposition(['Fe', 'Al'], [0.5, 0.5],
+                             magnetic_params=[
+                                 MagneticParams(True, 'F', 2.0),
+                                 MagneticParams(False)
+                             ])
+    fe_ni = AlloyComposition(['Fe', 'Ni'], [0.25, 0.75],
+                             magnetic_params=[
+                                 MagneticParams(False),
+                                 MagneticParams(False)
+                             ])
+    structure = AlloyStructure(Lattice.cubic(2.87), [fe_al, fe_ni],
+                               [[0, 0, 0], [0.5, 0.5, 0.5]],
+                               analyze_symmetry=False)
+
+    return AlloyEntries(structure, StructureEntries(Energy(-10., 'Ry')), [
+        [ComponentEntry([2.2, -2.0]), ComponentEntry(0.01)],
+        [ComponentEntry(2.6), ComponentEntry(0.6)],
+    ])
+
+
+def test_component_entry_equality():
+    assert ComponentEntry([2.2, -2.2]) == ComponentEntry([2.2, -2.2])
+    assert ComponentEntry([2.2, -2.2]) != ComponentEntry([2.2, 2.2])
+    assert ComponentEntry(2.2) != ComponentEntry([2.2, -2.2])
+
+
+def test_columns(entries):
+    columns = entries.columns
+
+    assert len(columns) == 4
+    assert columns.elements == ['Fe', 'Al', 'Ni']
+    assert columns.site_index.tolist() == [0, 0, 1, 1]
+    assert columns.component_index.tolist() == [0, 1, 0, 1]
+    assert columns.element_index.tolist() == [0, 1, 0, 2]
+    assert columns.is_paramagnetic.tolist() == [True, False, False, False]
+
+
+def test_vectorized_analysis(entries):
+    assert entries.magnetic_splitting == pytest.approx([-4.2, 0., 0., 0.])
+    # the two DLM moments of Fe each belong to half of its concentration
+    assert entries.site_magnetic_moments == pytest.approx(
+        [0.25 * 2.2 + 0.25 * -2.0 + 0.5 * 0.01, 0.25 * 2.6 + 0.75 * 0.6])
+    assert entries.total_magnetic_moment == pytest.approx(
+        np.sum(entries.site_magnetic_moments))
+
+    averages = entries.get_element_averages()
+    assert averages['Fe'] == pytest.approx(
+        (0.25 * 2.2 + 0.25 * -2.0 + 0.25 * 2.6) / 0.75)
+    assert averages['Al'] == pytest.approx(0.01)
+    assert averages['Ni'] == pytest.approx(0.6)
+
+
+def test_site_entries(entries):
+    site_entries = list(entries.site_entries.values())
+
+    assert site_entries[0]['Fe'] == ComponentEntry([2.2, -2.0])
+    assert site_entries[1]['Ni'] == ComponentEntry(0.6)
+
+
+def test_columns_from_dict(entries):
+    serialized = json.loads(json.dumps(entries, cls=MontyEncoder))
+
+    columns = AlloyEntriesColumns.from_dict(serialized)
+
+    for name in ('site_index', 'component_index', 'element_index',
+                 'concentrations', 'moments', 'is_paramagnetic'):
+        assert np.array_equal(getattr(columns, name),
+                              getattr(entries.columns, name))
+    assert columns.elements == entries.columns.elements
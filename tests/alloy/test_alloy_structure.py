@@ -0,0 +1,113 @@
+""" Tests for the alloy structure
+
+"""
+import json
+
+from monty.json import MontyEncoder
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_index import AlloyStructureIndex, \
+    get_unique_structures
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.alloy.alloy_symmetry import symmetry_cache
+
+CELL = [[3., 0., 0.], [0., 3., 0.], [0., 0., 3.]]
+
+
+def _get_structure(**kwargs):
+    alloy = AlloyComposition(['Fe', 'Al'], [0.5, 0.5])
+    return AlloyStructure(CELL, [alloy, alloy],
+                          [[0., 0., 0.], [0.5, 0.5, 0.5]], **kwargs)
+
+
+def test_site_indices_are_lazy():
+    symmetry_cache.cache_clear()
+
+    structure = _get_structure()
+
+    assert 'site_index' not in structure.site_properties
+    assert symmetry_cache.cache_info().misses == 0
+
+    assert structure.site_index == [1, 2]
+    assert structure.neq_site_index == [1, 1]
+    assert structure.site_properties['neq_site_index'] == [1, 1]
+    assert symmetry_cache.cache_info().misses == 1
+
+
+def test_site_indices_are_persisted():
+    structure = _get_structure()
+    assert structure.site_index == [1, 2]
+
+    symmetry_cache.cache_clear()
+
+    alloy_dict = json.loads(json.dumps(structure.as_dict(), cls=MontyEncoder))
+    loaded = AlloyStructure.from_dict(alloy_dict)
+
+    assert loaded.site_index == [1, 2]
+    assert loaded.neq_site_index == [1, 1]
+    assert symmetry_cache.cache_info().misses == 0
+
+
+def test_supplied_site_indices():
+    symmetry_cache.cache_clear()
+
+    structure = _get_structure(site_properties={'site_index': [1, 2],
+                                                'neq_site_index': [1, 2]})
+    assert structure.neq_site_index == [1, 2]
+
+    structure = _get_structure(analyze_symmetry=False)
+    assert structure.neq_site_index == [1, 2]
+
+    assert symmetry_cache.cache_info().misses == 0
+
+
+def test_equality_does_not_depend_on_site_order():
+    fe_al = AlloyComposition(['Fe', 'Al'], [0.5, 0.5])
+    ti_al = AlloyComposition(['Ti', 'Al'], [0.5, 0.5])
+
+    structure = AlloyStructure(CELL, [fe_al, ti_al],
+                               [[0., 0., 0.], [0.5, 0.5, 0.5]])
+    swapped = AlloyStructure(CELL, [AlloyComposition(['Ti', 'Al'],
+                                                     [0.5, 0.5]), fe_al],
+                             [[0.5, 0.5, 0.5], [1., 0., 0.]])
+    other = AlloyStructure(CELL, [ti_al, fe_al],
+                           [[0., 0., 0.], [0.5, 0.5, 0.5]])
+
+    assert structure == swapped
+    assert hash(structure) == hash(swapped)
+    assert structure != other
+
+
+def test_equality_tolerates_rounding_boundaries():
+    fe_al = AlloyComposition(['Fe', 'Al'], [0.5, 0.5])
+    ti_al = AlloyComposition(['Ti', 'Al'], [0.5, 0.5])
+
+    # the coordinates straddle the rounding grid of the fingerprint and the
+    # cell boundary
+    structure = AlloyStructure(CELL, [fe_al, ti_al],
+                               [[0.5 + 5e-6 - 1e-9, 0., 0.],
+                                [0.5, 0.5, 1e-10]])
+    shifted = AlloyStructure(CELL, [ti_al, fe_al],
+                             [[0.5, 0.5, -1e-10],
+                              [0.5 + 5e-6 + 1e-9, 0., 0.]])
+
+    assert structure.fingerprint() != shifted.fingerprint()
+    assert structure == shifted
+    assert hash(structure) == hash(shifted)
+
+
+def test_unique_structures():
+    fe_al = AlloyComposition(['Fe', 'Al'], [0.5, 0.5])
+    ti_al = AlloyComposition(['Ti', 'Al'], [0.5, 0.5])
+
+    candidates = []
+    for species in ([fe_al, ti_al], [ti_al, fe_al], [fe_al, ti_al]):
+        candidates.append(
+            AlloyStructure(CELL, species, [[0., 0., 0.], [0.5, 0.5, 0.5]]))
+
+    index = AlloyStructureIndex(candidates)
+
+    assert len(index) == 2
+    assert index.unique == candidates[:2]
+    assert candidates[2] in index
+    assert get_unique_structures(candidates) == candidates[:2]
@@ -0,0 +1,51 @@
+""" Tests for the symmetry analysis cache
+
+"""
+from pymatgen.core import Lattice
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.alloy.alloy_symmetry import SymmetryCache, \
+    symmetry_cache
+
+CELL = [[3., 0., 0.], [0., 3., 0.], [0., 0., 3.]]
+
+
+def test_structures_share_cached_analysis():
+    symmetry_cache.cache_clear()
+
+    alloy = AlloyComposition(['Fe', 'Al'], [0.5, 0.5])
+
+    structure = AlloyStructure(CELL, [alloy, alloy],
+                               [[0., 0., 0.], [0.5, 0.5, 0.5]])
+
+    # equal composition, coordinates differing below the tolerance
+    same = AlloyStructure(CELL,
+                          [AlloyComposition(['Fe', 'Al'], [0.5, 0.5])] * 2,
+                          [[1. - 1e-9, 0., 0.], [0.5, 0.5, 0.5]])
+
+    assert structure.site_index == same.site_index
+    assert structure.neq_site_index == same.neq_site_index
+
+    assert symmetry_cache.cache_info().hits == 1
+    assert symmetry_cache.cache_info().misses == 1
+
+    other = AlloyStructure(
+        CELL, [alloy, AlloyComposition(['Fe', 'Al'], [0.4, 0.6])],
+        [[0., 0., 0.], [0.5, 0.5, 0.5]])
+
+    assert other.neq_site_index == [1, 2]
+
+    assert symmetry_cache.cache_info().misses == 2
+
+
+def test_cache_is_bounded():
+    cache = SymmetryCache(maxsize=1)
+
+    alloy = AlloyComposition(['Fe', 'Al'], [0.5, 0.5])
+
+    for alat in (3., 3.1, 3.):
+        cache.get_site_indices(Lattice.cubic(alat), [alloy], [[0., 0., 0.]])
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 3, 1)
@@ -94,3 +94,75 @@ def test_process(adamant_code):
     print(result)
 
     # computed_diff = result['adamant'].get_content()
+
+
+def test_prepare_for_submission(aiida_local_code_factory):
+    """Write the input files of a calculation into a sandbox folder"""
+    from aiida.common.folders import SandboxFolder
+    from aiida.engine.utils import instantiate_process
+    from aiida.manage.manager import get_manager
+    from aiida.orm import SinglefileData
+    from aiida.plugins import CalculationFactory, DataFactory
+
+    from aiida_adamant.alloy.alloy_composition import AlloyComposition
+    from aiida_adamant.alloy.alloy_structure import AlloyStructure
+    from aiida_adamant.utils.structure import get_structure_data
+
+    KgrnParamsData = DataFactory('adamant.kgrn_data')
+    AtomConfigData = DataFactory('adamant.atom_cfg')
+    TransferMatrixData = DataFactory('adamant.transfer_matrix')
+
+    structure = AlloyStructure(
+        [[3., 0., 0.], [0., 3., 0.], [0., 0., 3.]],
+        [AlloyComposition(['Fe', 'Al'], [0.4, 0.6])], [[0., 0., 0.]])
+
+    inputs = {
+        'code': aiida_local_code_factory(
+            entry_point='adamant.kgrn_calculation', executable='cat'),
+        'kgrn': {
+            'structure': get_structure_data(structure),
+            'params': KgrnParamsData(kgrn={'sws': 2.65}),
+            'shape_function': SinglefileData(
+                file=os.path.join(TEST_DIR, 'fcc.shp')),
+            'madelung_matrix': SinglefileData(
+                file=os.path.join(TEST_DIR, 'fcc.mdl')),
+            'atom_cfg': AtomConfigData(os.path.join(TEST_DIR, 'ATOM.cfg')),
+            'transfer_matrix': TransferMatrixData(
+                os.path.join(TEST_DIR, 'fcc.tfm')),
+        },
+        'metadata': {
+            'options': {
+                'job_name': 'fe_al',
+                'retrieve_categories': ['output', 'prints'],
+                'resources': {
+                    'num_machines': 1,
+                    'num_mpiprocs_per_machine': 1
+                }
+            },
+        },
+    }
+
+    runner = get_manager().get_runner()
+    process = instantiate_process(
+        runner, CalculationFactory('adamant.kgrn_calculation'), **inputs)
+
+    with SandboxFolder() as folder:
+        calcinfo = process.prepare_for_submission(folder)
+
+        with folder.open('emtocalc.dat') as handle:
+            lines = handle.read().split('\n')
+
+        with folder.open('kgrn.tfm', 'rb') as handle, \
+                open(os.path.join(TEST_DIR, 'fcc.tfm'), 'rb') as source:
+            assert handle.read() == source.read()
+
+        assert 'ATOM.cfg' in folder.get_content_list()
+
+    assert lines[1] == 'JOBNAM...=fe_al'
+    assert calcinfo.codes_info[0].stdin_name == 'emtocalc.dat'
+    assert sorted(name for _, _, name in calcinfo.local_copy_list) == \
+        ['kgrn.mdl', 'kgrn.shp']
+
+    # the output file is kept as it is, the prints are compressed
+    assert calcinfo.retrieve_list == ['emtocalc.out']
+    assert calcinfo.retrieve_temporary_list == ['*.prn']
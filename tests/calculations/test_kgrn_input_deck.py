@@ -0,0 +1,58 @@
+""" Tests for the KGRN input file outside of a calculation
+
+"""
+import pickle
+
+import pytest
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.calculations.kgrn_input_deck import (KgrnInputDeck,
+                                                        render_input_decks)
+
+
+def _get_deck():
+    structure = AlloyStructure([[3., 0., 0.], [0., 3., 0.], [0., 0., 3.]],
+                               [AlloyComposition(['Fe', 'Al'], [0.4, 0.6])],
+                               [[0., 0., 0.]])
+
+    return KgrnInputDeck(structure, {'SWS': 2.65, 'niter': '80'})
+
+
+def test_input_deck_matches_input_file_string():
+    deck = _get_deck()
+
+    assert deck.render() == deck.create_input_file_string()
+    assert 'NITER.= 80' in deck.render()
+    assert 'FOR001=kgrn.tfm' in deck.render()
+
+
+def test_input_deck_can_be_pickled():
+    deck = _get_deck()
+
+    assert pickle.loads(pickle.dumps(deck)).render() == deck.render()
+
+
+def test_render_input_decks_in_parallel():
+    structure = _get_deck().structure
+    pairs = [(structure, {'sws': sws}) for sws in (2.6, 2.65, 2.7)]
+
+    decks = list(render_input_decks(pairs, processes=2, batch_size=2))
+
+    assert decks == [
+        KgrnInputDeck(structure, params).render() for _, params in pairs
+    ]
+
+
+def test_render_input_decks_returns_exceptions():
+    structure = _get_deck().structure
+    pairs = [(structure, {'sws': 2.6}), (structure, {'nitre': 80})]
+
+    valid, invalid = render_input_decks(pairs, processes=1,
+                                        return_exceptions=True)
+
+    assert 'SWS....=  2.600' in valid
+    assert isinstance(invalid, ValueError)
+
+    with pytest.raises(ValueError, match='nitre'):
+        list(render_input_decks(pairs, processes=1))
@@ -0,0 +1,88 @@
+""" Tests for the streaming KGRN input renderer
+
+"""
+import io
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.calculations.kgrn_input_deck import KgrnInputDeck
+from aiida_adamant.calculations.kgrn_renderer import KgrnInputRenderer, \
+    get_component_table, format_component_table
+
+
+def _get_structure():
+    paramagnetic = AlloyComposition(['Fe', 'Al'], [0.4, 0.6])
+    ferromagnetic = AlloyComposition(
+        ['Ti', 'Al', 'Cr'], [0.2, 0.5, 0.3],
+        magnetic_params=[{'is_paramagnetic': False,
+                          'init_mag_mom': 0.5}] * 3,
+        screening_params=[{'alpha': 0.6, 'beta': 1.1}] * 3)
+
+    return AlloyStructure([[3., 0., 0.], [0., 3., 0.], [0., 0., 3.]],
+                          [paramagnetic, ferromagnetic],
+                          [[0., 0., 0.], [0.5, 0.5, 0.5]])
+
+
+def _get_input_deck():
+    return KgrnInputDeck(_get_structure(), {'sws': 2.65,
+                                            'comment': 'renderer test'})
+
+
+def test_renderer_matches_input_file_string():
+    source = _get_input_deck()
+
+    assert KgrnInputRenderer(source).render() == \
+        source.create_input_file_string()
+
+
+def test_renderer_streams_into_handle():
+    source = _get_input_deck()
+
+    handle = io.StringIO()
+    KgrnInputRenderer(source).write(handle)
+
+    lines = handle.getvalue().split("\n")
+
+    assert lines[0].startswith("KGRN")
+    # 2 DLM components on the first site, 3 components on the second one
+    assert sum(line.startswith(("Fe", "Al", "Ti", "Cr"))
+               for line in lines) == 7
+    assert not handle.getvalue().endswith("\n")
+
+
+def test_component_table():
+    structure = _get_structure()
+
+    table = get_component_table(structure)
+
+    # Fe and Al are paramagnetic and therefore split into two rows each
+    assert table['symbol'].tolist() == ['Fe', 'Fe', 'Al', 'Al',
+                                        'Ti', 'Al', 'Cr']
+    assert table['ita'].tolist() == [1, 2, 3, 4, 1, 2, 3]
+    assert table['iq'].tolist() == [1, 1, 1, 1, 2, 2, 2]
+    assert table['concentration'][:4].tolist() == [0.2, 0.2, 0.3, 0.3]
+    assert table['moment'][:2].tolist() == [-1.9, 1.9]
+
+    assert format_component_table(table[:0]) == ""
+    assert format_component_table(table).count("\n") == len(table)
+
+
+def test_renderer_chunks_alloy_rows():
+    source = _get_input_deck()
+
+    renderer = KgrnInputRenderer(source)
+    renderer.chunk_size = 2
+
+    assert renderer.render() == source.create_input_file_string()
+
+
+def test_renderer_times_sections():
+    from aiida_adamant.utils.timing import SectionTimer
+
+    source = _get_input_deck()
+    timer = SectionTimer()
+
+    assert KgrnInputRenderer(source, timer).render() == \
+        source.create_input_file_string()
+    assert set(timer.timings) == {'control_section', 'scfp_section',
+                                  'alloy_section', 'atomic_section'}
@@ -0,0 +1,47 @@
+import io
+from pathlib import Path
+
+import pytest
+
+from aiida_adamant.data.inputs.atom_cfg import AtomConfigData, parse_atom_cfg
+
+ATOM_CFG = Path(__file__).parents[2] / "calculations" / "data" / "ATOM.cfg"
+
+
+def test_parse_atom_cfg():
+    with open(ATOM_CFG) as handle:
+        entries = parse_atom_cfg(handle)
+
+    assert list(entries)[:3] == ['Em', 'H', 'He']
+
+    iron = entries['Fe']
+    assert iron['iz'] == 26
+    assert iron['norb'] == 10
+    assert iron['ion'] == 0
+    assert iron['kappa'] == [-1, -1, 1, -2, -1, 1, -2, 2, -3, -1]
+    assert sum(iron['occup']) == 26
+
+
+def test_write_subset_of_elements():
+    node = AtomConfigData(file=ATOM_CFG)
+
+    content = node.get_content(['Al', 'Fe'])
+
+    # the blocks are written unchanged in the order of the original file
+    original = ATOM_CFG.read_text()
+    start = original.index("\nAl\n") + 1
+    assert content.startswith(original[start:original.index("\n\n", start)])
+
+    entries = parse_atom_cfg(io.StringIO(content))
+    assert list(entries) == ['Al', 'Fe']
+    assert entries['Fe'] == node.get_entry('Fe')
+
+
+def test_missing_elements():
+    node = AtomConfigData(file=ATOM_CFG)
+
+    assert 'Fe' in node
+    assert node.get_missing(['Fe', 'Xx', 'Yy']) == ['Xx', 'Yy']
+
+    with pytest.raises(ValueError):
+        node.get_content(['Fe', 'Xx'])
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_store_and_load_kgrn_data():
     from aiida.orm import load_node
     from aiida.plugins import DataFactory
@@ -20,3 +23,111 @@ def test_store_and_load_kgrn_data():
     node_loaded = load_node(uuid)
 
     assert node.get_dict() == node_loaded.get_dict()
+
+
+def test_validator_converts_types():
+    from aiida_adamant.data.inputs.kgrn_params import KGRN_PARAMS_VALIDATOR
+
+    params = KGRN_PARAMS_VALIDATOR({'NITER': '200', 'sws': 2, 'tole': '1d-7'})
+
+    assert params['niter'] == 200
+    assert isinstance(params['sws'], float)
+    assert params['tole'] == 1e-7
+    assert params['strt'] == 'A'
+
+
+@pytest.mark.parametrize('parameters', [{
+    'niter': 1.5
+}, {
+    'niter': True
+}, {
+    'strt': 1
+}, {
+    'unknown': 1
+}])
+def test_validator_rejects_invalid_params(parameters):
+    from aiida_adamant.data.inputs.kgrn_params import KGRN_PARAMS_VALIDATOR
+
+    with pytest.raises(ValueError):
+        KGRN_PARAMS_VALIDATOR(parameters)
+
+
+def test_validator_checks_required_params():
+    from aiida_adamant.data.inputs.kgrn_params import KGRN_PARAMS_VALIDATOR
+
+    assert KGRN_PARAMS_VALIDATOR.required == ['sws']
+    assert 'sws' not in KGRN_PARAMS_VALIDATOR({'niter': 80})
+
+    with pytest.raises(ValueError, match='sws'):
+        KGRN_PARAMS_VALIDATOR({'niter': 80}, complete=True)
+
+
+def test_bulk_creation_of_kgrn_data():
+    from aiida.plugins import DataFactory
+
+    KgrnParamsData = DataFactory('adamant.kgrn_data')
+
+    nodes = KgrnParamsData.bulk([{'sws': sws} for sws in (2.6, 2.65, 2.7)])
+
+    assert [node.get_dict()['sws'] for node in nodes] == [2.6, 2.65, 2.7]
+    assert nodes[0].get_dict()['niter'] == 100
+
+    with pytest.raises(ValueError, match='Parameter set 1'):
+        KgrnParamsData.bulk([{'sws': 2.6}, {'sws': 'large'}])
+
+
+def test_overlay_kgrn_data():
+    from aiida.orm import Group, load_node
+    from aiida.plugins import DataFactory
+
+    from aiida_adamant.data.inputs.kgrn_params import (
+        DEFAULTS_GROUP_LABEL, _add_to_defaults_group)
+
+    KgrnParamsData = DataFactory('adamant.kgrn_data')
+
+    defaults = KgrnParamsData(kgrn={'niter': 200}).store()
+
+    node = KgrnParamsData(kgrn={'sws': 2.6, 'NITER': 200}, defaults=defaults)
+
+    assert node.is_overlay
+    assert node.get_overrides() == {'sws': 2.6}
+    assert node.get_dict() == dict(defaults.get_dict(), sws=2.6)
+
+    node_loaded = load_node(node.store().uuid)
+
+    assert node_loaded.defaults_uuid == defaults.uuid
+    assert node_loaded['niter'] == 200
+    assert node_loaded.get_dict() == node.get_dict()
+
+    shared = KgrnParamsData.get_defaults_node()
+    assert KgrnParamsData.get_defaults_node().uuid == shared.uuid
+    assert KgrnParamsData.overlay({'sws': 2.7}).defaults_uuid == shared.uuid
+
+    group = Group.get(label=DEFAULTS_GROUP_LABEL)
+    assert {node.uuid for node in group.nodes} == {defaults.uuid,
+                                                   shared.uuid}
+
+    # the defaults node is added to the group only once
+    misses = _add_to_defaults_group.cache_info().misses
+    nodes = KgrnParamsData.bulk([{'sws': 2.6}, {'SWS': 2.7}], defaults)
+    assert _add_to_defaults_group.cache_info().misses == misses
+    assert [node.get_overrides() for node in nodes] == [{'sws': 2.6},
+                                                        {'sws': 2.7}]
+
+    with pytest.raises(ValueError):
+        KgrnParamsData(kgrn={'sws': 2.6}, defaults=node_loaded)
+
+
+def test_canonical_hash_of_kgrn_data():
+    from aiida.plugins import DataFactory
+
+    KgrnParamsData = DataFactory('adamant.kgrn_data')
+
+    node = KgrnParamsData(kgrn={'SWS': 2.65, 'niter': 100})
+    equivalent = KgrnParamsData(kgrn={'sws': 2.6500001})
+    overlay = KgrnParamsData(kgrn={'sws': 2.65},
+                             defaults=KgrnParamsData(kgrn={}).store())
+
+    assert node.get_hash() == equivalent.get_hash()
+    assert node.get_hash() == overlay.get_hash()
+    assert node.get_hash() != KgrnParamsData(kgrn={'sws': 2.66}).get_hash()
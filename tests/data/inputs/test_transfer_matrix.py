@@ -0,0 +1,52 @@
+import io
+import os
+
+import pytest
+
+from aiida_adamant.data.inputs.transfer_matrix import (iter_records,
+                                                       write_records)
+
+TFM_FILE = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir,
+                        'calculations', 'data', 'fcc.tfm')
+
+
+def test_record_round_trip():
+    with open(TFM_FILE, 'rb') as handle:
+        content = handle.read()
+
+    records = list(iter_records(io.BytesIO(content)))
+    assert records[0].startswith(b'Slope & Madelung matrices')
+
+    handle = io.BytesIO()
+    write_records(handle, records)
+
+    assert handle.getvalue() == content
+
+
+def test_truncated_record():
+    handle = io.BytesIO()
+    write_records(handle, [b'header', b'\x00' * 16])
+
+    with pytest.raises(ValueError):
+        list(iter_records(io.BytesIO(handle.getvalue()[:-2])))
+
+
+def test_store_and_load_transfer_matrix():
+    from aiida.orm import load_node
+    from aiida.plugins import DataFactory
+
+    TransferMatrixData = DataFactory('adamant.transfer_matrix')
+
+    node = TransferMatrixData(TFM_FILE).store()
+    loaded = load_node(node.uuid)
+
+    assert loaded.header.startswith('Slope & Madelung matrices')
+    assert loaded.size == os.path.getsize(TFM_FILE)
+    assert loaded.num_records == len(loaded.get_records())
+    assert next(loaded.iter_records()) == loaded.get_records()[0]
+
+    handle = io.BytesIO()
+    loaded.write(handle)
+
+    with open(TFM_FILE, 'rb') as source:
+        assert handle.getvalue() == source.read()
@@ -0,0 +1,35 @@
+""" Tests for the gzip compressed output folder
+
+"""
+
+
+def test_store_and_read_compressed_folder(tmp_path):
+    from aiida.orm import load_node
+    from aiida.plugins import DataFactory
+
+    CompressedFolderData = DataFactory('adamant.compressed_folder')
+
+    (tmp_path / 'pot').mkdir()
+    (tmp_path / 'pot' / 'emtocalc.pot').write_bytes(b'0.0 ' * 10000)
+    (tmp_path / 'emtocalc.prn').write_text('Total energy\n')
+
+    node = CompressedFolderData()
+    node.add_directory(tmp_path / 'pot', prefix='pot')
+    node.add_file(tmp_path / 'emtocalc.prn', 'emtocalc.prn')
+    node.store()
+
+    loaded = load_node(node.uuid)
+
+    assert loaded.list_file_names() == ['emtocalc.prn', 'pot/emtocalc.pot']
+    assert loaded.files['pot/emtocalc.pot']['size'] == 40000
+    assert loaded.files['pot/emtocalc.pot']['compressed_size'] < 1000
+
+    with loaded.open_file('emtocalc.prn') as handle:
+        assert handle.readline() == 'Total energy\n'
+
+    with loaded.open_file('pot/emtocalc.pot', 'rb') as handle:
+        assert handle.read(8) == b'0.0 0.0 '
+
+    loaded.extract(tmp_path / 'extracted')
+    assert (tmp_path / 'extracted' / 'pot' / 'emtocalc.pot').read_bytes() \
+        == b'0.0 ' * 10000
@@ -0,0 +1,78 @@
+import io
+import os
+
+import pytest
+from pymatgen.core import Lattice
+
+from aiida_adamant.alloy.alloy_composition import (AlloyComposition,
+                                                   MagneticParams)
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.parsers.kgrn_output import (get_alloy_entries,
+                                               parse_kgrn_output)
+
+OUTPUT_FILE = os.path.join(os.path.dirname(__file__), 'data', 'emtocalc.out')
+
+
+@pytest.fixture
+def results():
+    with open(OUTPUT_FILE, 'rb') as handle:
+        return parse_kgrn_output(handle, functional='pbe')
+
+
+def test_parse_kgrn_output(results):
+    assert results['converged']
+    assert results['num_iterations'] == 3
+    assert results['total_energy'] == pytest.approx(-2541.29506012)
+    assert results['energies']['LDA'] == pytest.approx(-2540.91300131)
+
+    assert results['scf_history']['iteration'] == [1, 2, 3]
+    assert results['scf_history']['erren'][-1] == pytest.approx(0.00000921)
+
+    # only the moments of the last iteration are kept
+    assert results['magnetic_moments'] == {(1, 1): 2.199,
+                                           (1, 2): -2.199,
+                                           (1, 3): 0.0093}
+
+
+def test_parse_kgrn_output_of_functional():
+    with open(OUTPUT_FILE, 'rb') as handle:
+        results = parse_kgrn_output(handle, functional='lda')
+
+    assert results['functional'] == 'LDA'
+    assert results['total_energy'] == pytest.approx(-2540.91300131)
+
+    # no TOT- line of the functional, the last total energy is used
+    with open(OUTPUT_FILE, 'rb') as handle:
+        results = parse_kgrn_output(handle, functional='AM05')
+
+    assert results['functional'] == 'PBE'
+    assert results['total_energy'] == pytest.approx(-2541.29506012)
+
+
+def test_parse_kgrn_output_without_fileno():
+    with open(OUTPUT_FILE, 'rb') as handle:
+        expected = parse_kgrn_output(handle)
+
+    with open(OUTPUT_FILE, 'rb') as handle:
+        results = parse_kgrn_output(io.BytesIO(handle.read()))
+
+    assert results == expected
+    assert results['total_energy'] == pytest.approx(-2541.29506012)
+
+
+def test_get_alloy_entries(results):
+    species = AlloyComposition(['Fe', 'Al'], [0.5, 0.5],
+                               magnetic_params=[
+                                   MagneticParams(True, 'F', 2.0),
+                                   MagneticParams(False)
+                               ])
+    structure = AlloyStructure(Lattice.cubic(2.87), [species], [[0, 0, 0]])
+
+    entries = get_alloy_entries(structure, results)
+
+    assert float(entries.total_energy) == pytest.approx(-2541.29506012)
+
+    site_entries = list(entries.site_entries.values())[0]
+    assert list(site_entries['Fe'].magnetic_moments) == [2.199, -2.199]
+    assert site_entries['Fe'].is_paramagnetic
+    assert list(site_entries['Al'].magnetic_moments) == [0.0093]
@@ -0,0 +1,109 @@
+""" Tests for the parser of KGRN calculations
+
+"""
+import os
+
+import pytest
+
+OUTPUT_FILE = os.path.join(os.path.dirname(__file__), 'data', 'emtocalc.out')
+
+
+@pytest.fixture
+def generate_calc_job_node(aiida_localhost):
+    """Create a KgrnCalculation node with a retrieved output file"""
+    def _generate_calc_job_node(params, options=None):
+        from aiida.common.links import LinkType
+        from aiida.orm import CalcJobNode, FolderData
+        from aiida.plugins import DataFactory
+
+        from aiida_adamant.alloy.alloy_composition import AlloyComposition
+        from aiida_adamant.alloy.alloy_structure import AlloyStructure
+        from aiida_adamant.utils.defaults import KgrnDefaults
+        from aiida_adamant.utils.structure import get_structure_data
+
+        KgrnParamsData = DataFactory('adamant.kgrn_data')
+
+        structure = AlloyStructure(
+            [[2.87, 0., 0.], [0., 2.87, 0.], [0., 0., 2.87]],
+            [AlloyComposition(['Fe'], [1.0])], [[0., 0., 0.]])
+
+        node = CalcJobNode(
+            computer=aiida_localhost,
+            process_type='aiida.calculations:adamant.kgrn_calculation')
+        node.set_option('resources', {'num_machines': 1})
+        node.set_option('output_filename', KgrnDefaults.OUTPUT_FILENAME)
+        node.set_option('retrieve_categories',
+                        list(KgrnDefaults.RETRIEVE_CATEGORIES))
+        node.set_option('compress_retrieved', False)
+        for name, value in (options or {}).items():
+            node.set_option(name, value)
+
+        node.add_incoming(get_structure_data(structure).store(),
+                          link_type=LinkType.INPUT_CALC,
+                          link_label='kgrn__structure')
+        node.add_incoming(KgrnParamsData(kgrn=params).store(),
+                          link_type=LinkType.INPUT_CALC,
+                          link_label='kgrn__params')
+        node.store()
+
+        retrieved = FolderData()
+        retrieved.put_object_from_file(OUTPUT_FILE,
+                                       KgrnDefaults.OUTPUT_FILENAME)
+        retrieved.add_incoming(node,
+                               link_type=LinkType.CREATE,
+                               link_label='retrieved')
+        retrieved.store()
+
+        return node
+
+    return _generate_calc_job_node
+
+
+def test_total_energy_of_iex(generate_calc_job_node):
+    from aiida.plugins import ParserFactory
+
+    KgrnParser = ParserFactory('adamant.kgrn_parser')
+
+    # the default IEX=7 selects PBE, independent of FUNC='SCA'
+    node = generate_calc_job_node({'sws': 2.65})
+    results, calcfunction = KgrnParser.parse_from_node(
+        node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok
+    assert results['output_parameters']['functional'] == 'PBE'
+    assert results['output_parameters']['total_energy'] == \
+        pytest.approx(-2541.29506012)
+    assert 'alloy_entries' in results
+
+    node = generate_calc_job_node({'sws': 2.65, 'iex': 4})
+    results, calcfunction = KgrnParser.parse_from_node(
+        node, store_provenance=False)
+
+    assert calcfunction.is_finished_ok
+    assert results['output_parameters']['functional'] == 'LDA'
+    assert results['output_parameters']['total_energy'] == \
+        pytest.approx(-2540.91300131)
+
+
+def test_compress_kept_output_files(generate_calc_job_node, tmp_path):
+    from aiida.plugins import ParserFactory
+
+    KgrnParser = ParserFactory('adamant.kgrn_parser')
+
+    (tmp_path / 'emtocalc.prn').write_text('Total energy\n')
+    (tmp_path / 'fe.prn').write_text('Fe\n')
+
+    node = generate_calc_job_node({'sws': 2.65}, {
+        'compress_retrieved': True,
+        'retrieve_categories': ['output', 'prints']
+    })
+    results, calcfunction = KgrnParser.parse_from_node(
+        node, store_provenance=False, retrieved_temporary_folder=str(tmp_path))
+
+    assert calcfunction.is_finished_ok
+    assert results['output_files'].list_file_names() == [
+        'emtocalc.prn', 'fe.prn'
+    ]
+
+    with results['output_files'].open_file('fe.prn') as handle:
+        assert handle.read() == 'Fe\n'
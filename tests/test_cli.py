@@ -0,0 +1,101 @@
+""" Tests for command line interface.
+
+"""
+import pytest
+from click.testing import CliRunner
+
+
+@pytest.fixture
+def params_nodes():
+    """Complete parameter nodes and an overlay node"""
+    from aiida.plugins import DataFactory
+
+    KgrnParamsData = DataFactory('adamant.kgrn_data')
+
+    nodes = [
+        KgrnParamsData(kgrn={'sws': sws}).store() for sws in (2.6, 2.7, 2.8)
+    ]
+    overlay = KgrnParamsData(kgrn={'niter': 80}, defaults=nodes[2]).store()
+
+    return nodes + [overlay]
+
+
+def _invoke(command, *args):
+    result = CliRunner().invoke(command, list(args), catch_exceptions=False)
+    return result.output.strip().split('\n')
+
+
+def test_data_list(params_nodes):
+    """Test 'verdi data adamant list'"""
+    from aiida_adamant.cli import list_
+
+    header, *rows = _invoke(list_)
+
+    assert header.split('\t') == ['pk', 'label', 'sws', 'niter', 'strt',
+                                  'func']
+    assert [row.split('\t')[0] for row in rows] == [
+        str(node.pk) for node in params_nodes
+    ]
+
+    # the overlay resolves the parameters of its defaults node
+    assert rows[-1].split('\t')[2:4] == ['2.8', '80']
+
+    _, *rows = _invoke(list_, '-p', 'NITER', '-p', 'tole')
+    assert rows[0].split('\t')[2:] == ['100', '1e-06']
+
+
+def test_data_list_filters(params_nodes):
+    """Test the filters of 'verdi data adamant list'"""
+    from aiida_adamant.cli import list_
+
+    _, *rows = _invoke(list_, '--sws-range', '2.65', '2.75')
+    assert [row.split('\t')[0] for row in rows] == [str(params_nodes[1].pk)]
+
+    _, *rows = _invoke(list_, '--limit', '2', '--offset', '1')
+    assert [row.split('\t')[0] for row in rows] == [
+        str(node.pk) for node in params_nodes[1:3]
+    ]
+
+    assert _invoke(list_, '--count') == ['4']
+    assert _invoke(list_, '--count', '--limit', '2', '--offset', '1') == \
+        ['2']
+    assert _invoke(list_, '--count', '--offset', '3', '--limit', '5') == \
+        ['1']
+
+
+def test_data_list_element(aiida_localhost, params_nodes):
+    """Test the element filter of 'verdi data adamant list'"""
+    from aiida.common.links import LinkType
+    from aiida.orm import CalcJobNode, StructureData
+
+    from aiida_adamant.cli import list_
+
+    structure = StructureData(cell=[[3., 0., 0.], [0., 3., 0.], [0., 0., 3.]])
+    structure.append_atom(position=(0., 0., 0.),
+                          symbols=['Fe', 'Al'],
+                          weights=[0.4, 0.6])
+    structure.store()
+
+    node = CalcJobNode(computer=aiida_localhost)
+    node.add_incoming(structure,
+                      link_type=LinkType.INPUT_CALC,
+                      link_label='kgrn__structure')
+    node.add_incoming(params_nodes[0],
+                      link_type=LinkType.INPUT_CALC,
+                      link_label='kgrn__params')
+    node.store()
+
+    _, *rows = _invoke(list_, '--element', 'Fe', '--element', 'Al')
+    assert [row.split('\t')[0] for row in rows] == [str(params_nodes[0].pk)]
+
+    _, *rows = _invoke(list_, '--element', 'Ni')
+    assert rows == []
+
+
+def test_data_export(params_nodes):
+    """Test 'verdi data adamant export'"""
+    from aiida_adamant.cli import export
+
+    output = _invoke(export, str(params_nodes[0].pk))
+
+    assert str(params_nodes[0].uuid) in '\n'.join(output)
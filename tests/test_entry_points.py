@@ -0,0 +1,39 @@
+""" Tests for the import of the entry points
+
+"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+from . import TEST_DIR
+
+#: Heavy modules which must not be imported by loading an entry point, the
+#: same as in benchmarks/bench_import_time.py
+LAZY_MODULES = ('pymatgen', 'spglib', 'monty.json')
+
+
+def _get_entry_point_modules():
+    with open(f'{TEST_DIR}/../setup.json') as handle:
+        entry_points = json.load(handle)['entry_points']
+
+    return sorted({
+        value.split('=', 1)[1].split(':')[0].strip()
+        for values in entry_points.values() for value in values
+    })
+
+
+@pytest.mark.parametrize('module', _get_entry_point_modules())
+def test_entry_point_import_is_lazy(module):
+    code = (f"import sys, {module}; "
+            "print(sorted(name for name in sys.modules "
+            f"for lazy in {LAZY_MODULES!r} "
+            "if name == lazy or name.startswith(lazy + '.')))")
+
+    result = subprocess.run([sys.executable, '-c', code],
+                            stdout=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True)
+
+    assert result.stdout.strip() == '[]'
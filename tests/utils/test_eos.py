@@ -0,0 +1,49 @@
+""" Tests for the Birch-Murnaghan equation of state
+
+"""
+import numpy as np
+import pytest
+
+from aiida_adamant.utils.eos import (RY_BOHR3_TO_GPA, fit_birch_murnaghan,
+                                     get_sws_uncertainty, suggest_sws)
+
+SWS0 = 2.65
+BULK_MODULUS = 180.0
+
+
+def _get_energies(sws):
+    volume0 = 4 / 3 * np.pi * SWS0**3
+    eta = (volume0 / (4 / 3 * np.pi * np.asarray(sws)**3))**(2 / 3)
+    bulk_modulus = BULK_MODULUS / RY_BOHR3_TO_GPA
+    return -2541.3 + 9 * volume0 * bulk_modulus / 16 * (
+        (eta - 1)**3 * 4.5 + (eta - 1)**2 * (6 - 4 * eta))
+
+
+def test_fit_birch_murnaghan():
+    sws = np.linspace(2.55, 2.75, 5)
+
+    fit = fit_birch_murnaghan(sws, _get_energies(sws))
+
+    assert fit.sws == pytest.approx(SWS0)
+    assert fit.energy == pytest.approx(-2541.3)
+    assert fit.bulk_modulus == pytest.approx(BULK_MODULUS, rel=1e-6)
+    assert get_sws_uncertainty(sws, _get_energies(sws)) < 1e-6
+
+    assert fit_birch_murnaghan(sws[:3], _get_energies(sws[:3])) is None
+
+
+def test_suggest_sws():
+    # the minimum lies above the sampled range
+    sws = np.linspace(2.40, 2.55, 5)
+    assert suggest_sws(sws, _get_energies(sws), 0.002) == [pytest.approx(2.5875)]
+
+    # converged fit
+    sws = np.linspace(2.55, 2.75, 5)
+    assert suggest_sws(sws, _get_energies(sws), 0.002) == []
+
+    # noisy energies, new points close to the minimum
+    energies = _get_energies(sws) + np.array([2, -3, 1, 3, -2]) * 1e-3
+    points = suggest_sws(sws, energies, 0.002)
+
+    assert points
+    assert all(2.6 < point < 2.7 for point in points)
@@ -0,0 +1,84 @@
+""" Tests for the bulk export of KGRN input files
+
+"""
+import tarfile
+
+from aiida_adamant.alloy.alloy_composition import AlloyComposition
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.calculations.kgrn_input_deck import KgrnInputDeck
+from aiida_adamant.data.inputs.kgrn_params import KGRN_PARAMS_VALIDATOR
+from aiida_adamant.utils.export import export_input_files
+from aiida_adamant.utils.structure import get_alloy_structure_from_attributes
+
+
+def _get_attributes(sws):
+    return {
+        'cell': [[sws, 0., 0.], [0., sws, 0.], [0., 0., sws]],
+        'kinds': [{
+            'name': 'FeAl',
+            'symbols': ['Fe', 'Al'],
+            'weights': [0.4, 0.6],
+            'mass': 1.0
+        }, {
+            'name': 'Ni',
+            'symbols': ['Ni'],
+            'weights': [1.0],
+            'mass': 1.0
+        }],
+        'sites': [{
+            'kind_name': 'FeAl',
+            'position': [0., 0., 0.]
+        }, {
+            'kind_name': 'Ni',
+            'position': [sws / 2, sws / 2, sws / 2]
+        }],
+    }
+
+
+def test_alloy_structure_from_attributes():
+    structure = get_alloy_structure_from_attributes(_get_attributes(3.0))
+
+    assert structure == AlloyStructure(
+        [[3., 0., 0.], [0., 3., 0.], [0., 0., 3.]],
+        [AlloyComposition(['Fe', 'Al'], [0.4, 0.6]),
+         AlloyComposition(['Ni'], [1.0])],
+        [[0., 0., 0.], [0.5, 0.5, 0.5]])
+
+
+def _get_items():
+    return [(pk, _get_attributes(2.8 + 0.1 * pk),
+             KGRN_PARAMS_VALIDATOR({'sws': 2.6 + 0.01 * pk}))
+            for pk in range(1, 6)]
+
+
+def _get_expected(item):
+    _, attributes, params = item
+    return KgrnInputDeck(get_alloy_structure_from_attributes(attributes),
+                         params).render()
+
+
+def test_export_into_directory(tmp_path):
+    items = _get_items()
+
+    assert export_input_files(items, tmp_path, processes=2,
+                              batch_size=2) == 5
+
+    for item in items:
+        content = (tmp_path / str(item[0]) / 'emtocalc.dat').read_text()
+        assert content == _get_expected(item)
+        assert 'SWS....=  {:.3f}'.format(item[2]['sws']) in content
+
+
+def test_export_into_tar(tmp_path):
+    items = _get_items()
+    path = tmp_path / 'inputs.tar.gz'
+
+    assert export_input_files(iter(items), path, tar=True, compression='gz',
+                              processes=1) == 5
+
+    with tarfile.open(path) as archive:
+        assert archive.getnames() == [f'{pk}/emtocalc.dat' for pk in
+                                      range(1, 6)]
+        content = archive.extractfile('3/emtocalc.dat').read().decode()
+
+    assert content == _get_expected(items[2])
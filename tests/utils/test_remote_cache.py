@@ -0,0 +1,49 @@
+""" Tests for the content-addressed cache of static inputs
+
+"""
+import io
+import os
+
+from aiida.orm import SinglefileData
+
+from aiida_adamant.utils.remote_cache import (HASH_EXTRA, get_cached_path,
+                                              get_file_hash,
+                                              stage_static_inputs)
+
+
+def test_stage_static_inputs(aiida_localhost, tmp_path):
+    shape = SinglefileData(io.BytesIO(b'shape function')).store()
+    madelung = SinglefileData(io.BytesIO(b'madelung matrix')).store()
+    unstaged = SinglefileData(io.BytesIO(b'atomic configuration')).store()
+
+    cache_dir = str(tmp_path / 'cache')
+
+    folder = stage_static_inputs(aiida_localhost, [shape, madelung],
+                                 cache_dir=cache_dir)
+
+    remote_path = get_cached_path(folder, shape)
+    assert remote_path == os.path.join(cache_dir, get_file_hash(shape))
+    with open(remote_path, 'rb') as handle:
+        assert handle.read() == b'shape function'
+
+    assert get_cached_path(folder, unstaged) is None
+
+    # files with the same content are not transferred again
+    mtime = os.path.getmtime(remote_path)
+    same_shape = SinglefileData(io.BytesIO(b'shape function')).store()
+    folder = stage_static_inputs(aiida_localhost, [same_shape],
+                                 cache_dir=cache_dir)
+
+    assert get_cached_path(folder, same_shape) == remote_path
+    assert os.path.getmtime(remote_path) == mtime
+    assert sorted(os.listdir(cache_dir)) == sorted(
+        [get_file_hash(shape), get_file_hash(madelung)])
+
+
+def test_file_hash_is_kept_as_extra():
+    node = SinglefileData(io.BytesIO(b'shape function'))
+    file_hash = get_file_hash(node)
+
+    node.store()
+    assert get_file_hash(node) == file_hash
+    assert node.get_extra(HASH_EXTRA) == file_hash
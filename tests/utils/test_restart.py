@@ -0,0 +1,39 @@
+""" Tests for the selection of calculations to restart from
+
+"""
+import numpy as np
+import pytest
+
+from aiida_adamant.utils.restart import (get_restart_distance,
+                                         get_site_averaged_concentrations)
+
+
+def test_restart_distance():
+    concentrations = {'Fe': 0.4, 'Al': 0.6}
+
+    assert get_restart_distance(2.65, concentrations, 2.65,
+                                concentrations) == 0.0
+
+    closer = get_restart_distance(2.65, concentrations, 2.66,
+                                  {'Fe': 0.4, 'Al': 0.6})
+    further = get_restart_distance(2.65, concentrations, 2.65,
+                                   {'Fe': 0.5, 'Al': 0.5})
+    assert closer == pytest.approx(0.2)
+    assert closer < further
+
+    assert get_restart_distance(2.65, concentrations, 2.65,
+                                {'Fe': 0.4, 'Cr': 0.6}) == np.inf
+
+
+def test_site_averaged_concentrations():
+    from aiida.orm import StructureData
+
+    structure = StructureData(cell=[[4., 0., 0.], [0., 4., 0.], [0., 0., 4.]])
+    structure.append_atom(position=(0., 0., 0.),
+                          symbols=['Fe', 'Al'],
+                          weights=[0.4, 0.6])
+    structure.append_atom(position=(2., 2., 2.), symbols='Fe')
+
+    concentrations = get_site_averaged_concentrations(structure)
+
+    assert concentrations == pytest.approx({'Fe': 0.7, 'Al': 0.3})
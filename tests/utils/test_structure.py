@@ -0,0 +1,62 @@
+""" Tests for the conversion between AiiDA and alloy structures
+
+"""
+from pymatgen.core import Lattice
+
+from aiida_adamant.alloy.alloy_composition import (AlloyComposition,
+                                                    MagneticParams)
+from aiida_adamant.alloy.alloy_structure import AlloyStructure
+from aiida_adamant.utils.structure import (get_alloy_structure,
+                                           get_canonical_structure,
+                                           get_concentration_variant,
+                                           get_structure_data)
+
+
+def test_concentration_variant_keeps_params():
+    ferromagnetic = MagneticParams(False, 'F', 2.2)
+    template = AlloyComposition(['Fe', 'Al'], [0.4, 0.6],
+                                magnetic_params=[ferromagnetic, {}])
+
+    variant = get_concentration_variant(template, {'Fe': 0.3, 'Al': 0.6,
+                                                   'Cr': 0.1})
+
+    assert variant['Fe'] == 0.3
+    assert variant.magnetic_params[variant.elements[0]] == ferromagnetic
+    assert variant.magnetic_params[variant.elements[2]] == MagneticParams()
+    assert variant is get_concentration_variant(template, {'Fe': 0.3,
+                                                          'Al': 0.6,
+                                                          'Cr': 0.1})
+
+
+def test_structure_data_round_trip():
+    species = [
+        AlloyComposition.intern(['Fe', 'Al'], [0.4, 0.6]),
+        AlloyComposition.intern(['Fe', 'Al'], [0.5, 0.5]),
+    ]
+    structure = AlloyStructure(Lattice.cubic(2.87), species,
+                               [[0, 0, 0], [0.5, 0.5, 0.5]])
+
+    structure_data = get_structure_data(structure)
+
+    assert structure_data.get_kind_names() == ['FeAl', 'FeAl2']
+
+    converted = get_alloy_structure(structure_data)
+
+    assert [site.species for site in converted] == species
+    assert converted == structure
+
+
+def test_canonical_structure_is_order_independent():
+    iron_aluminum = AlloyComposition(['Fe', 'Al'], [0.4, 0.6])
+    iron = AlloyComposition(['Fe'], [1.0])
+
+    structure = AlloyStructure(Lattice.cubic(2.87), [iron_aluminum, iron],
+                               [[0, 0, 0], [0.5, 0.5, 0.5]])
+    permuted = AlloyStructure(Lattice.cubic(2.87 + 1e-9),
+                              [iron, iron_aluminum],
+                              [[0.5, 0.5, 0.5 + 1e-9], [1.0, 0, 0]])
+
+    canonical = get_canonical_structure(structure)
+
+    assert canonical.as_dict() == get_canonical_structure(permuted).as_dict()
+    assert canonical == structure
@@ -0,0 +1,69 @@
+""" Tests for the timing of code sections
+
+"""
+import pytest
+
+from aiida_adamant.utils.timing import (NULL_TIMER, SectionTimer,
+                                        get_parent_section,
+                                        iter_section_tree, summarize_timings)
+
+
+def test_section_timer_adds_up_sections():
+    timer = SectionTimer()
+
+    for _ in range(3):
+        with timer.section('render'):
+            pass
+
+    with pytest.raises(RuntimeError):
+        with timer.section('write'):
+            raise RuntimeError
+
+    assert set(timer.timings) == {'render', 'write'}
+    assert timer.timings['render'] >= 0.0
+
+    with NULL_TIMER.section('render'):
+        pass
+
+    assert NULL_TIMER.timings == {}
+
+
+def test_section_timer_nested_sections():
+    timer = SectionTimer()
+
+    with timer.section('total'):
+        with timer.section('input_file'):
+            with timer.section('control_section'):
+                pass
+        with timer.section('symmetry'):
+            pass
+
+    assert set(timer.timings) == {'total', 'total/input_file',
+                                  'total/input_file/control_section',
+                                  'total/symmetry'}
+    assert timer.timings['total'] >= timer.timings['total/input_file'] >= \
+        timer.timings['total/input_file/control_section']
+
+    assert get_parent_section('total/input_file') == 'total'
+    assert get_parent_section('total') is None
+
+
+def test_iter_section_tree():
+    summary = summarize_timings(
+        iter([{'total': 4.0, 'total/symmetry': 1.0, 'total/input_file': 2.0,
+               'total/input_file/alloy_section': 1.5, 'other/render': 0.5}]))
+
+    assert list(iter_section_tree(summary)) == [
+        ('total', 0), ('total/input_file', 1),
+        ('total/input_file/alloy_section', 2), ('total/symmetry', 1),
+        ('other/render', 0)
+    ]
+
+
+def test_summarize_timings():
+    summary = summarize_timings(
+        iter([{'total': 2.0, 'symmetry': 1.0}, {'total': 4.0}]))
+
+    assert summary['total'] == {'count': 2, 'total': 6.0, 'min': 2.0,
+                                'max': 4.0, 'mean': 3.0}
+    assert summary['symmetry']['count'] == 1